@@ -7,14 +7,31 @@ import os
 import json
 import logging
 import base64
-from typing import Dict, Any, Optional, Union
+import functools
+import time
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import hashlib
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@functools.lru_cache(maxsize=64)
+def _basic_auth_header(username: str, password: str) -> str:
+    """Build (and memoize) a Basic authorization header value"""
+    encoded = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {encoded}"
+
+# Environment variable that carries an API key for each service's MCP server
+_API_KEY_ENV_VARS = {
+    "github": "GITHUB_TOKEN",
+    "google_drive": "GOOGLE_APPLICATION_CREDENTIALS",  # Service account path
+    "slack": "SLACK_BOT_TOKEN",
+    "linear": "LINEAR_API_KEY",
+    "notion": "NOTION_API_KEY"
+}
+
+@dataclass(slots=True)
 class Credentials:
     """Base credentials class"""
     service: str
@@ -26,8 +43,12 @@ class Credentials:
         if self.expires_at is None:
             return False
         return datetime.now() >= self.expires_at
+    
+    def to_server_env(self) -> Dict[str, str]:
+        """Get environment variables for this service's MCP server"""
+        return {}
 
-@dataclass
+@dataclass(slots=True)
 class APIKeyCredentials(Credentials):
     """API Key credentials"""
     api_key: str = ""
@@ -35,8 +56,13 @@ class APIKeyCredentials(Credentials):
     def get_headers(self) -> Dict[str, str]:
         """Get authorization headers"""
         return {"Authorization": f"Bearer {self.api_key}"}
+    
+    def to_server_env(self) -> Dict[str, str]:
+        """Get environment variables for this service's MCP server"""
+        env_var = _API_KEY_ENV_VARS.get(self.service)
+        return {env_var: self.api_key} if env_var else {}
 
-@dataclass
+@dataclass(slots=True)
 class OAuthCredentials(Credentials):
     """OAuth credentials"""
     access_token: str = ""
@@ -47,8 +73,18 @@ class OAuthCredentials(Credentials):
     def get_headers(self) -> Dict[str, str]:
         """Get authorization headers"""
         return {"Authorization": f"{self.token_type} {self.access_token}"}
+    
+    def to_server_env(self) -> Dict[str, str]:
+        """Get environment variables for this service's MCP server"""
+        if self.service != "google_drive":
+            return {}
+        
+        env = {"GOOGLE_ACCESS_TOKEN": self.access_token}
+        if self.refresh_token:
+            env["GOOGLE_REFRESH_TOKEN"] = self.refresh_token
+        return env
 
-@dataclass
+@dataclass(slots=True)
 class BasicAuthCredentials(Credentials):
     """Basic authentication credentials"""
     username: str = ""
@@ -56,9 +92,18 @@ class BasicAuthCredentials(Credentials):
     
     def get_headers(self) -> Dict[str, str]:
         """Get authorization headers"""
-        auth_string = f"{self.username}:{self.password}"
-        encoded = base64.b64encode(auth_string.encode()).decode()
-        return {"Authorization": f"Basic {encoded}"}
+        return {"Authorization": _basic_auth_header(self.username, self.password)}
+    
+    def to_server_env(self) -> Dict[str, str]:
+        """Get environment variables for this service's MCP server"""
+        if self.service != "jira":
+            return {}
+        
+        return {
+            "JIRA_USERNAME": self.username,
+            "JIRA_API_TOKEN": self.password,
+            "JIRA_URL": os.getenv("JIRA_URL", "")
+        }
 
 class MCPAuthManager:
     """Manages authentication and credentials for MCP servers"""
@@ -66,6 +111,10 @@ class MCPAuthManager:
     def __init__(self):
         self.credentials_cache: Dict[str, Credentials] = {}
         self.env_mapping = self._load_env_mapping()
+        # Bumped whenever cached credentials are dropped so dependents can rebuild
+        self.version = 0
+        # service -> (its env var values, monotonic time, server env, credentials valid)
+        self._snapshot_cache: Dict[str, Tuple[Tuple[Optional[str], ...], float, Dict[str, str], bool]] = {}
     
     def _load_env_mapping(self) -> Dict[str, Dict[str, str]]:
         """Load environment variable mapping for different services"""
@@ -209,36 +258,11 @@ class MCPAuthManager:
         if not creds:
             return {}
         
-        env = {}
-        
         try:
-            if service == "github" and isinstance(creds, APIKeyCredentials):
-                env["GITHUB_TOKEN"] = creds.api_key
-            
-            elif service == "google_drive":
-                if isinstance(creds, APIKeyCredentials):
-                    # Service account path
-                    env["GOOGLE_APPLICATION_CREDENTIALS"] = creds.api_key
-                elif isinstance(creds, OAuthCredentials):
-                    env["GOOGLE_ACCESS_TOKEN"] = creds.access_token
-                    if creds.refresh_token:
-                        env["GOOGLE_REFRESH_TOKEN"] = creds.refresh_token
-            
-            elif service == "jira" and isinstance(creds, BasicAuthCredentials):
-                env["JIRA_USERNAME"] = creds.username
-                env["JIRA_API_TOKEN"] = creds.password
-                env["JIRA_URL"] = os.getenv("JIRA_URL", "")
-            
-            elif service == "slack" and isinstance(creds, APIKeyCredentials):
-                env["SLACK_BOT_TOKEN"] = creds.api_key
-            
-            elif service in ["linear", "notion"] and isinstance(creds, APIKeyCredentials):
-                env[f"{service.upper()}_API_KEY"] = creds.api_key
-            
+            return creds.to_server_env()
         except Exception as e:
             logger.error(f"❌ Error creating environment for {service}: {e}")
-        
-        return env
+            return {}
     
     def validate_credentials(self, service: str) -> bool:
         """Validate credentials for a service"""
@@ -253,6 +277,37 @@ class MCPAuthManager:
         # Could add actual API validation here
         return True
     
+    def _env_values(self, service: str) -> Tuple[Optional[str], ...]:
+        """Current values of the environment variables a service's credentials come from"""
+        return tuple(os.environ.get(name) for name in self.env_mapping.get(service, {}).values())
+    
+    def snapshot(self, services: Iterable[str], ttl: float = 300.0) -> Dict[str, Tuple[Dict[str, str], bool]]:
+        """Get (server env, credentials valid) for several services in one pass
+        
+        Valid results are reused for ttl seconds while the service's
+        environment variables keep their values, so callers that need both
+        values for many servers resolve each service's credentials once.
+        """
+        now = time.monotonic()
+        result = {}
+        
+        for service in services:
+            env_values = self._env_values(service)
+            entry = self._snapshot_cache.get(service)
+            if entry is None or entry[0] != env_values or now - entry[1] >= ttl:
+                if entry is not None and entry[0] != env_values:
+                    # Credentials loaded from the old values are stale too
+                    self.credentials_cache.pop(service, None)
+                entry = (env_values, now, self.get_environment_for_server(service), self.validate_credentials(service))
+                # Misses are not cached so credentials set later are picked up
+                if entry[3]:
+                    self._snapshot_cache[service] = entry
+                else:
+                    self._snapshot_cache.pop(service, None)
+            result[service] = entry[2:]
+        
+        return result
+    
     def refresh_oauth_token(self, service: str) -> bool:
         """Refresh OAuth token for a service"""
         try:
@@ -321,37 +376,36 @@ class MCPAuthManager:
     
     def clear_cache(self, service: Optional[str] = None):
         """Clear credentials cache"""
+        self.version += 1
         if service:
             self.credentials_cache.pop(service, None)
+            self._snapshot_cache.pop(service, None)
             logger.info(f"🧹 Cleared credentials cache for {service}")
         else:
             self.credentials_cache.clear()
+            self._snapshot_cache.clear()
             logger.info("🧹 Cleared all credentials cache")
     
     def get_credential_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all credentials"""
-        status = {}
-        
-        for service in self.env_mapping.keys():
-            creds = self.get_credentials(service)
-            if creds:
-                status[service] = {
-                    "available": True,
-                    "type": type(creds).__name__,
-                    "expires_at": creds.expires_at.isoformat() if creds.expires_at else None,
-                    "is_expired": creds.is_expired(),
-                    "created_at": creds.created_at.isoformat()
-                }
-            else:
-                status[service] = {
-                    "available": False,
-                    "type": None,
-                    "expires_at": None,
-                    "is_expired": None,
-                    "created_at": None
-                }
+        now = datetime.now()
         
-        return status
+        return {
+            service: {
+                "available": True,
+                "type": type(creds).__name__,
+                "expires_at": creds.expires_at.isoformat() if creds.expires_at else None,
+                "is_expired": creds.expires_at is not None and now >= creds.expires_at,
+                "created_at": creds.created_at.isoformat()
+            } if creds else {
+                "available": False,
+                "type": None,
+                "expires_at": None,
+                "is_expired": None,
+                "created_at": None
+            }
+            for service, creds in ((s, self.get_credentials(s)) for s in self.env_mapping)
+        }
 
 # Global auth manager instance
 _auth_manager = None
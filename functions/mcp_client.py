@@ -8,23 +8,25 @@ import json
 import logging
 import os
 import subprocess
+import time
 import uuid
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Mapping, Optional, Tuple, Union
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     """Represents a function call to be executed"""
     id: str
     name: str
     parameters: Dict[str, Any]
     
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Represents the result of a tool execution"""
     success: bool
@@ -33,7 +35,7 @@ class ToolResult:
     tool_name: Optional[str] = None
     execution_time: Optional[float] = None
 
-@dataclass
+@dataclass(slots=True)
 class MCPServer:
     """Configuration for an MCP server"""
     id: str
@@ -50,9 +52,12 @@ class MCPClient:
     
     def __init__(self):
         self.servers: Dict[str, MCPServer] = {}
-        self.processes: Dict[str, subprocess.Popen] = {}
+        self.processes: Dict[str, asyncio.subprocess.Process] = {}
         self.tool_to_server: Dict[str, str] = {}
         self.initialized = False
+        self._dispatcher = None
+        self._available_tools: Dict[str, Dict] = {}
+        self._tool_schemas: Tuple[Dict, ...] = ()
         
     async def initialize(self, server_configs: Dict[str, Dict]) -> bool:
         """Initialize MCP client with server configurations"""
@@ -80,6 +85,25 @@ class MCPClient:
                     
                     logger.info(f"✅ Loaded server: {server.name} ({len(server.tools)} tools)")
             
+            # Precompute tool listings so lookups don't rebuild them per request
+            self._available_tools = {
+                tool_name: {
+                    'server': server_id,
+                    'server_name': server.name,
+                    'description': f"Tool from {server.name}"
+                }
+                for server_id, server in self.servers.items()
+                for tool_name in server.tools
+            }
+            self._tool_schemas = tuple(self.get_tool_schema(tool_name) for tool_name in self.tool_to_server)
+            
+            # Resolve the dispatcher once so tool calls don't pay for the import;
+            # if that fails, tool calls resolve it lazily instead
+            try:
+                await self._get_dispatcher()
+            except Exception as e:
+                logger.warning(f"⚠️ MCP dispatcher not resolved at initialize: {e}")
+            
             self.initialized = True
             logger.info(f"🎉 MCP Client initialized with {len(self.servers)} servers")
             return True
@@ -88,17 +112,9 @@ class MCPClient:
             logger.error(f"❌ Failed to initialize MCP Client: {e}")
             return False
     
-    def get_available_tools(self) -> Dict[str, Dict]:
+    def get_available_tools(self) -> Mapping[str, Dict]:
         """Get all available tools from all servers"""
-        tools = {}
-        for server_id, server in self.servers.items():
-            for tool_name in server.tools:
-                tools[tool_name] = {
-                    'server': server_id,
-                    'server_name': server.name,
-                    'description': f"Tool from {server.name}"
-                }
-        return tools
+        return MappingProxyType(self._available_tools)
     
     def get_server_for_tool(self, tool_name: str) -> Optional[str]:
         """Get the server ID responsible for a specific tool"""
@@ -106,8 +122,7 @@ class MCPClient:
     
     async def execute_tool(self, tool_call: ToolCall) -> ToolResult:
         """Execute a tool via its MCP server"""
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             server_id = self.get_server_for_tool(tool_call.name)
@@ -125,7 +140,7 @@ class MCPClient:
             # Execute tool via MCP server
             result = await self._call_mcp_server(server, tool_call)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
             if result.success:
                 logger.info(f"✅ Tool {tool_call.name} executed successfully in {execution_time:.2f}s")
@@ -137,7 +152,7 @@ class MCPClient:
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"💥 Exception executing {tool_call.name}: {e}")
             return ToolResult(
                 success=False,
@@ -147,16 +162,20 @@ class MCPClient:
                 execution_time=execution_time
             )
     
+    async def _get_dispatcher(self):
+        """Get the MCP dispatcher, importing it lazily to avoid a circular import"""
+        if self._dispatcher is None:
+            # mcp_dispatcher imports ToolCall/ToolResult from this module
+            from mcp_dispatcher import get_mcp_dispatcher
+            self._dispatcher = await get_mcp_dispatcher()
+        return self._dispatcher
+    
     async def _call_mcp_server(self, server: MCPServer, tool_call: ToolCall) -> ToolResult:
         """Internal method to call MCP server via dispatcher"""
         try:
             # Use the MCP dispatcher instead of external commands
-            from mcp_dispatcher import get_mcp_dispatcher
-            
-            dispatcher = await get_mcp_dispatcher()
-            result = await dispatcher.dispatch_tool(tool_call)
-            
-            return result
+            dispatcher = self._dispatcher or await self._get_dispatcher()
+            return await dispatcher.dispatch_tool(tool_call)
                 
         except Exception as e:
             return ToolResult(
@@ -205,14 +224,9 @@ class MCPClient:
             }
         }
     
-    def get_all_tool_schemas(self) -> List[Dict]:
-        """Get schemas for all available tools"""
-        schemas = []
-        for tool_name in self.tool_to_server.keys():
-            schema = self.get_tool_schema(tool_name)
-            if schema:
-                schemas.append(schema)
-        return schemas
+    def get_all_tool_schemas(self) -> Tuple[Dict, ...]:
+        """Get schemas for all available tools (shared, do not mutate)"""
+        return self._tool_schemas
     
     async def health_check(self) -> Dict[str, bool]:
         """Check health of all MCP servers"""
@@ -237,15 +251,21 @@ class MCPClient:
         """Cleanup resources and close connections"""
         logger.info("🧹 Cleaning up MCP Client...")
         
-        for process in self.processes.values():
-            if process.poll() is None:  # Still running
+        try:
+            running = [process for process in self.processes.values() if process.returncode is None]
+            for process in running:
                 process.terminate()
-                try:
-                    await asyncio.wait_for(process.wait(), timeout=5.0)
-                except asyncio.TimeoutError:
+            
+            # Share a single timeout across all processes instead of waiting on each in turn
+            if running:
+                await asyncio.wait([asyncio.create_task(process.wait()) for process in running], timeout=5.0)
+            
+            for process in running:
+                if process.returncode is None:
                     process.kill()
+        finally:
+            self.processes.clear()
         
-        self.processes.clear()
         logger.info("✅ MCP Client cleanup completed")
 
 # Global MCP client instance
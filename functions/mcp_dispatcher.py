@@ -4,131 +4,155 @@ Routes tool calls to the appropriate MCP server implementations
 """
 
 import asyncio
+import importlib
 import logging
-from typing import Dict, List, Any, Optional, Callable
+import time
+from typing import Dict, List, Any, Optional, Callable, Tuple, Union
 from mcp_client import ToolCall, ToolResult
+from mcp_loop_local import LoopLocal
 
-# Import all MCP servers
-from mcp_servers import (
-    # GitHub
-    github_create_issue,
-    github_get_repository,
-    github_list_issues,
-    github_get_file_contents,
-    github_create_file,
-    github_search_repositories,
+logger = logging.getLogger(__name__)
+
+# Alternative tool names accepted by the dispatcher, mapped to their canonical name
+_TOOL_ALIASES = {
+    # GitHub tools
+    "create_issue": "github_create_issue",
+    "get_repository": "github_get_repository",
+    "list_issues": "github_list_issues",
+    "get_file_contents": "github_get_file_contents",
+    "create_file": "github_create_file",
+    "search_repositories": "github_search_repositories",
     
-    # JIRA
-    jira_create_issue,
-    jira_get_issue,
-    jira_update_issue,
-    jira_search_issues,
-    jira_add_comment,
-    jira_transition_issue,
-    jira_list_projects,
+    # JIRA tools - use jira_ prefix to avoid conflicts
+    "create_jira_issue": "jira_create_issue",
+    "get_issue": "jira_get_issue",
+    "update_issue": "jira_update_issue",
+    "search_issues": "jira_search_issues",
+    "add_comment": "jira_add_comment",
+    "transition_issue": "jira_transition_issue",
+    "list_projects": "jira_list_projects",
     
-    # Google Drive
-    gdrive_create_document,
-    gdrive_create_spreadsheet,
-    gdrive_read_document,
-    gdrive_update_document,
-    gdrive_list_files,
-    gdrive_share_file,
+    # Google Drive tools
+    "create_document": "gdrive_create_document",
+    "create_spreadsheet": "gdrive_create_spreadsheet",
+    "read_document": "gdrive_read_document",
+    "update_document": "gdrive_update_document",
+    "list_files": "gdrive_list_files",
+    "search_files": "gdrive_list_files",
+    "share_file": "gdrive_share_file",
     
-    # Web Search
-    web_search,
-    news_search,
-    get_page_content,
-    get_page_summary,
+    # Web Search tools
+    "search_web": "web_search",
+    "search_news": "news_search",
+    "fetch_page": "get_page_content",
+    "summarize_page": "get_page_summary",
     
-    # Email
-    send_email,
-    send_html_email,
-    send_email_with_attachment,
-    create_draft
-)
-
-logger = logging.getLogger(__name__)
+    # Email tools
+    "email_send": "send_email",
+    "email_with_attachment": "send_email_with_attachment",
+    "create_email_draft": "create_draft",
+    "get_email_draft": "get_draft_body",
+}
 
 class MCPToolDispatcher:
     """Dispatches tool calls to appropriate MCP server functions"""
     
     def __init__(self):
         self.tool_mapping = self._build_tool_mapping()
-        self.initialized = False
+        self.tool_categories = self._build_tool_categories()
+        # "module:function" -> imported server function
+        self._functions: Dict[str, Callable] = {}
+        self._tool_names = (*self.tool_mapping, *_TOOL_ALIASES)
+        self._available_tools_str = ", ".join(sorted(self._tool_names))
+        # The tool mapping is all the dispatcher needs, so it is ready once built
+        self.initialized = True
     
-    def _build_tool_mapping(self) -> Dict[str, Callable]:
-        """Build mapping of tool names to server functions"""
+    def _build_tool_mapping(self) -> Dict[str, Tuple[str, Union[str, Callable]]]:
+        """Build mapping of canonical tool names to their category and server function
+        
+        Server functions are named as "module:function" and imported on first
+        dispatch, so importing the dispatcher does not load every server's SDK.
+        """
         return {
             # GitHub tools
-            "create_issue": github_create_issue,
-            "github_create_issue": github_create_issue,
-            "get_repository": github_get_repository,
-            "github_get_repository": github_get_repository,
-            "list_issues": github_list_issues,
-            "github_list_issues": github_list_issues,
-            "get_file_contents": github_get_file_contents,
-            "github_get_file_contents": github_get_file_contents,
-            "create_file": github_create_file,
-            "github_create_file": github_create_file,
-            "search_repositories": github_search_repositories,
-            "github_search_repositories": github_search_repositories,
+            "github_create_issue": ("github", "mcp_servers.github_server:create_issue"),
+            "github_get_repository": ("github", "mcp_servers.github_server:get_repository"),
+            "github_list_issues": ("github", "mcp_servers.github_server:list_issues"),
+            "github_get_file_contents": ("github", "mcp_servers.github_server:get_file_contents"),
+            "github_create_file": ("github", "mcp_servers.github_server:create_file"),
+            "github_search_repositories": ("github", "mcp_servers.github_server:search_repositories"),
             
-            # JIRA tools - use jira_ prefix to avoid conflicts
-            "create_jira_issue": jira_create_issue,
-            "jira_create_issue": jira_create_issue,
-            "get_issue": jira_get_issue,
-            "jira_get_issue": jira_get_issue,
-            "update_issue": jira_update_issue,
-            "jira_update_issue": jira_update_issue,
-            "search_issues": jira_search_issues,
-            "jira_search_issues": jira_search_issues,
-            "add_comment": jira_add_comment,
-            "jira_add_comment": jira_add_comment,
-            "transition_issue": jira_transition_issue,
-            "jira_transition_issue": jira_transition_issue,
-            "list_projects": jira_list_projects,
-            "jira_list_projects": jira_list_projects,
+            # JIRA tools
+            "jira_create_issue": ("jira", "mcp_servers.jira_server:create_issue"),
+            "jira_get_issue": ("jira", "mcp_servers.jira_server:get_issue"),
+            "jira_update_issue": ("jira", "mcp_servers.jira_server:update_issue"),
+            "jira_search_issues": ("jira", "mcp_servers.jira_server:search_issues"),
+            "jira_add_comment": ("jira", "mcp_servers.jira_server:add_comment"),
+            "jira_transition_issue": ("jira", "mcp_servers.jira_server:transition_issue"),
+            "jira_list_projects": ("jira", "mcp_servers.jira_server:list_projects"),
             
             # Google Drive tools
-            "create_document": gdrive_create_document,
-            "gdrive_create_document": gdrive_create_document,
-            "create_spreadsheet": gdrive_create_spreadsheet,
-            "gdrive_create_spreadsheet": gdrive_create_spreadsheet,
-            "read_document": gdrive_read_document,
-            "gdrive_read_document": gdrive_read_document,
-            "update_document": gdrive_update_document,
-            "gdrive_update_document": gdrive_update_document,
-            "list_files": gdrive_list_files,
-            "gdrive_list_files": gdrive_list_files,
-            "search_files": gdrive_list_files,  # Alias
-            "share_file": gdrive_share_file,
-            "gdrive_share_file": gdrive_share_file,
+            "gdrive_create_document": ("google_drive", "mcp_servers.google_drive_server:create_document"),
+            "gdrive_create_spreadsheet": ("google_drive", "mcp_servers.google_drive_server:create_spreadsheet"),
+            "gdrive_read_document": ("google_drive", "mcp_servers.google_drive_server:read_document"),
+            "gdrive_update_document": ("google_drive", "mcp_servers.google_drive_server:update_document"),
+            "gdrive_list_files": ("google_drive", "mcp_servers.google_drive_server:list_files"),
+            "gdrive_share_file": ("google_drive", "mcp_servers.google_drive_server:share_file"),
             
             # Web Search tools
-            "web_search": web_search,
-            "search_web": web_search,  # Alias
-            "news_search": news_search,
-            "search_news": news_search,  # Alias
-            "get_page_content": get_page_content,
-            "fetch_page": get_page_content,  # Alias
-            "get_page_summary": get_page_summary,
-            "summarize_page": get_page_summary,  # Alias
+            "web_search": ("web_search", "mcp_servers.web_search_server:web_search"),
+            "news_search": ("web_search", "mcp_servers.web_search_server:news_search"),
+            "get_page_content": ("web_search", "mcp_servers.web_search_server:get_page_content"),
+            "get_page_summary": ("web_search", "mcp_servers.web_search_server:get_page_summary"),
             
             # Email tools
-            "send_email": send_email,
-            "email_send": send_email,  # Alias
-            "send_html_email": send_html_email,
-            "send_email_with_attachment": send_email_with_attachment,
-            "email_with_attachment": send_email_with_attachment,  # Alias
-            "create_draft": create_draft,
-            "create_email_draft": create_draft,  # Alias
+            "send_email": ("email", "mcp_servers.email_server:send_email"),
+            "send_html_email": ("email", "mcp_servers.email_server:send_html_email"),
+            "send_email_with_attachment": ("email", "mcp_servers.email_server:send_email_with_attachment"),
+            "create_draft": ("email", "mcp_servers.email_server:create_draft"),
+            "get_draft_body": ("email", "mcp_servers.email_server:get_draft_body"),
             
             # Calendar tools (these would map to Google Calendar when implemented)
-            "create_event": self._not_implemented("create_event"),
-            "list_events": self._not_implemented("list_events"),
-            "get_free_busy": self._not_implemented("get_free_busy"),
+            "create_event": ("calendar", self._not_implemented("create_event")),
+            "list_events": ("calendar", self._not_implemented("list_events")),
+            "get_free_busy": ("calendar", self._not_implemented("get_free_busy")),
+        }
+    
+    def _build_tool_categories(self) -> Dict[str, Tuple[str, ...]]:
+        """Group tool names and aliases by category"""
+        categories = {
+            "github": [],
+            "jira": [],
+            "google_drive": [],
+            "web_search": [],
+            "email": [],
+            "calendar": [],
+            "other": []
         }
+        
+        for tool_name, (category, _) in self.tool_mapping.items():
+            categories[category].append(tool_name)
+        
+        for alias, tool_name in _TOOL_ALIASES.items():
+            categories[self.tool_mapping[tool_name][0]].append(alias)
+        
+        return {category: tuple(tools) for category, tools in categories.items()}
+    
+    def _resolve(self, tool_name: str) -> Optional[Tuple[str, Union[str, Callable]]]:
+        """Resolve a tool name or alias to its category and server function"""
+        return self.tool_mapping.get(tool_name) or self.tool_mapping.get(_TOOL_ALIASES.get(tool_name, ""))
+    
+    def _load_function(self, target: Union[str, Callable]) -> Callable:
+        """Import a "module:function" server function, once"""
+        if callable(target):
+            return target
+        
+        function = self._functions.get(target)
+        if function is None:
+            module_name, attr = target.split(":")
+            function = getattr(importlib.import_module(module_name), attr)
+            self._functions[target] = function
+        return function
     
     def _not_implemented(self, tool_name: str) -> Callable:
         """Return a function that indicates the tool is not yet implemented"""
@@ -142,7 +166,7 @@ class MCPToolDispatcher:
     async def initialize(self) -> bool:
         """Initialize the dispatcher"""
         try:
-            logger.info(f"🔧 MCP Tool Dispatcher initialized with {len(self.tool_mapping)} tools")
+            logger.info(f"🔧 MCP Tool Dispatcher initialized with {len(self._tool_names)} tools")
             self.initialized = True
             return True
         except Exception as e:
@@ -151,64 +175,50 @@ class MCPToolDispatcher:
     
     async def dispatch_tool(self, tool_call: ToolCall) -> ToolResult:
         """Dispatch a tool call to the appropriate server function"""
-        import time
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
-            if not self.initialized:
-                return ToolResult(
-                    success=False,
-                    content=None,
-                    error="MCP Tool Dispatcher not initialized",
-                    tool_name=tool_call.name
-                )
-            
             # Get the function for this tool
-            tool_function = self.tool_mapping.get(tool_call.name)
+            entry = self._resolve(tool_call.name)
             
-            if not tool_function:
+            if entry is None:
                 return ToolResult(
                     success=False,
                     content=None,
-                    error=f"Tool '{tool_call.name}' not found. Available tools: {list(self.tool_mapping.keys())}",
+                    error=f"Tool '{tool_call.name}' not found. Available tools: {self._available_tools_str}",
                     tool_name=tool_call.name
                 )
             
-            logger.info(f"🔧 Dispatching tool: {tool_call.name} with parameters: {tool_call.parameters}")
+            logger.info("🔧 Dispatching tool: %s with parameters: %s", tool_call.name, tool_call.parameters)
             
-            # Call the tool function
+            # Call the tool function, importing its server module on first use
+            tool_function = self._load_function(entry[1])
             result = await tool_function(**tool_call.parameters)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
-            # Check if the result indicates success
+            # Non-dict results are assumed successful; dicts fail on an error key
+            # or an explicit falsy "success"
             if isinstance(result, dict):
-                if result.get("success", True) and "error" not in result:
-                    return ToolResult(
-                        success=True,
-                        content=result,
-                        tool_name=tool_call.name,
-                        execution_time=execution_time
-                    )
-                else:
+                err = result.get("error")
+                if err is not None or not result.get("success", True):
                     return ToolResult(
                         success=False,
                         content=result,
-                        error=result.get("error", "Unknown error"),
+                        error=err or "Unknown error",
                         tool_name=tool_call.name,
                         execution_time=execution_time
                     )
-            else:
-                # Non-dict result, assume success
-                return ToolResult(
-                    success=True,
-                    content=result,
-                    tool_name=tool_call.name,
-                    execution_time=execution_time
-                )
+            
+            return ToolResult(
+                success=True,
+                content=result,
+                tool_name=tool_call.name,
+                execution_time=execution_time
+            )
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"💥 Error dispatching tool {tool_call.name}: {e}")
             return ToolResult(
                 success=False,
@@ -220,80 +230,55 @@ class MCPToolDispatcher:
     
     async def dispatch_batch(self, tool_calls: List[ToolCall]) -> List[ToolResult]:
         """Dispatch multiple tool calls in parallel"""
-        logger.info(f"🔄 Dispatching {len(tool_calls)} tools in batch")
-        
-        tasks = [self.dispatch_tool(call) for call in tool_calls]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Handle exceptions in results
-        processed_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                processed_results.append(ToolResult(
-                    success=False,
-                    content=None,
-                    error=str(result),
-                    tool_name=tool_calls[i].name
-                ))
-            else:
-                processed_results.append(result)
+        logger.info("🔄 Dispatching %d tools in batch", len(tool_calls))
         
-        return processed_results
+        # dispatch_tool turns every exception into a failed ToolResult
+        return list(await asyncio.gather(*(self.dispatch_tool(call) for call in tool_calls)))
     
-    def get_available_tools(self) -> List[str]:
-        """Get list of all available tools"""
-        return list(self.tool_mapping.keys())
+    def get_available_tools(self) -> Tuple[str, ...]:
+        """Get all available tool names (shared, do not mutate)"""
+        return self._tool_names
     
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific tool"""
-        if tool_name not in self.tool_mapping:
+        entry = self._resolve(tool_name)
+        if entry is None:
             return None
         
+        target = entry[1]
+        if callable(target):
+            module_name, function_name = target.__module__, target.__name__
+        else:
+            # Read from the name so listing tools does not import their servers
+            module_name, function_name = target.split(":")
+        
         # Basic tool info - could be extended with schemas
         return {
             "name": tool_name,
             "available": True,
-            "function": self.tool_mapping[tool_name].__name__,
-            "module": self.tool_mapping[tool_name].__module__
+            "function": function_name,
+            "module": module_name
         }
     
     def get_tools_by_category(self) -> Dict[str, List[str]]:
         """Group tools by category"""
-        categories = {
-            "github": [],
-            "jira": [],
-            "google_drive": [],
-            "web_search": [],
-            "email": [],
-            "calendar": [],
-            "other": []
-        }
-        
-        for tool_name in self.tool_mapping.keys():
-            if "github" in tool_name or tool_name in ["create_issue", "get_repository", "list_issues", "get_file_contents", "create_file", "search_repositories"]:
-                categories["github"].append(tool_name)
-            elif "jira" in tool_name or tool_name in ["get_issue", "update_issue", "search_issues", "add_comment", "transition_issue", "list_projects"]:
-                categories["jira"].append(tool_name)
-            elif "gdrive" in tool_name or tool_name in ["create_document", "create_spreadsheet", "read_document", "update_document", "list_files", "share_file", "search_files"]:
-                categories["google_drive"].append(tool_name)
-            elif "search" in tool_name or tool_name in ["web_search", "news_search", "get_page_content", "get_page_summary", "fetch_page", "summarize_page"]:
-                categories["web_search"].append(tool_name)
-            elif "email" in tool_name or tool_name in ["send_email", "send_html_email", "send_email_with_attachment", "create_draft"]:
-                categories["email"].append(tool_name)
-            elif "event" in tool_name or "calendar" in tool_name or tool_name in ["create_event", "list_events", "get_free_busy"]:
-                categories["calendar"].append(tool_name)
-            else:
-                categories["other"].append(tool_name)
-        
-        return categories
+        return {category: list(tools) for category, tools in self.tool_categories.items()}
 
 # Global dispatcher instance
 _dispatcher = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_dispatcher_lock = LoopLocal(asyncio.Lock)
 
 async def get_mcp_dispatcher() -> MCPToolDispatcher:
     """Get or create the global MCP dispatcher instance"""
     global _dispatcher
-    if _dispatcher is None:
-        _dispatcher = MCPToolDispatcher()
-        await _dispatcher.initialize()
+    if _dispatcher is not None:
+        return _dispatcher
+    
+    # Only the first callers contend here; the instance is published once initialized
+    async with _dispatcher_lock.get():
+        if _dispatcher is None:
+            dispatcher = MCPToolDispatcher()
+            await dispatcher.initialize()
+            _dispatcher = dispatcher
     return _dispatcher
@@ -3,246 +3,288 @@ Function Calling Parser for MCP Integration
 Handles parsing and validation of function calls from LLM responses
 """
 
+import functools
+import itertools
 import json
 import re
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Union, Tuple
-from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterator, List, Any, Optional, Union, Tuple
+from dataclasses import dataclass, field
 from mcp_client import ToolCall, ToolResult
 
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+_jloads = orjson.loads if orjson is not None else json.loads
+
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedFunctionCall:
     """Represents a parsed function call from LLM"""
     name: str
     arguments: Dict[str, Any]
-    raw_text: str
+    # Response the call was parsed from and the (start, end) of its match
+    _source: str = field(repr=False)
+    _span: Tuple[int, int] = field(repr=False)
     confidence: float = 1.0
+    # Canonical name + arguments key used for deduplication
+    _key: Optional[str] = field(default=None, repr=False)
+    
+    @property
+    def raw_text(self) -> str:
+        """Text of the matched call, sliced from the source on demand"""
+        start, end = self._span
+        return self._source[start:end]
+
+def _jdumps(obj: Any) -> str:
+    """Serialize obj as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits, let stdlib handle or raise
+    return json.dumps(obj, indent=2)
+
+def _call_key(name: str, arguments: Dict[str, Any]) -> str:
+    """Build the deduplication key for a parsed call"""
+    if orjson is not None:
+        try:
+            return name + "\0" + orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS).decode()
+        except TypeError:
+            pass
+    return name + "\0" + json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+
+@functools.lru_cache(maxsize=8)
+def _function_call_re(tools: FrozenSet[str]) -> re.Pattern:
+    """Compile the fused call pattern for a tool set.
+    
+    All supported formats are alternatives of one pattern so a response is
+    scanned in one pass, and names are restricted to the given tools so the
+    regex engine skips non-tool calls itself. Calls inside markdown code
+    blocks are picked up by the standard alternative.
+    """
+    # Longest first so a tool name never loses to one of its prefixes
+    names = "|".join(sorted(map(re.escape, tools), key=len, reverse=True))
+    return re.compile(
+        # XML-style: <function_call name="function_name">{"arg1": "value"}</function_call>
+        r'(?P<xml><function_call\s+name=["\'](?P<xml_name>' + names + r')["\']\s*>\s*(?P<xml_args>\{[^}]*\})\s*</function_call>)'
+        # JSON-style tool use
+        r'|(?P<json_tool>```json\s*\{\s*"tool_use"\s*:\s*\{\s*"name"\s*:\s*"(?P<json_name>' + names + r')"\s*,\s*"parameters"\s*:\s*(?P<json_args>\{[^}]*\})\s*\}\s*\}\s*```)'
+        # Standard function call: function_name(arg1="value", arg2=123). The
+        # possessive argument quantifier avoids backtracking over text that
+        # has no closing paren.
+        r'|(?P<standard>\b(?P<std_name>' + names + r')\s*\(\s*(?P<std_args>[^)]*+)\s*\))',
+        re.MULTILINE | re.DOTALL
+    )
+
+# Every call format contains at least one of these substrings
+_CALL_SENTINELS = ("(", "<function_call", "tool_use")
+
+# Confidence assigned to calls parsed from each format
+_CONFIDENCE = {
+    'xml': 0.9,
+    'json_tool': 0.95,
+    'standard': 0.8
+}
+
+# Literal argument values recognised case-insensitively
+_KEYWORD_VALUES = {
+    'true': True,
+    'false': False,
+    'none': None,
+    'null': None
+}
+
+# Characters a numeric argument value can start with
+_NUMBER_START = frozenset('0123456789+-.')
+
+# Call ids only need to be unique within this process: a random per-process
+# prefix plus a counter avoids an os.urandom read per call
+_call_prefix = uuid.uuid4().hex[:4]
+_call_counter = itertools.count()
 
 class FunctionCallParser:
     """Parser for extracting and validating function calls from LLM responses"""
     
-    def __init__(self):
-        # Regex patterns for different function call formats
-        self.patterns = {
-            # Standard function call: function_name(arg1="value", arg2=123)
-            'standard': re.compile(
-                r'(\w+)\s*\(\s*([^)]*)\s*\)',
-                re.MULTILINE | re.DOTALL
-            ),
-            
-            # XML-style: <function_call name="function_name">{"arg1": "value"}</function_call>
-            'xml': re.compile(
-                r'<function_call\s+name=["\']([^"\']+)["\']\s*>\s*(\{[^}]*\})\s*</function_call>',
-                re.MULTILINE | re.DOTALL
-            ),
-            
-            # JSON-style tool use
-            'json_tool': re.compile(
-                r'```json\s*\{\s*"tool_use"\s*:\s*\{\s*"name"\s*:\s*"([^"]+)"\s*,\s*"parameters"\s*:\s*(\{[^}]*\})\s*\}\s*\}\s*```',
-                re.MULTILINE | re.DOTALL
-            ),
-            
-            # Markdown code block with function call
-            'markdown': re.compile(
-                r'```(\w+)?\s*(\w+)\s*\(\s*([^)]*)\s*\)\s*```',
-                re.MULTILINE | re.DOTALL
-            )
-        }
-    
     def parse_llm_response(self, response: str, available_tools: List[str]) -> List[ParsedFunctionCall]:
         """Parse function calls from LLM response text"""
+        # Cheap substring check before running the regex on plain prose
+        if not any(sentinel in response for sentinel in _CALL_SENTINELS):
+            return []
+        
+        if not available_tools:
+            return []
+        
         function_calls = []
         
         try:
-            # Try different parsing strategies
-            function_calls.extend(self._parse_xml_style(response, available_tools))
-            function_calls.extend(self._parse_json_tool_use(response, available_tools))
-            function_calls.extend(self._parse_standard_calls(response, available_tools))
-            function_calls.extend(self._parse_markdown_calls(response, available_tools))
+            pattern = _function_call_re(frozenset(available_tools))
+            
+            for match in pattern.finditer(response):
+                call = self._HANDLERS[match.lastgroup](self, match)
+                if call:
+                    function_calls.append(call)
             
             # Remove duplicates
-            function_calls = self._deduplicate_calls(function_calls)
+            if len(function_calls) > 1:
+                function_calls = self._deduplicate_calls(function_calls)
             
-            logger.info(f"📝 Parsed {len(function_calls)} function calls from LLM response")
+            logger.info("📝 Parsed %d function calls from LLM response", len(function_calls))
             return function_calls
             
         except Exception as e:
             logger.error(f"❌ Error parsing function calls: {e}")
             return []
     
-    def _parse_xml_style(self, text: str, available_tools: List[str]) -> List[ParsedFunctionCall]:
-        """Parse XML-style function calls"""
-        calls = []
-        matches = self.patterns['xml'].findall(text)
+    def _parse_xml_style(self, match: re.Match) -> Optional[ParsedFunctionCall]:
+        """Parse an XML-style function call"""
+        name, args_json = match.group('xml_name', 'xml_args')
         
-        for name, args_json in matches:
-            if name in available_tools:
-                try:
-                    arguments = json.loads(args_json)
-                    calls.append(ParsedFunctionCall(
-                        name=name,
-                        arguments=arguments,
-                        raw_text=f'<function_call name="{name}">{args_json}</function_call>',
-                        confidence=0.9
-                    ))
-                except json.JSONDecodeError:
-                    logger.warning(f"⚠️ Invalid JSON in XML function call: {args_json}")
+        try:
+            arguments = _jloads(args_json)
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Invalid JSON in XML function call: {args_json}")
+            return None
         
-        return calls
+        return ParsedFunctionCall(
+            name=name,
+            arguments=arguments,
+            _source=match.string,
+            _span=match.span(),
+            confidence=_CONFIDENCE['xml'],
+            _key=_call_key(name, arguments)
+        )
     
-    def _parse_json_tool_use(self, text: str, available_tools: List[str]) -> List[ParsedFunctionCall]:
-        """Parse JSON tool use format"""
-        calls = []
-        matches = self.patterns['json_tool'].findall(text)
+    def _parse_json_tool_use(self, match: re.Match) -> Optional[ParsedFunctionCall]:
+        """Parse a JSON tool use block"""
+        name, params_json = match.group('json_name', 'json_args')
         
-        for name, params_json in matches:
-            if name in available_tools:
-                try:
-                    parameters = json.loads(params_json)
-                    calls.append(ParsedFunctionCall(
-                        name=name,
-                        arguments=parameters,
-                        raw_text=f'```json{{"tool_use": {{"name": "{name}", "parameters": {params_json}}}}}```',
-                        confidence=0.95
-                    ))
-                except json.JSONDecodeError:
-                    logger.warning(f"⚠️ Invalid JSON in tool use: {params_json}")
+        try:
+            parameters = _jloads(params_json)
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Invalid JSON in tool use: {params_json}")
+            return None
         
-        return calls
+        return ParsedFunctionCall(
+            name=name,
+            arguments=parameters,
+            _source=match.string,
+            _span=match.span(),
+            confidence=_CONFIDENCE['json_tool'],
+            _key=_call_key(name, parameters)
+        )
     
-    def _parse_standard_calls(self, text: str, available_tools: List[str]) -> List[ParsedFunctionCall]:
-        """Parse standard function call syntax"""
-        calls = []
-        matches = self.patterns['standard'].findall(text)
+    def _parse_standard_call(self, match: re.Match) -> Optional[ParsedFunctionCall]:
+        """Parse a standard function call"""
+        name, args_str = match.group('std_name', 'std_args')
         
-        for name, args_str in matches:
-            if name in available_tools:
-                try:
-                    # Parse arguments string
-                    arguments = self._parse_arguments_string(args_str)
-                    calls.append(ParsedFunctionCall(
-                        name=name,
-                        arguments=arguments,
-                        raw_text=f'{name}({args_str})',
-                        confidence=0.8
-                    ))
-                except Exception as e:
-                    logger.warning(f"⚠️ Error parsing arguments for {name}: {e}")
+        try:
+            # Parse arguments string
+            arguments = self._parse_arguments_string(args_str)
+        except Exception as e:
+            logger.warning(f"⚠️ Error parsing arguments for {name}: {e}")
+            return None
         
-        return calls
+        return ParsedFunctionCall(
+            name=name,
+            arguments=arguments,
+            _source=match.string,
+            _span=match.span(),
+            confidence=_CONFIDENCE['standard'],
+            _key=_call_key(name, arguments)
+        )
     
-    def _parse_markdown_calls(self, text: str, available_tools: List[str]) -> List[ParsedFunctionCall]:
-        """Parse function calls in markdown code blocks"""
-        calls = []
-        matches = self.patterns['markdown'].findall(text)
-        
-        for lang, name, args_str in matches:
-            if name in available_tools:
-                try:
-                    arguments = self._parse_arguments_string(args_str)
-                    calls.append(ParsedFunctionCall(
-                        name=name,
-                        arguments=arguments,
-                        raw_text=f'```{lang}\n{name}({args_str})\n```',
-                        confidence=0.7
-                    ))
-                except Exception as e:
-                    logger.warning(f"⚠️ Error parsing markdown call for {name}: {e}")
-        
-        return calls
+    # Parser for each named alternative of the fused call pattern
+    _HANDLERS = {
+        'xml': _parse_xml_style,
+        'json_tool': _parse_json_tool_use,
+        'standard': _parse_standard_call
+    }
     
     def _parse_arguments_string(self, args_str: str) -> Dict[str, Any]:
         """Parse argument string into dictionary"""
         if not args_str.strip():
             return {}
         
-        # Try to parse as JSON first
-        try:
-            return json.loads(f'{{{args_str}}}')
-        except:
-            pass
+        # JSON-style arguments ("key": value) can be loaded directly
+        if args_str.lstrip().startswith('"'):
+            try:
+                return json.loads(f'{{{args_str}}}')
+            except json.JSONDecodeError:
+                pass
         
         # Parse key=value pairs
         arguments = {}
         
-        # Split by commas, but be careful with quoted strings
-        args_parts = self._smart_split(args_str, ',')
-        
-        for part in args_parts:
+        for part in self._split_arguments(args_str):
             part = part.strip()
             if '=' in part:
                 key, value = part.split('=', 1)
                 key = key.strip().strip('"\'')
-                value = value.strip()
                 
                 # Parse value
                 arguments[key] = self._parse_value(value)
         
         return arguments
     
-    def _smart_split(self, text: str, delimiter: str) -> List[str]:
-        """Split string by delimiter, respecting quoted strings"""
-        parts = []
-        current = ""
-        in_quotes = False
+    @staticmethod
+    def _split_arguments(text: str) -> Iterator[str]:
+        """Yield comma-separated parts of an argument string, respecting quoted strings"""
+        start = 0
         quote_char = None
         
-        for char in text:
-            if char in ['"', "'"] and not in_quotes:
-                in_quotes = True
+        for i, char in enumerate(text):
+            if quote_char:
+                if char == quote_char:
+                    quote_char = None
+            elif char == '"' or char == "'":
                 quote_char = char
-                current += char
-            elif char == quote_char and in_quotes:
-                in_quotes = False
-                quote_char = None
-                current += char
-            elif char == delimiter and not in_quotes:
-                parts.append(current)
-                current = ""
-            else:
-                current += char
-        
-        if current:
-            parts.append(current)
+            elif char == ',':
+                yield text[start:i]
+                start = i + 1
         
-        return parts
+        if start < len(text):
+            yield text[start:]
     
     def _parse_value(self, value_str: str) -> Any:
         """Parse a string value to appropriate Python type"""
         value_str = value_str.strip()
+        if not value_str:
+            return value_str
+        
+        first = value_str[0]
         
         # Handle quoted strings
-        if (value_str.startswith('"') and value_str.endswith('"')) or \
-           (value_str.startswith("'") and value_str.endswith("'")):
+        if (first == '"' or first == "'") and value_str.endswith(first):
             return value_str[1:-1]
         
-        # Handle boolean
-        if value_str.lower() == 'true':
-            return True
-        elif value_str.lower() == 'false':
-            return False
-        
-        # Handle None/null
-        if value_str.lower() in ['none', 'null']:
-            return None
+        # Handle boolean and None/null
+        keyword = value_str.lower()
+        if keyword in _KEYWORD_VALUES:
+            return _KEYWORD_VALUES[keyword]
         
         # Handle numbers
-        try:
-            if '.' in value_str:
-                return float(value_str)
-            else:
+        if first in _NUMBER_START:
+            try:
                 return int(value_str)
-        except ValueError:
-            pass
+            except ValueError:
+                pass
+            try:
+                return float(value_str)
+            except ValueError:
+                pass
         
         # Handle JSON objects/arrays
-        try:
-            return json.loads(value_str)
-        except:
-            pass
+        elif first == '{' or first == '[':
+            try:
+                return json.loads(value_str)
+            except json.JSONDecodeError:
+                pass
         
         # Return as string
         return value_str
@@ -255,8 +297,9 @@ class FunctionCallParser:
         # Group by name and arguments
         call_groups = {}
         for call in calls:
-            key = (call.name, json.dumps(call.arguments, sort_keys=True))
-            if key not in call_groups or call.confidence > call_groups[key].confidence:
+            key = call._key or _call_key(call.name, call.arguments)
+            existing = call_groups.get(key)
+            if existing is None or call.confidence > existing.confidence:
                 call_groups[key] = call
         
         return list(call_groups.values())
@@ -282,17 +325,17 @@ class FunctionCallParser:
     
     def create_tool_calls(self, parsed_calls: List[ParsedFunctionCall]) -> List[ToolCall]:
         """Convert parsed calls to ToolCall objects"""
-        tool_calls = []
-        
-        for call in parsed_calls:
-            tool_call = ToolCall(
-                id=f"call_{uuid.uuid4().hex[:8]}",
+        return [
+            ToolCall(
+                id=f"call_{_call_prefix}{next(_call_counter):04x}",
                 name=call.name,
                 parameters=call.arguments
             )
-            tool_calls.append(tool_call)
-        
-        return tool_calls
+            for call in parsed_calls
+        ]
+
+# Global parser instance (stateless, safe to share)
+_SHARED_PARSER = FunctionCallParser()
 
 class GeminiFunctionCallHandler:
     """Specialized handler for Google Gemini function calling"""
@@ -307,7 +350,7 @@ class GeminiFunctionCallHandler:
             if hasattr(response, 'function_calls') and response.function_calls:
                 for fc in response.function_calls:
                     tool_call = ToolCall(
-                        id=f"gemini_call_{uuid.uuid4().hex[:8]}",
+                        id=f"gemini_call_{_call_prefix}{next(_call_counter):04x}",
                         name=fc.name,
                         parameters=dict(fc.args) if hasattr(fc, 'args') else {}
                     )
@@ -315,10 +358,9 @@ class GeminiFunctionCallHandler:
             
             # Fallback to text parsing if no native function calls
             elif hasattr(response, 'text') and response.text:
-                parser = FunctionCallParser()
                 # This would need available_tools list
-                parsed_calls = parser.parse_llm_response(response.text, [])
-                tool_calls.extend(parser.create_tool_calls(parsed_calls))
+                parsed_calls = _SHARED_PARSER.parse_llm_response(response.text, [])
+                tool_calls.extend(_SHARED_PARSER.create_tool_calls(parsed_calls))
                 
         except Exception as e:
             logger.error(f"❌ Error extracting Gemini function calls: {e}")
@@ -330,7 +372,7 @@ def format_tool_result_for_llm(result: ToolResult) -> str:
     if result.success:
         content = result.content
         if isinstance(content, dict):
-            content = json.dumps(content, indent=2)
+            content = _jdumps(content)
         elif not isinstance(content, str):
             content = str(content)
         
@@ -350,9 +392,4 @@ def format_multiple_results_for_llm(results: List[ToolResult]) -> str:
     if not results:
         return ""
     
-    formatted_results = []
-    
-    for result in results:
-        formatted_results.append(format_tool_result_for_llm(result))
-    
-    return "\n\n---\n\n".join(formatted_results)
+    return "\n\n---\n\n".join(format_tool_result_for_llm(result) for result in results)
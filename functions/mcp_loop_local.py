@@ -0,0 +1,34 @@
+"""
+Per-Event-Loop State
+Every Functions request runs its own asyncio.run() loop, so clients, pools,
+locks and futures kept on module-level singletons must be created per loop
+"""
+
+import asyncio
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+class LoopLocal(Generic[T]):
+    """A value created lazily for each running event loop"""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._values: Dict[asyncio.AbstractEventLoop, T] = {}
+
+    def get(self) -> T:
+        """Get the running loop's value, creating it on first use in that loop"""
+        loop = asyncio.get_running_loop()
+        value = self._values.get(loop)
+        if value is None:
+            # Values of finished loops are dropped without closing them:
+            # their connections went away with the loop
+            for old in list(self._values):
+                if old.is_closed():
+                    self._values.pop(old, None)
+            value = self._values[loop] = self._factory()
+        return value
+
+    def pop(self) -> Optional[T]:
+        """Remove and return the running loop's value, if it has one"""
+        return self._values.pop(asyncio.get_running_loop(), None)
@@ -3,200 +3,143 @@ MCP Servers Package
 Contains all MCP server implementations for different services
 """
 
-# Import core functions from mcp_servers.py
-try:
-    import sys
-    import os
-    # Add the parent directory to the path so we can import mcp_servers.py
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    
-    from mcp_servers import (
-        get_mcp_server_configs,
-        get_tools_for_agent,
-        get_function_definitions_for_gemini,
-        get_available_tools,
-        get_tool_to_server_mapping,
-        get_server_installation_status
-    )
-except ImportError as e:
-    print(f"Warning: Could not import core MCP functions: {e}")
-    # Create placeholder functions
-    def get_mcp_server_configs():
-        return {}
-    def get_tools_for_agent(agent_id):
-        return []
-    def get_function_definitions_for_gemini(tools):
-        return []
-    def get_available_tools():
-        return []
-    def get_tool_to_server_mapping():
-        return {}
-    def get_server_installation_status():
-        return {}
-
-# Import servers with error handling for missing dependencies
-try:
-    from .github_server import (
-        get_github_server,
-        create_issue as github_create_issue,
-        get_repository as github_get_repository,
-        list_issues as github_list_issues,
-        get_file_contents as github_get_file_contents,
-        create_file as github_create_file,
-        search_repositories as github_search_repositories
-    )
-    GITHUB_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: GitHub server not available: {e}")
-    get_github_server = None
-    github_create_issue = None
-    github_get_repository = None
-    github_list_issues = None
-    github_get_file_contents = None
-    github_create_file = None
-    github_search_repositories = None
-    GITHUB_AVAILABLE = False
-
-try:
-    from .jira_server import (
-        get_jira_server,
-        create_issue as jira_create_issue,
-        get_issue as jira_get_issue,
-        update_issue as jira_update_issue,
-        search_issues as jira_search_issues,
-        add_comment as jira_add_comment,
-        transition_issue as jira_transition_issue,
-        list_projects as jira_list_projects
-    )
-    JIRA_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: JIRA server not available: {e}")
-    get_jira_server = None
-    jira_create_issue = None
-    jira_get_issue = None
-    jira_update_issue = None
-    jira_search_issues = None
-    jira_add_comment = None
-    jira_transition_issue = None
-    jira_list_projects = None
-    JIRA_AVAILABLE = False
+import os
+import sys
+import logging
+import importlib
+import importlib.util
 
-try:
-    from .google_drive_server import (
-        get_gdrive_server,
-        create_document as gdrive_create_document,
-        create_spreadsheet as gdrive_create_spreadsheet,
-        read_document as gdrive_read_document,
-        update_document as gdrive_update_document,
-        list_files as gdrive_list_files,
-        share_file as gdrive_share_file
-    )
-    GDRIVE_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Google Drive server not available: {e}")
-    get_gdrive_server = None
-    gdrive_create_document = None
-    gdrive_create_spreadsheet = None
-    gdrive_read_document = None
-    gdrive_update_document = None
-    gdrive_list_files = None
-    gdrive_share_file = None
-    GDRIVE_AVAILABLE = False
+logger = logging.getLogger(__name__)
 
-try:
-    from .web_search_server import (
-        get_web_search_server,
-        web_search,
-        news_search,
-        get_page_content,
-        get_page_summary
-    )
-    WEB_SEARCH_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Web search server not available: {e}")
-    get_web_search_server = None
-    web_search = None
-    news_search = None
-    get_page_content = None
-    get_page_summary = None
-    WEB_SEARCH_AVAILABLE = False
+# Server modules import top-level modules such as mcp_auth from functions/
+_parent = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _parent not in sys.path:
+    sys.path.append(_parent)
 
-try:
-    from .email_server import (
-        get_email_server,
-        send_email,
-        send_html_email,
-        send_email_with_attachment,
-        create_draft
-    )
-    EMAIL_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Email server not available: {e}")
-    get_email_server = None
-    send_email = None
-    send_html_email = None
-    send_email_with_attachment = None
-    create_draft = None
-    EMAIL_AVAILABLE = False
+# Core configuration functions
+from .server_config import (
+    ServerConfig,
+    get_server_configs,
+    get_mcp_server_configs,
+    get_tools_for_agent,
+    get_tools_for_agent_set,
+    is_tool_allowed_for_agent,
+    get_function_definitions_for_gemini,
+    get_available_tools,
+    get_available_tools_set,
+    get_tool_to_server_mapping,
+    get_server_installation_status
+)
 
-# Export availability flags
-__all__ = [
-    # Core MCP functions
+_CORE_EXPORTS = (
+    'ServerConfig',
+    'get_server_configs',
     'get_mcp_server_configs',
     'get_tools_for_agent',
+    'get_tools_for_agent_set',
+    'is_tool_allowed_for_agent',
     'get_function_definitions_for_gemini',
     'get_available_tools',
+    'get_available_tools_set',
     'get_tool_to_server_mapping',
-    'get_server_installation_status',
-    
-    # Availability flags
-    'GITHUB_AVAILABLE',
-    'JIRA_AVAILABLE', 
-    'GDRIVE_AVAILABLE',
-    'WEB_SEARCH_AVAILABLE',
-    'EMAIL_AVAILABLE',
-    
-    # Server instances
-    'get_github_server',
-    'get_jira_server',
-    'get_gdrive_server',
-    'get_web_search_server',
-    'get_email_server',
-    
-    # GitHub tools
-    'github_create_issue',
-    'github_get_repository',
-    'github_list_issues',
-    'github_get_file_contents',
-    'github_create_file',
-    'github_search_repositories',
-    
-    # JIRA tools
-    'jira_create_issue',
-    'jira_get_issue',
-    'jira_update_issue',
-    'jira_search_issues',
-    'jira_add_comment',
-    'jira_transition_issue',
-    'jira_list_projects',
-    
-    # Google Drive tools
-    'gdrive_create_document',
-    'gdrive_create_spreadsheet',
-    'gdrive_read_document',
-    'gdrive_update_document',
-    'gdrive_list_files',
-    'gdrive_share_file',
-    
-    # Web search tools
-    'web_search',
-    'news_search',
-    'get_page_content',
-    'get_page_summary',
+    'get_server_installation_status'
+)
+
+# Server modules pull in heavy SDKs, so their exports are imported on first
+# use (PEP 562). Submodule -> (warning label, availability flag, required
+# third-party packages, {public name: attribute})
+_SUBMODULES = {
+    'github_server': ('GitHub server', 'GITHUB_AVAILABLE', (), {
+        'get_github_server': 'get_github_server',
+        'github_create_issue': 'create_issue',
+        'github_get_repository': 'get_repository',
+        'github_list_issues': 'list_issues',
+        'github_get_file_contents': 'get_file_contents',
+        'github_create_file': 'create_file',
+        'github_search_repositories': 'search_repositories'
+    }),
+    'jira_server': ('JIRA server', 'JIRA_AVAILABLE', (), {
+        'get_jira_server': 'get_jira_server',
+        'jira_create_issue': 'create_issue',
+        'jira_get_issue': 'get_issue',
+        'jira_update_issue': 'update_issue',
+        'jira_search_issues': 'search_issues',
+        'jira_add_comment': 'add_comment',
+        'jira_transition_issue': 'transition_issue',
+        'jira_list_projects': 'list_projects'
+    }),
+    'google_drive_server': ('Google Drive server', 'GDRIVE_AVAILABLE', ('googleapiclient', 'google'), {
+        'get_gdrive_server': 'get_gdrive_server',
+        'gdrive_create_document': 'create_document',
+        'gdrive_create_spreadsheet': 'create_spreadsheet',
+        'gdrive_read_document': 'read_document',
+        'gdrive_update_document': 'update_document',
+        'gdrive_list_files': 'list_files',
+        'gdrive_share_file': 'share_file'
+    }),
+    'web_search_server': ('Web search server', 'WEB_SEARCH_AVAILABLE', ('aiohttp', 'requests', 'bs4'), {
+        'get_web_search_server': 'get_web_search_server',
+        'web_search': 'web_search',
+        'news_search': 'news_search',
+        'get_page_content': 'get_page_content',
+        'get_page_summary': 'get_page_summary'
+    }),
+    'email_server': ('Email server', 'EMAIL_AVAILABLE', (), {
+        'get_email_server': 'get_email_server',
+        'send_email': 'send_email',
+        'send_html_email': 'send_html_email',
+        'send_email_with_attachment': 'send_email_with_attachment',
+        'create_draft': 'create_draft',
+        'get_draft_body': 'get_draft_body'
+    })
+}
+
+# Public name -> (submodule, attribute)
+_LAZY_ATTRS = {
+    name: (module_name, attr)
+    for module_name, (_, _, _, exports) in _SUBMODULES.items()
+    for name, attr in exports.items()
+}
+
+# Availability flag -> submodule it reports on
+_AVAILABILITY_FLAGS = {flag: module_name for module_name, (_, flag, _, _) in _SUBMODULES.items()}
+
+# Submodule -> imported module, or None when its dependencies are missing
+_loaded_submodules = {}
+
+def _load_submodule(name):
+    """Import a server submodule once, returning None if it cannot be imported"""
+    if name not in _loaded_submodules:
+        label, _, requirements, _ = _SUBMODULES[name]
+        # Probing the finders is much cheaper than a failed import
+        missing = [req for req in requirements if importlib.util.find_spec(req) is None]
+        if missing:
+            logger.warning(f"⚠️ {label} not available: missing {', '.join(missing)}")
+            _loaded_submodules[name] = None
+        else:
+            try:
+                _loaded_submodules[name] = importlib.import_module(f'.{name}', __name__)
+            except ImportError as e:
+                logger.warning(f"⚠️ {label} not available: {e}")
+                _loaded_submodules[name] = None
+    return _loaded_submodules[name]
+
+def __getattr__(name):
+    """Resolve server tools and availability flags on first access"""
+    if name in _LAZY_ATTRS:
+        module_name, attr = _LAZY_ATTRS[name]
+        module = _load_submodule(module_name)
+        value = getattr(module, attr) if module else None
+    elif name in _AVAILABILITY_FLAGS:
+        value = _load_submodule(_AVAILABILITY_FLAGS[name]) is not None
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
     
-    # Email tools
-    'send_email',
-    'send_html_email',
-    'send_email_with_attachment',
-    'create_draft'
-]
\ No newline at end of file
+    # Cache on the module so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted({*globals(), *_LAZY_ATTRS, *_AVAILABILITY_FLAGS})
+
+__all__ = [*_CORE_EXPORTS, *_AVAILABILITY_FLAGS, *_LAZY_ATTRS]
@@ -4,14 +4,20 @@ Handles email sending capabilities for MCP
 """
 
 import os
+import mmap
+import time
+import atexit
 import asyncio
+import hashlib
 import logging
 import smtplib
-from typing import Dict, List, Any, Optional
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import functools
+import collections
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Deque, Dict, List, Any, Optional, Tuple
+from email import policy
+from email.message import EmailMessage
 
 try:
     import aiosmtplib
@@ -29,9 +35,56 @@ except ImportError:
     EMAIL_VALIDATOR_AVAILABLE = False
 
 from mcp_auth import get_auth_manager
+from mcp_loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
+# Pooled SMTP connections are recycled after this many messages
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100
+SMTP_KEEPALIVE_SECONDS = 30
+# Draft bodies kept in memory per server, oldest dropped first
+MAX_STORED_DRAFTS = 256
+
+# Attachment encoding is blocking file/CPU work; run it on a shared bounded
+# pool rather than the event loop
+_ATTACHMENT_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="email-attach")
+atexit.register(_ATTACHMENT_EXECUTOR.shutdown, wait=False)
+
+@functools.lru_cache(maxsize=4096)
+def _validated(addr: str) -> str:
+    """Syntax-check an address once; raises EmailNotValidError"""
+    validate_email(addr, check_deliverability=False)
+    return addr
+
+def _split_addrs(addrs: Optional[str]) -> Tuple[str, ...]:
+    """Split a comma-separated address list into stripped, non-empty addresses"""
+    if not addrs:
+        return ()
+    return tuple(addr for addr in (a.strip() for a in addrs.split(",")) if addr)
+
+def _attach_file(message: EmailMessage, fp, filename: str):
+    """Attach an open file, base64-encoding it straight from a read-only mmap of it"""
+    if os.fstat(fp.fileno()).st_size == 0:
+        message.add_attachment(b"", maintype="application", subtype="octet-stream", filename=filename)
+        return
+    with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        try:
+            message.add_attachment(view, maintype="application", subtype="octet-stream", filename=filename)
+        finally:
+            view.release()
+
+class _ConnectionPool:
+    """Pooled SMTP connections of one event loop"""
+    
+    def __init__(self):
+        # Idle (connection, messages sent) pairs ready for reuse
+        self.idle: Deque[Tuple[Any, int]] = collections.deque()
+        self.open_connections = 0
+        # Notified whenever a connection goes idle or a pool slot frees up
+        self.changed = asyncio.Condition()
+        self.keepalive_task: Optional[asyncio.Task] = None
+
 class EmailMCPServer:
     """MCP Server for email operations"""
     
@@ -42,6 +95,14 @@ class EmailMCPServer:
         self.smtp_password: Optional[str] = None
         self.email_from: Optional[str] = None
         self.authenticated = False
+        # Connection arguments, fixed once initialize() has read the config
+        self._smtp_kwargs: Dict[str, Any] = {}
+        self._creds: Tuple[str, str] = ("", "")
+        # sha256 hex digest -> draft body
+        self._drafts: Dict[str, str] = {}
+        self._pool_size = max(1, int(os.getenv("SMTP_POOL_SIZE", "5")))
+        # SMTP connections belong to the event loop that opened them
+        self._pools: LoopLocal[_ConnectionPool] = LoopLocal(_ConnectionPool)
         
     async def initialize(self) -> bool:
         """Initialize email server with configuration"""
@@ -64,26 +125,129 @@ class EmailMCPServer:
                 logger.error("❌ aiosmtplib not available - email functionality disabled")
                 return False
             
-            # Test connection
-            try:
-                smtp = aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port)
-                await smtp.connect()
-                await smtp.starttls()
-                await smtp.login(self.smtp_username, self.smtp_password)
-                await smtp.quit()
-                
-                self.authenticated = True
-                logger.info(f"✅ Email server authenticated: {self.smtp_username}")
-                return True
-                
-            except Exception as e:
-                logger.error(f"❌ Email authentication failed: {e}")
-                return False
+            self._smtp_kwargs = {"hostname": self.smtp_host, "port": self.smtp_port}
+            self._creds = (self.smtp_username, self.smtp_password)
+            
+            # Authentication happens on the first pooled connection; auth
+            # errors surface from the first send (or an explicit verify())
+            self.authenticated = True
+            logger.info(f"✅ Email server configured: {self.smtp_username}")
+            return True
             
         except Exception as e:
             logger.error(f"❌ Error initializing email server: {e}")
             return False
     
+    async def verify(self) -> bool:
+        """Check that the SMTP server accepts the configured credentials"""
+        try:
+            async with self._get_conn() as smtp:
+                await smtp.noop()
+            logger.info(f"✅ Email server authenticated: {self.smtp_username}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Email authentication failed: {e}")
+            return False
+    
+    async def _connect(self):
+        """Open a new connected, STARTTLS'd and logged-in SMTP connection"""
+        smtp = aiosmtplib.SMTP(**self._smtp_kwargs)
+        await smtp.connect()
+        await smtp.starttls()
+        await smtp.login(*self._creds)
+        return smtp
+    
+    async def _acquire(self, pool: "_ConnectionPool") -> Tuple[Any, int]:
+        """Take an idle pooled connection, opening a new one while under the pool size"""
+        async with pool.changed:
+            while not pool.idle:
+                if pool.open_connections < self._pool_size:
+                    pool.open_connections += 1
+                    break
+                # Woken when a connection is released or a discard frees a slot
+                await pool.changed.wait()
+            else:
+                return pool.idle.popleft()
+        
+        try:
+            smtp = await self._connect()
+        except BaseException:
+            await self._free_slot(pool)
+            raise
+        if pool.keepalive_task is None or pool.keepalive_task.done():
+            pool.keepalive_task = asyncio.create_task(self._keepalive(pool))
+        return smtp, 0
+    
+    async def _put_idle(self, pool: "_ConnectionPool", smtp, messages_sent: int):
+        """Make a connection available to the next borrower"""
+        async with pool.changed:
+            pool.idle.append((smtp, messages_sent))
+            pool.changed.notify()
+    
+    async def _free_slot(self, pool: "_ConnectionPool"):
+        """Give up a pool slot so a waiting borrower can open a new connection"""
+        async with pool.changed:
+            pool.open_connections -= 1
+            pool.changed.notify()
+    
+    async def _release(self, pool: "_ConnectionPool", smtp, messages_sent: int):
+        """Return a connection to the pool, or retire it once it has sent enough messages"""
+        if messages_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            await self._discard(pool, smtp, graceful=True)
+        else:
+            await self._put_idle(pool, smtp, messages_sent)
+    
+    async def _discard(self, pool: "_ConnectionPool", smtp, graceful: bool = False):
+        """Close a connection and free its pool slot"""
+        await self._free_slot(pool)
+        try:
+            if graceful:
+                await smtp.quit()
+            else:
+                smtp.close()
+        except Exception:
+            smtp.close()
+    
+    @contextlib.asynccontextmanager
+    async def _get_conn(self) -> AsyncIterator[Any]:
+        """Borrow a pooled SMTP connection for one send"""
+        pool = self._pools.get()
+        smtp, messages_sent = await self._acquire(pool)
+        try:
+            yield smtp
+        except BaseException:
+            # The connection may be mid-command or broken - never hand it out again
+            await self._discard(pool, smtp)
+            raise
+        else:
+            await self._release(pool, smtp, messages_sent + 1)
+    
+    async def _send_message(self, message: EmailMessage, recipients: List[str]):
+        """Send over a pooled connection, reconnecting once if the server dropped it"""
+        try:
+            async with self._get_conn() as smtp:
+                return await smtp.send_message(message, recipients=recipients)
+        except aiosmtplib.SMTPServerDisconnected as e:
+            logger.warning(f"⚠️ SMTP connection dropped, reconnecting: {e}")
+            async with self._get_conn() as smtp:
+                return await smtp.send_message(message, recipients=recipients)
+    
+    async def _keepalive(self, pool: "_ConnectionPool"):
+        """Periodically NOOP idle connections so the server doesn't time them out"""
+        while pool.open_connections > 0:
+            await asyncio.sleep(SMTP_KEEPALIVE_SECONDS)
+            async with pool.changed:
+                idle = list(pool.idle)
+                pool.idle.clear()
+            for smtp, messages_sent in idle:
+                try:
+                    await smtp.noop()
+                except Exception as e:
+                    logger.warning(f"⚠️ Dropping idle SMTP connection: {e}")
+                    await self._discard(pool, smtp)
+                else:
+                    await self._put_idle(pool, smtp, messages_sent)
+    
     async def send_email(self,
                         to: str,
                         subject: str,
@@ -93,52 +257,81 @@ class EmailMCPServer:
                         is_html: bool = False) -> Dict[str, Any]:
         """Send an email"""
         
+        results = await self.send_many([{
+            "to": to,
+            "subject": subject,
+            "body": body,
+            "cc": cc,
+            "bcc": bcc,
+            "is_html": is_html
+        }])
+        return results[0]
+    
+    async def send_many(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Send several emails (send_email keyword dicts), one result per message"""
+        
         if not self.authenticated:
-            return {"error": "Email server not authenticated"}
+            return [{"error": "Email server not authenticated"} for _ in messages]
         
         if not AIOSMTPLIB_AVAILABLE:
-            return {"error": "Email functionality not available - aiosmtplib required"}
+            return [{"error": "Email functionality not available - aiosmtplib required"} for _ in messages]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(messages)
+        pending = iter(range(len(messages)))
+        
+        async def worker():
+            # Workers share one iterator, so each keeps reusing a pooled
+            # connection for its run of messages
+            for i in pending:
+                try:
+                    results[i] = await self._send_one(**messages[i])
+                except TypeError as e:
+                    # Missing or unknown keys fail this message, not the batch
+                    results[i] = {"error": f"Invalid message: {e}"}
+        
+        await asyncio.gather(*(worker() for _ in range(min(self._pool_size, len(messages)))))
+        return results
+    
+    async def _send_one(self,
+                        to: str,
+                        subject: str,
+                        body: str,
+                        cc: Optional[str] = None,
+                        bcc: Optional[str] = None,
+                        is_html: bool = False) -> Dict[str, Any]:
+        """Build and send a single email over the pool"""
         
         try:
+            cc_list = _split_addrs(cc)
+            bcc_list = _split_addrs(bcc)
+            
             # Validate email addresses
             if EMAIL_VALIDATOR_AVAILABLE:
                 try:
-                    validate_email(to)
+                    for addr in (to, *cc_list, *bcc_list):
+                        _validated(addr)
                 except EmailNotValidError as e:
                     return {"error": f"Invalid recipient email: {e}"}
             
             # Create message
-            message = MIMEMultipart()
+            message = EmailMessage(policy=policy.SMTP)
             message["From"] = self.email_from
             message["To"] = to
             message["Subject"] = subject
             
-            if cc:
-                message["Cc"] = cc
-            if bcc:
-                message["Bcc"] = bcc
+            if cc_list:
+                message["Cc"] = ", ".join(cc_list)
+            if bcc_list:
+                message["Bcc"] = ", ".join(bcc_list)
             
             # Add body
-            if is_html:
-                message.attach(MIMEText(body, "html"))
-            else:
-                message.attach(MIMEText(body, "plain"))
+            message.set_content(body, subtype="html" if is_html else "plain")
             
             # Prepare recipient list
-            recipients = [to]
-            if cc:
-                recipients.extend([email.strip() for email in cc.split(",")])
-            if bcc:
-                recipients.extend([email.strip() for email in bcc.split(",")])
-            
-            # Send email
-            smtp = aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port)
-            await smtp.connect()
-            await smtp.starttls()
-            await smtp.login(self.smtp_username, self.smtp_password)
+            recipients = [to, *cc_list, *bcc_list]
             
-            await smtp.send_message(message, recipients=recipients)
-            await smtp.quit()
+            # Send email over a pooled connection
+            await self._send_message(message, recipients)
             
             result = {
                 "success": True,
@@ -149,7 +342,7 @@ class EmailMCPServer:
                     "subject": subject,
                     "body_length": len(body),
                     "is_html": is_html,
-                    "sent_at": asyncio.get_event_loop().time()
+                    "sent_at": time.monotonic()
                 }
             }
             
@@ -194,53 +387,41 @@ class EmailMCPServer:
             return {"error": "Email functionality not available - aiosmtplib required"}
         
         try:
+            cc_list = _split_addrs(cc)
+            bcc_list = _split_addrs(bcc)
+            
             # Create message
-            message = MIMEMultipart()
+            message = EmailMessage(policy=policy.SMTP)
             message["From"] = self.email_from
             message["To"] = to
             message["Subject"] = subject
             
-            if cc:
-                message["Cc"] = cc
-            if bcc:
-                message["Bcc"] = bcc
+            if cc_list:
+                message["Cc"] = ", ".join(cc_list)
+            if bcc_list:
+                message["Bcc"] = ", ".join(bcc_list)
             
             # Add body
-            message.attach(MIMEText(body, "plain"))
+            message.set_content(body)
             
             # Add attachment
-            if os.path.exists(attachment_path):
-                with open(attachment_path, "rb") as attachment:
-                    part = MIMEBase('application', 'octet-stream')
-                    part.set_payload(attachment.read())
-                
-                encoders.encode_base64(part)
-                
-                filename = attachment_name or os.path.basename(attachment_path)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename= {filename}'
-                )
-                
-                message.attach(part)
-            else:
+            try:
+                attachment = open(attachment_path, "rb")
+            except FileNotFoundError:
                 return {"error": f"Attachment file not found: {attachment_path}"}
             
-            # Prepare recipient list
-            recipients = [to]
-            if cc:
-                recipients.extend([email.strip() for email in cc.split(",")])
-            if bcc:
-                recipients.extend([email.strip() for email in bcc.split(",")])
+            # Encode from the mapped file so the raw bytes are never copied
+            filename = attachment_name or os.path.basename(attachment_path)
+            with attachment:
+                await asyncio.get_running_loop().run_in_executor(
+                    _ATTACHMENT_EXECUTOR, _attach_file, message, attachment, filename
+                )
             
-            # Send email
-            smtp = aiosmtplib.SMTP(hostname=self.smtp_host, port=self.smtp_port)
-            await smtp.connect()
-            await smtp.starttls()
-            await smtp.login(self.smtp_username, self.smtp_password)
+            # Prepare recipient list
+            recipients = [to, *cc_list, *bcc_list]
             
-            await smtp.send_message(message, recipients=recipients)
-            await smtp.quit()
+            # Send email over a pooled connection
+            await self._send_message(message, recipients)
             
             result = {
                 "success": True,
@@ -251,7 +432,7 @@ class EmailMCPServer:
                     "subject": subject,
                     "body_length": len(body),
                     "attachment": filename,
-                    "sent_at": asyncio.get_event_loop().time()
+                    "sent_at": time.monotonic()
                 }
             }
             
@@ -271,16 +452,22 @@ class EmailMCPServer:
         """Create an email draft (for services that support it)"""
         
         try:
-            # For now, just return the draft content
+            # For now, keep the body in memory and return a reference to it
             # In a full implementation, this would save to email service
+            body_sha256 = hashlib.sha256(body.encode("utf-8")).hexdigest()
+            self._drafts.pop(body_sha256, None)
+            if len(self._drafts) >= MAX_STORED_DRAFTS:
+                del self._drafts[next(iter(self._drafts))]
+            self._drafts[body_sha256] = body
             
             draft = {
                 "to": to,
                 "cc": cc,
                 "bcc": bcc,
                 "subject": subject,
-                "body": body,
-                "created_at": asyncio.get_event_loop().time(),
+                "body_sha256": body_sha256,
+                "body_length": len(body),
+                "created_at": time.monotonic(),
                 "status": "draft"
             }
             
@@ -296,16 +483,32 @@ class EmailMCPServer:
         except Exception as e:
             logger.error(f"❌ Error creating email draft: {e}")
             return {"error": str(e)}
+    
+    async def get_draft_body(self, body_sha256: str) -> Dict[str, Any]:
+        """Get the body of a draft created with create_draft"""
+        
+        body = self._drafts.get(body_sha256)
+        if body is None:
+            return {"error": f"Draft body not found: {body_sha256}"}
+        return {"success": True, "body_sha256": body_sha256, "body": body}
 
 # Global email server instance
 _email_server = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_email_init_lock = LoopLocal(asyncio.Lock)
 
 async def get_email_server() -> EmailMCPServer:
     """Get or create the global email server instance"""
     global _email_server
-    if _email_server is None:
-        _email_server = EmailMCPServer()
-        await _email_server.initialize()
+    if _email_server is not None:
+        return _email_server
+    
+    # Concurrent first callers wait here instead of each initializing a server
+    async with _email_init_lock.get():
+        if _email_server is None:
+            server = EmailMCPServer()
+            await server.initialize()
+            _email_server = server
     return _email_server
 
 # MCP Tool Functions - these are called by the MCP system
@@ -328,4 +531,9 @@ async def send_email_with_attachment(**kwargs) -> Dict[str, Any]:
 async def create_draft(**kwargs) -> Dict[str, Any]:
     """MCP tool function for creating email drafts"""
     server = await get_email_server()
-    return await server.create_draft(**kwargs)
\ No newline at end of file
+    return await server.create_draft(**kwargs)
+
+async def get_draft_body(**kwargs) -> Dict[str, Any]:
+    """MCP tool function for getting a draft's body"""
+    server = await get_email_server()
+    return await server.get_draft_body(**kwargs)
@@ -5,31 +5,67 @@ Provides GitHub integration tools for creating issues, managing repositories, et
 
 import os
 import json
+import base64
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import operator
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlencode
 try:
-    from github import Github, GithubException
+    import httpx
+    HTTPX_AVAILABLE = True
 except ImportError:
-    # Fallback for when github module is not available
-    Github = None
-    GithubException = Exception
+    httpx = None
+    HTTPX_AVAILABLE = False
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 from mcp_auth import get_auth_manager
+from mcp_loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses ValueError like json's, so callers catch either
+_jloads = orjson.loads if orjson is not None else json.loads
+
+GITHUB_API_URL = "https://api.github.com"
+ETAG_CACHE_MAX_ENTRIES = 256
+
+_issue_fields = operator.itemgetter(
+    "number", "title", "state", "html_url", "created_at", "user", "labels", "assignees"
+)
+
+class GitHubAPIError(Exception):
+    """Error response from the GitHub REST API"""
+    
+    def __init__(self, status: int, data: Dict[str, Any]):
+        super().__init__(f"{status} {data}")
+        self.status = status
+        self.data = data
+
 class GitHubMCPServer:
     """GitHub MCP Server for repository and issue management"""
     
     def __init__(self):
-        self.github_client: Optional[Github] = None
+        # httpx connections belong to the event loop that opened them, so
+        # each loop gets its own pooled client
+        self._http: LoopLocal["httpx.AsyncClient"] = LoopLocal(self._new_client)
+        self._headers: Dict[str, str] = {}
         self.authenticated = False
+        # GET url -> (ETag, decoded body, next page url) for conditional requests
+        self._etags: Dict[str, Tuple[str, Any, Optional[str]]] = {}
         
     async def initialize(self) -> bool:
         """Initialize GitHub client with authentication"""
         try:
-            if Github is None:
-                logger.error("❌ PyGithub library not available")
+            if not HTTPX_AVAILABLE:
+                logger.error("❌ httpx library not available")
                 return False
                 
             auth_manager = get_auth_manager()
@@ -39,20 +75,87 @@ class GitHubMCPServer:
                 logger.error("❌ No GitHub credentials found")
                 return False
             
-            # Initialize GitHub client
-            self.github_client = Github(credentials.api_key)
+            self._headers = {
+                "Authorization": f"Bearer {credentials.api_key}",
+                "Accept": "application/vnd.github+json"
+            }
             
             # Test authentication
-            user = self.github_client.get_user()
-            logger.info(f"✅ GitHub authenticated as: {user.login}")
+            user = await self._request("GET", "/user")
+            logger.info(f"✅ GitHub authenticated as: {user['login']}")
             
             self.authenticated = True
             return True
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize GitHub client: {e}")
+            await self.cleanup()
             return False
     
+    async def cleanup(self):
+        """Close this event loop's pooled HTTP connections"""
+        client = self._http.pop()
+        if client is not None:
+            await client.aclose()
+        self.authenticated = False
+    
+    def _new_client(self) -> "httpx.AsyncClient":
+        """Create a pooled client for the running event loop"""
+        return httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            headers=self._headers,
+            # Renamed and transferred repositories answer with a 301
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=30.0
+        )
+    
+    async def _send(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        """Send a REST request, raising GitHubAPIError for error responses"""
+        response = await self._http.get().request(method, url, **kwargs)
+        if response.status_code >= 400:
+            try:
+                data = _jloads(response.content)
+            except ValueError:
+                data = {"message": response.text}
+            raise GitHubAPIError(response.status_code, data)
+        return response
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        """Send a REST request and return the decoded JSON body"""
+        return _jloads((await self._send(method, url, **kwargs)).content)
+    
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, Optional[str]]:
+        """Conditional GET returning (body, next page url); 304s reuse the cached body"""
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        cached = self._etags.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = await self._send("GET", url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1], cached[2]
+        
+        data = _jloads(response.content)
+        next_url = response.links.get("next", {}).get("url")
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags.pop(key, None)
+            if len(self._etags) >= ETAG_CACHE_MAX_ENTRIES:
+                del self._etags[next(iter(self._etags))]
+            self._etags[key] = (etag, data, next_url)
+        return data, next_url
+    
+    async def _paginate(self, url: str, params: Dict[str, Any], limit: int, key: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Collect up to `limit` items, requesting pages no larger than needed"""
+        items: List[Dict[str, Any]] = []
+        params = {**params, "per_page": min(max(limit, 1), 100)}
+        while url and len(items) < limit:
+            page, url = await self._get(url, params)
+            items.extend(page[key] if key else page)
+            params = None  # the next link already carries the query
+        return items[:limit]
+    
     async def create_issue(self, 
                          repository: str,
                          title: str, 
@@ -65,33 +168,34 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            # Get repository
-            repo = self.github_client.get_repo(repository)
-            
             # Create issue
-            issue = repo.create_issue(
-                title=title,
-                body=body,
-                labels=labels or [],
-                assignees=assignees or []
+            issue = await self._request(
+                "POST",
+                f"/repos/{repository}/issues",
+                json={
+                    "title": title,
+                    "body": body,
+                    "labels": labels or [],
+                    "assignees": assignees or []
+                }
             )
             
             result = {
                 "success": True,
                 "issue": {
-                    "number": issue.number,
-                    "title": issue.title,
-                    "url": issue.html_url,
-                    "state": issue.state,
-                    "created_at": issue.created_at.isoformat(),
-                    "author": issue.user.login
+                    "number": issue["number"],
+                    "title": issue["title"],
+                    "url": issue["html_url"],
+                    "state": issue["state"],
+                    "created_at": issue["created_at"],
+                    "author": issue["user"]["login"]
                 }
             }
             
-            logger.info(f"✅ Created GitHub issue #{issue.number}: {title}")
+            logger.info(f"✅ Created GitHub issue #{issue['number']}: {title}")
             return result
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -105,28 +209,28 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            repo = self.github_client.get_repo(repository)
+            repo, _ = await self._get(f"/repos/{repository}")
             
             result = {
                 "success": True,
                 "repository": {
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description,
-                    "url": repo.html_url,
-                    "clone_url": repo.clone_url,
-                    "language": repo.language,
-                    "stars": repo.stargazers_count,
-                    "forks": repo.forks_count,
-                    "open_issues": repo.open_issues_count,
-                    "created_at": repo.created_at.isoformat(),
-                    "updated_at": repo.updated_at.isoformat()
+                    "name": repo["name"],
+                    "full_name": repo["full_name"],
+                    "description": repo["description"],
+                    "url": repo["html_url"],
+                    "clone_url": repo["clone_url"],
+                    "language": repo["language"],
+                    "stars": repo["stargazers_count"],
+                    "forks": repo["forks_count"],
+                    "open_issues": repo["open_issues_count"],
+                    "created_at": repo["created_at"],
+                    "updated_at": repo["updated_at"]
                 }
             }
             
             return result
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -143,23 +247,23 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            repo = self.github_client.get_repo(repository)
-            issues = repo.get_issues(state=state)
+            issues = await self._paginate(
+                f"/repos/{repository}/issues", {"state": state}, limit
+            )
             
+            # Labels and assignees come inline with each issue, no extra requests
             issue_list = []
-            for i, issue in enumerate(issues):
-                if i >= limit:
-                    break
-                    
+            for issue in issues:
+                number, title, issue_state, url, created_at, user, labels, assignees = _issue_fields(issue)
                 issue_list.append({
-                    "number": issue.number,
-                    "title": issue.title,
-                    "state": issue.state,
-                    "url": issue.html_url,
-                    "created_at": issue.created_at.isoformat(),
-                    "author": issue.user.login,
-                    "labels": [label.name for label in issue.labels],
-                    "assignees": [assignee.login for assignee in issue.assignees]
+                    "number": number,
+                    "title": title,
+                    "state": issue_state,
+                    "url": url,
+                    "created_at": created_at,
+                    "author": user["login"],
+                    "labels": [label["name"] for label in labels],
+                    "assignees": [assignee["login"] for assignee in assignees]
                 })
             
             result = {
@@ -170,7 +274,7 @@ class GitHubMCPServer:
             
             return result
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -187,24 +291,25 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            repo = self.github_client.get_repo(repository)
-            file_content = repo.get_contents(file_path, ref=branch)
+            file_content, _ = await self._get(
+                f"/repos/{repository}/contents/{file_path}", {"ref": branch}
+            )
             
             result = {
                 "success": True,
                 "file": {
-                    "path": file_content.path,
-                    "name": file_content.name,
-                    "size": file_content.size,
-                    "content": file_content.decoded_content.decode('utf-8'),
-                    "sha": file_content.sha,
-                    "url": file_content.html_url
+                    "path": file_content["path"],
+                    "name": file_content["name"],
+                    "size": file_content["size"],
+                    "content": base64.b64decode(file_content["content"]).decode('utf-8'),
+                    "sha": file_content["sha"],
+                    "url": file_content["html_url"]
                 }
             }
             
             return result
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -223,25 +328,26 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            repo = self.github_client.get_repo(repository)
-            
-            result = repo.create_file(
-                path=file_path,
-                message=commit_message,
-                content=content,
-                branch=branch
+            result = await self._request(
+                "PUT",
+                f"/repos/{repository}/contents/{file_path}",
+                json={
+                    "message": commit_message,
+                    "content": base64.b64encode(content.encode('utf-8')).decode('ascii'),
+                    "branch": branch
+                }
             )
             
             response = {
                 "success": True,
                 "file": {
                     "path": file_path,
-                    "sha": result['content'].sha,
-                    "url": result['content'].html_url,
+                    "sha": result['content']['sha'],
+                    "url": result['content']['html_url'],
                     "commit": {
-                        "sha": result['commit'].sha,
+                        "sha": result['commit']['sha'],
                         "message": commit_message,
-                        "url": result['commit'].html_url
+                        "url": result['commit']['html_url']
                     }
                 }
             }
@@ -249,7 +355,7 @@ class GitHubMCPServer:
             logger.info(f"✅ Created file {file_path} in {repository}")
             return response
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -265,22 +371,23 @@ class GitHubMCPServer:
             return {"error": "GitHub client not authenticated"}
         
         try:
-            repositories = self.github_client.search_repositories(query=query)
+            # Most recently updated first, so a cached top-N stays stable
+            # between polls and its ETag keeps matching
+            repositories = await self._paginate(
+                "/search/repositories", {"q": query, "sort": "updated"}, limit, key="items"
+            )
             
             repo_list = []
-            for i, repo in enumerate(repositories):
-                if i >= limit:
-                    break
-                    
+            for repo in repositories:
                 repo_list.append({
-                    "name": repo.name,
-                    "full_name": repo.full_name,
-                    "description": repo.description,
-                    "url": repo.html_url,
-                    "language": repo.language,
-                    "stars": repo.stargazers_count,
-                    "forks": repo.forks_count,
-                    "updated_at": repo.updated_at.isoformat()
+                    "name": repo["name"],
+                    "full_name": repo["full_name"],
+                    "description": repo["description"],
+                    "url": repo["html_url"],
+                    "language": repo["language"],
+                    "stars": repo["stargazers_count"],
+                    "forks": repo["forks_count"],
+                    "updated_at": repo["updated_at"]
                 })
             
             result = {
@@ -291,7 +398,7 @@ class GitHubMCPServer:
             
             return result
             
-        except GithubException as e:
+        except GitHubAPIError as e:
             logger.error(f"❌ GitHub API error: {e}")
             return {"error": f"GitHub API error: {e.data.get('message', str(e))}"}
         except Exception as e:
@@ -300,13 +407,21 @@ class GitHubMCPServer:
 
 # Global GitHub server instance
 _github_server = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_github_init_lock = LoopLocal(asyncio.Lock)
 
 async def get_github_server() -> GitHubMCPServer:
     """Get or create the global GitHub server instance"""
     global _github_server
-    if _github_server is None:
-        _github_server = GitHubMCPServer()
-        await _github_server.initialize()
+    if _github_server is not None:
+        return _github_server
+    
+    # Concurrent first callers wait here instead of each initializing a server
+    async with _github_init_lock.get():
+        if _github_server is None:
+            server = GitHubMCPServer()
+            await server.initialize()
+            _github_server = server
     return _github_server
 
 # MCP Tool Functions - these are called by the MCP system
@@ -5,16 +5,94 @@ Provides Google Drive integration for document creation and management
 
 import os
 import json
+import time
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+import operator
+import functools
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
+import httplib2
+import google_auth_httplib2
 from googleapiclient.discovery import build
+from googleapiclient.model import JsonModel
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the client's json decoding
+    orjson = None
 from google.oauth2.service_account import Credentials
 from google.oauth2.credentials import Credentials as OAuthCredentials
 from mcp_auth import get_auth_manager
+from mcp_loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
+GOOGLE_API_SCOPES = [
+    'https://www.googleapis.com/auth/drive',
+    'https://www.googleapis.com/auth/documents',
+    'https://www.googleapis.com/auth/spreadsheets'
+]
+FILE_METADATA_FIELDS = 'id, name, webViewLink, createdTime, modifiedTime'
+DOCUMENT_MIME_TYPE = 'application/vnd.google-apps.document'
+SPREADSHEET_MIME_TYPE = 'application/vnd.google-apps.spreadsheet'
+DOCUMENT_END_INDEX_FIELDS = 'body(content(endIndex))'
+HTTP_TIMEOUT_SECONDS = 30
+# Repeated reads of the same document within this window are served from memory
+READ_CACHE_TTL_SECONDS = 60
+READ_CACHE_MAX_ENTRIES = 1024
+# Largest page Drive serves for files().list
+MAX_LIST_PAGE_SIZE = 1000
+LIST_FILE_FIELDS = "nextPageToken, files(id, name, mimeType, webViewLink, createdTime, modifiedTime, size)"
+# Bursts of identical listings within this window share one Drive call
+LIST_CACHE_TTL_SECONDS = 15
+# In-flight Google API calls per server (Drive allows ~10 writes/s per user)
+MAX_CONCURRENT_REQUESTS = 8
+
+class _OrjsonModel(JsonModel):
+    """googleapiclient JSON model that decodes response bodies with orjson"""
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Non-JSON bodies are handed back as text, as JsonModel does
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+@functools.lru_cache(maxsize=4)
+def _load_google_services(key_path: str, mtime_ns: int) -> Tuple[Any, Any, Any, Any, Any]:
+    """Service account credentials, shared transport and Drive/Docs/Sheets services for a key file"""
+    google_creds = Credentials.from_service_account_file(key_path, scopes=GOOGLE_API_SCOPES)
+    
+    # Build Google API services on one keep-alive transport so their
+    # requests reuse connections instead of handshaking each time
+    http = google_auth_httplib2.AuthorizedHttp(
+        google_creds, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+    )
+    model = _OrjsonModel() if orjson is not None else None
+    return (
+        google_creds,
+        http,
+        build('drive', 'v3', http=http, model=model),
+        build('docs', 'v1', http=http, model=model),
+        build('sheets', 'v4', http=http, model=model)
+    )
+
+_file_fields = operator.itemgetter("id", "name", "mimeType", "createdTime", "modifiedTime")
+
+@functools.lru_cache(maxsize=256)
+def _files_query(query: str) -> str:
+    """Drive search expression for non-trashed files whose name contains query"""
+    search_query = "trashed=false"
+    if query:
+        escaped = query.replace("\\", "\\\\").replace("'", "\\'")
+        search_query += f" and name contains '{escaped}'"
+    return search_query
+
 class GoogleDriveMCPServer:
     """Google Drive MCP Server for document management"""
     
@@ -22,6 +100,18 @@ class GoogleDriveMCPServer:
         self.drive_service = None
         self.docs_service = None
         self.sheets_service = None
+        # Authorized transport shared by all three services
+        self._http = None
+        self._credentials = None
+        # Blocking API calls run on this pool, whose size bounds in-flight
+        # requests; each worker thread gets its own transport because
+        # httplib2 connections are not thread-safe
+        self._exec = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="gdrive")
+        self._local = threading.local()
+        # document id -> (read at, read_document result)
+        self._document_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # (query, limit) -> (listed at, list_files result)
+        self._list_cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
         self.authenticated = False
         
     async def initialize(self) -> bool:
@@ -34,41 +124,60 @@ class GoogleDriveMCPServer:
                 logger.error("❌ No Google Drive credentials found")
                 return False
             
-            # Initialize Google API credentials
-            google_creds = None
-            
-            if credentials.api_key.endswith('.json'):
-                # Service account credentials
-                google_creds = Credentials.from_service_account_file(
-                    credentials.api_key,
-                    scopes=[
-                        'https://www.googleapis.com/auth/drive',
-                        'https://www.googleapis.com/auth/documents',
-                        'https://www.googleapis.com/auth/spreadsheets'
-                    ]
-                )
-            else:
+            if not credentials.api_key.endswith('.json'):
                 # OAuth credentials (would need implementation)
                 logger.error("❌ OAuth credentials not yet implemented")
                 return False
             
-            # Build Google API services
-            self.drive_service = build('drive', 'v3', credentials=google_creds)
-            self.docs_service = build('docs', 'v1', credentials=google_creds)
-            self.sheets_service = build('sheets', 'v4', credentials=google_creds)
+            # Service account credentials; parsing the key and building the
+            # services is reused until the key file changes
+            key_path = credentials.api_key
+            (self._credentials, self._http, self.drive_service,
+             self.docs_service, self.sheets_service) = await self._offload(
+                _load_google_services, key_path, os.stat(key_path).st_mtime_ns
+            )
             
             # Test authentication
-            about = self.drive_service.about().get(fields="user").execute()
+            about = await self._run(self.drive_service.about().get(fields="user"))
             user_email = about.get('user', {}).get('emailAddress', 'Unknown')
-            logger.info(f"✅ Google Drive authenticated as: {user_email}")
+            logger.info("✅ Google Drive authenticated as: %s", user_email)
             
             self.authenticated = True
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to initialize Google Drive client: {e}")
+            logger.error("❌ Failed to initialize Google Drive client: %s", e)
             return False
     
+    def _thread_http(self):
+        """This worker thread's authorized keep-alive transport"""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = google_auth_httplib2.AuthorizedHttp(
+                self._credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
+            )
+        return http
+    
+    async def _offload(self, fn, *args):
+        """Run a blocking call on the worker pool; calls beyond its size queue there"""
+        return await asyncio.get_running_loop().run_in_executor(self._exec, fn, *args)
+    
+    async def _run(self, request) -> Any:
+        """Execute a Google API request off the event loop"""
+        return await self._offload(self._execute, request)
+    
+    def _execute(self, request) -> Any:
+        """Execute a request on the calling worker thread's transport"""
+        return request.execute(http=self._thread_http())
+    
+    @staticmethod
+    def _new_file_body(title: str, mime_type: str, folder_id: Optional[str]) -> Dict[str, Any]:
+        """Drive file resource for a new Google Workspace file"""
+        body = {'name': title, 'mimeType': mime_type}
+        if folder_id:
+            body['parents'] = [folder_id]
+        return body
+    
     async def create_document(self,
                             title: str,
                             content: str = "",
@@ -79,13 +188,14 @@ class GoogleDriveMCPServer:
             return {"error": "Google Drive client not authenticated"}
         
         try:
-            # Create document
-            document = {
-                'title': title
-            }
-            
-            doc = self.docs_service.documents().create(body=document).execute()
-            document_id = doc.get('documentId')
+            # Create the document directly in its folder; Drive returns the
+            # file metadata in the same response
+            file_metadata = await self._run(self.drive_service.files().create(
+                body=self._new_file_body(title, DOCUMENT_MIME_TYPE, folder_id),
+                fields=FILE_METADATA_FIELDS
+            ))
+            document_id = file_metadata['id']
+            self._list_cache.clear()
             
             # Add content if provided
             if content:
@@ -100,24 +210,10 @@ class GoogleDriveMCPServer:
                     }
                 ]
                 
-                self.docs_service.documents().batchUpdate(
+                await self._run(self.docs_service.documents().batchUpdate(
                     documentId=document_id,
                     body={'requests': requests}
-                ).execute()
-            
-            # Move to folder if specified
-            if folder_id:
-                self.drive_service.files().update(
-                    fileId=document_id,
-                    addParents=folder_id,
-                    fields='id, parents'
-                ).execute()
-            
-            # Get document details
-            file_metadata = self.drive_service.files().get(
-                fileId=document_id,
-                fields='id, name, webViewLink, createdTime, modifiedTime'
-            ).execute()
+                ))
             
             result = {
                 "success": True,
@@ -130,11 +226,11 @@ class GoogleDriveMCPServer:
                 }
             }
             
-            logger.info(f"✅ Created Google Doc: {title}")
+            logger.info("✅ Created Google Doc: %s", title)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error creating Google Doc: {e}")
+            logger.error("❌ Error creating Google Doc: %s", e)
             return {"error": str(e)}
     
     async def create_spreadsheet(self,
@@ -146,33 +242,14 @@ class GoogleDriveMCPServer:
             return {"error": "Google Drive client not authenticated"}
         
         try:
-            # Create spreadsheet
-            spreadsheet = {
-                'properties': {
-                    'title': title
-                }
-            }
-            
-            sheet = self.sheets_service.spreadsheets().create(
-                body=spreadsheet,
-                fields='spreadsheetId'
-            ).execute()
-            
-            spreadsheet_id = sheet.get('spreadsheetId')
-            
-            # Move to folder if specified
-            if folder_id:
-                self.drive_service.files().update(
-                    fileId=spreadsheet_id,
-                    addParents=folder_id,
-                    fields='id, parents'
-                ).execute()
-            
-            # Get file details
-            file_metadata = self.drive_service.files().get(
-                fileId=spreadsheet_id,
-                fields='id, name, webViewLink, createdTime, modifiedTime'
-            ).execute()
+            # Create the spreadsheet directly in its folder; Drive returns the
+            # file metadata in the same response
+            file_metadata = await self._run(self.drive_service.files().create(
+                body=self._new_file_body(title, SPREADSHEET_MIME_TYPE, folder_id),
+                fields=FILE_METADATA_FIELDS
+            ))
+            spreadsheet_id = file_metadata['id']
+            self._list_cache.clear()
             
             result = {
                 "success": True,
@@ -185,11 +262,11 @@ class GoogleDriveMCPServer:
                 }
             }
             
-            logger.info(f"✅ Created Google Sheet: {title}")
+            logger.info("✅ Created Google Sheet: %s", title)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error creating Google Sheet: {e}")
+            logger.error("❌ Error creating Google Sheet: %s", e)
             return {"error": str(e)}
     
     async def read_document(self, document_id: str) -> Dict[str, Any]:
@@ -198,26 +275,30 @@ class GoogleDriveMCPServer:
         if not self.authenticated:
             return {"error": "Google Drive client not authenticated"}
         
+        cached = self._document_cache.get(document_id)
+        if cached is not None and time.monotonic() - cached[0] < READ_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            # Get document
-            document = self.docs_service.documents().get(documentId=document_id).execute()
+            # Get document content and file metadata concurrently
+            document, file_metadata = await asyncio.gather(
+                self._run(self.docs_service.documents().get(documentId=document_id)),
+                self._run(self.drive_service.files().get(
+                    fileId=document_id,
+                    fields=FILE_METADATA_FIELDS
+                ))
+            )
             
             # Extract text content
-            content = ""
-            body = document.get('body', {})
-            if 'content' in body:
-                for element in body['content']:
-                    if 'paragraph' in element:
-                        paragraph = element['paragraph']
-                        for text_element in paragraph.get('elements', []):
-                            if 'textRun' in text_element:
-                                content += text_element['textRun']['content']
-            
-            # Get file metadata
-            file_metadata = self.drive_service.files().get(
-                fileId=document_id,
-                fields='id, name, webViewLink, createdTime, modifiedTime'
-            ).execute()
+            parts = []
+            append = parts.append
+            for element in document.get('body', {}).get('content', ()):
+                paragraph = element.get('paragraph')
+                if paragraph is not None:
+                    for text_element in paragraph.get('elements', ()):
+                        if 'textRun' in text_element:
+                            append(text_element['textRun']['content'])
+            content = "".join(parts)
             
             result = {
                 "success": True,
@@ -231,10 +312,14 @@ class GoogleDriveMCPServer:
                 }
             }
             
+            self._document_cache.pop(document_id, None)
+            if len(self._document_cache) >= READ_CACHE_MAX_ENTRIES:
+                del self._document_cache[next(iter(self._document_cache))]
+            self._document_cache[document_id] = (time.monotonic(), result)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error reading Google Doc: {e}")
+            logger.error("❌ Error reading Google Doc: %s", e)
             return {"error": str(e)}
     
     async def update_document(self,
@@ -261,8 +346,12 @@ class GoogleDriveMCPServer:
                 })
             else:
                 # Replace all content
-                # First, get document to find end index
-                document = self.docs_service.documents().get(documentId=document_id).execute()
+                # First, get document to find end index; only the structural
+                # end indexes are needed, not the document body
+                document = await self._run(self.docs_service.documents().get(
+                    documentId=document_id,
+                    fields=DOCUMENT_END_INDEX_FIELDS
+                ))
                 end_index = document.get('body', {}).get('content', [{}])[-1].get('endIndex', 1)
                 
                 # Delete existing content
@@ -287,19 +376,20 @@ class GoogleDriveMCPServer:
                 })
             
             # Execute updates
-            self.docs_service.documents().batchUpdate(
+            await self._run(self.docs_service.documents().batchUpdate(
                 documentId=document_id,
                 body={'requests': requests}
-            ).execute()
+            ))
             
             # Get updated document
+            self._document_cache.pop(document_id, None)
             updated_doc = await self.read_document(document_id)
             
-            logger.info(f"✅ Updated Google Doc: {document_id}")
+            logger.info("✅ Updated Google Doc: %s", document_id)
             return updated_doc
             
         except Exception as e:
-            logger.error(f"❌ Error updating Google Doc: {e}")
+            logger.error("❌ Error updating Google Doc: %s", e)
             return {"error": str(e)}
     
     async def list_files(self,
@@ -310,31 +400,33 @@ class GoogleDriveMCPServer:
         if not self.authenticated:
             return {"error": "Google Drive client not authenticated"}
         
+        cache_key = (query, limit)
+        cached = self._list_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < LIST_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            # Build query
-            search_query = "trashed=false"
-            if query:
-                search_query += f" and name contains '{query}'"
-            
-            # Search files
-            results = self.drive_service.files().list(
-                q=search_query,
-                pageSize=limit,
-                fields="nextPageToken, files(id, name, mimeType, webViewLink, createdTime, modifiedTime, size)"
-            ).execute()
-            
-            items = results.get('files', [])
+            # Search files, stopping once enough have been collected
+            items = []
+            async with contextlib.aclosing(self.iter_files(query, page_size=min(limit, MAX_LIST_PAGE_SIZE))) as pages:
+                async for page in pages:
+                    items.extend(page[:limit - len(items)])
+                    if len(items) >= limit:
+                        break
             
             files = []
+            append = files.append
             for item in items:
-                files.append({
-                    "id": item['id'],
-                    "name": item['name'],
-                    "type": item['mimeType'],
-                    "url": item.get('webViewLink', ''),
-                    "created_time": item['createdTime'],
-                    "modified_time": item['modifiedTime'],
-                    "size": item.get('size', 0)
+                file_id, name, mime_type, created_time, modified_time = _file_fields(item)
+                get = item.get
+                append({
+                    "id": file_id,
+                    "name": name,
+                    "type": mime_type,
+                    "url": get('webViewLink', ''),
+                    "created_time": created_time,
+                    "modified_time": modified_time,
+                    "size": get('size', 0)
                 })
             
             result = {
@@ -343,12 +435,31 @@ class GoogleDriveMCPServer:
                 "count": len(files)
             }
             
+            self._list_cache.pop(cache_key, None)
+            if len(self._list_cache) >= READ_CACHE_MAX_ENTRIES:
+                del self._list_cache[next(iter(self._list_cache))]
+            self._list_cache[cache_key] = (time.monotonic(), result)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error listing Google Drive files: {e}")
+            logger.error("❌ Error listing Google Drive files: %s", e)
             return {"error": str(e)}
     
+    async def iter_files(self,
+                         query: str = "",
+                         page_size: int = MAX_LIST_PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield pages of raw Drive file resources matching query"""
+        files = self.drive_service.files()
+        request = files.list(
+            q=_files_query(query),
+            pageSize=page_size,
+            fields=LIST_FILE_FIELDS
+        )
+        while request is not None:
+            response = await self._run(request)
+            yield response.get('files', [])
+            request = files.list_next(request, response)
+    
     async def share_file(self,
                        file_id: str,
                        email: str,
@@ -365,33 +476,41 @@ class GoogleDriveMCPServer:
                 'emailAddress': email
             }
             
-            self.drive_service.permissions().create(
+            await self._run(self.drive_service.permissions().create(
                 fileId=file_id,
                 body=permission,
                 sendNotificationEmail=True
-            ).execute()
+            ))
             
             result = {
                 "success": True,
                 "message": f"File shared with {email} as {role}"
             }
             
-            logger.info(f"✅ Shared file {file_id} with {email}")
+            logger.info("✅ Shared file %s with %s", file_id, email)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error sharing Google Drive file: {e}")
+            logger.error("❌ Error sharing Google Drive file: %s", e)
             return {"error": str(e)}
 
 # Global Google Drive server instance
 _gdrive_server = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_gdrive_init_lock = LoopLocal(asyncio.Lock)
 
 async def get_gdrive_server() -> GoogleDriveMCPServer:
     """Get or create the global Google Drive server instance"""
     global _gdrive_server
-    if _gdrive_server is None:
-        _gdrive_server = GoogleDriveMCPServer()
-        await _gdrive_server.initialize()
+    if _gdrive_server is not None:
+        return _gdrive_server
+    
+    # Concurrent first callers wait here instead of each initializing a server
+    async with _gdrive_init_lock.get():
+        if _gdrive_server is None:
+            server = GoogleDriveMCPServer()
+            await server.initialize()
+            _gdrive_server = server
     return _gdrive_server
 
 # MCP Tool Functions - these are called by the MCP system
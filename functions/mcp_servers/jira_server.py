@@ -5,25 +5,92 @@ Provides JIRA integration tools for creating and managing tickets
 
 import os
 import json
+import time
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
-from atlassian import Jira
+import operator
+from typing import Dict, List, Any, Optional, Tuple
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to stdlib json
+    orjson = None
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 from mcp_auth import get_auth_manager
+from mcp_loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
+# orjson.JSONDecodeError subclasses ValueError like json's, so callers catch either
+_jloads = orjson.loads if orjson is not None else json.loads
+
+JIRA_API_PATH = "/rest/api/2"
+# In-flight JIRA requests per event loop, to stay clear of Atlassian rate limits
+MAX_CONCURRENT_REQUESTS = 8
+# Repeated reads of the same issue within this window are served from memory
+READ_CACHE_TTL_SECONDS = 60
+READ_CACHE_MAX_ENTRIES = 1024
+# Workflow transitions rarely change; reuse name -> id lookups for this long
+TRANSITION_CACHE_TTL_SECONDS = 300
+# A project's issue types change even less often
+ISSUE_TYPE_CACHE_TTL_SECONDS = 3600
+# Only request the issue fields each tool returns, instead of every field
+ISSUE_FIELDS = "summary,description,status,priority,assignee,reporter,created,updated,project,issuetype,labels"
+CREATED_ISSUE_FIELDS = "status,priority,assignee,created"
+SEARCH_ISSUE_FIELDS = "summary,status,priority,assignee,created,project,issuetype"
+# JIRA caps search pages at 100 issues
+MAX_SEARCH_PAGE_SIZE = 100
+
+_search_fields = operator.itemgetter(
+    "summary", "status", "priority", "assignee", "created", "project", "issuetype"
+)
+
+class JiraAPIError(Exception):
+    """Error response from the JIRA REST API"""
+    
+    def __init__(self, status: int, data: Dict[str, Any]):
+        messages = list(data.get("errorMessages") or ())
+        messages.extend(f"{field}: {error}" for field, error in (data.get("errors") or {}).items())
+        super().__init__("\n".join(messages) or f"{status} {data}")
+        self.status = status
+        self.data = data
+
 class JiraMCPServer:
     """JIRA MCP Server for ticket and project management"""
     
     def __init__(self):
-        self.jira_client: Optional[Jira] = None
+        # httpx connections and asyncio primitives belong to the event loop
+        # that created them, so each loop gets its own client and semaphore
+        self._http: LoopLocal["httpx.AsyncClient"] = LoopLocal(self._new_client)
+        self._sem: LoopLocal[asyncio.Semaphore] = LoopLocal(lambda: asyncio.Semaphore(MAX_CONCURRENT_REQUESTS))
+        self._auth: Tuple[str, str] = ("", "")
         self.authenticated = False
         self.base_url = os.getenv("JIRA_URL", "")
+        # issue key -> (read at, get_issue result)
+        self._issue_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # (project key, lowercased issue type name) -> (fetched at, {lowercased
+        # transition name: (transition id, target status)}); issue types of one
+        # project can use different workflows, whose transition ids differ
+        self._transition_cache: Dict[Tuple[str, str], Tuple[float, Dict[str, Tuple[str, Optional[str]]]]] = {}
+        # project key -> (fetched at, {lowercased issue type name: issue type id} or None if unknown)
+        self._issue_type_cache: Dict[str, Tuple[float, Optional[Dict[str, str]]]] = {}
         
     async def initialize(self) -> bool:
         """Initialize JIRA client with authentication"""
         try:
+            if not HTTPX_AVAILABLE:
+                logger.error("❌ httpx library not available")
+                return False
+            
             auth_manager = get_auth_manager()
             credentials = auth_manager.get_credentials("jira")
             
@@ -31,24 +98,83 @@ class JiraMCPServer:
                 logger.error("❌ No JIRA credentials or URL found")
                 return False
             
-            # Initialize JIRA client
-            self.jira_client = Jira(
-                url=self.base_url,
-                username=credentials.username,
-                password=credentials.password
-            )
+            self._auth = (credentials.username, credentials.password)
             
             # Test authentication by getting current user
-            user_info = self.jira_client.get_current_user()
-            logger.info(f"✅ JIRA authenticated as: {user_info.get('displayName', 'Unknown')}")
+            user_info = await self._request("GET", "/myself")
+            logger.info("✅ JIRA authenticated as: %s", user_info.get('displayName', 'Unknown'))
             
             self.authenticated = True
             return True
             
         except Exception as e:
-            logger.error(f"❌ Failed to initialize JIRA client: {e}")
+            logger.error("❌ Failed to initialize JIRA client: %s", e)
+            await self.cleanup()
             return False
     
+    async def cleanup(self):
+        """Close this event loop's pooled HTTP connections"""
+        client = self._http.pop()
+        if client is not None:
+            await client.aclose()
+        self.authenticated = False
+    
+    def _new_client(self) -> "httpx.AsyncClient":
+        """Create a pooled client for the running event loop"""
+        return httpx.AsyncClient(
+            base_url=self.base_url.rstrip("/") + JIRA_API_PATH,
+            auth=self._auth,
+            headers={"Accept": "application/json"},
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            timeout=30.0
+        )
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Any:
+        """Send a REST request, bounding in-flight requests, and return the decoded JSON body"""
+        async with self._sem.get():
+            response = await self._http.get().request(method, url, **kwargs)
+        if response.status_code >= 400:
+            try:
+                data = _jloads(response.content)
+            except ValueError:
+                data = {"errorMessages": [response.text]}
+            raise JiraAPIError(response.status_code, data)
+        # Updates and transitions answer 204 No Content
+        return _jloads(response.content) if response.content else None
+    
+    async def _issue_type_ids(self, project: str) -> Optional[Dict[str, str]]:
+        """Issue types that can be created in project, by lowercased name; None if unavailable"""
+        cached = self._issue_type_cache.get(project)
+        if cached is not None and time.monotonic() - cached[0] < ISSUE_TYPE_CACHE_TTL_SECONDS:
+            return cached[1]
+        try:
+            data = await self._request(
+                "GET", f"/issue/createmeta/{project}/issuetypes", params={"maxResults": 200}
+            )
+        except JiraAPIError as e:
+            if e.status >= 500:
+                raise
+            # Older JIRA versions lack this endpoint; let the create call validate instead
+            self._issue_type_cache[project] = (time.monotonic(), None)
+            return None
+        # JIRA Cloud answers with issueTypes, Server / Data Center with values
+        issue_types = data.get("issueTypes") or data.get("values") or []
+        ids = {t["name"].lower(): t["id"] for t in issue_types}
+        self._issue_type_cache[project] = (time.monotonic(), ids)
+        return ids
+    
+    def _patch_cached_issue(self, issue_key: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply known changes to a recent get_issue result; None if there is none to patch"""
+        cached = self._issue_cache.get(issue_key)
+        if cached is None or time.monotonic() - cached[0] >= READ_CACHE_TTL_SECONDS:
+            return None
+        read_at, result = cached
+        result = {**result, "issue": {**result["issue"], **changes}}
+        # Keep the original read time so patched entries do not outlive the TTL
+        self._issue_cache[issue_key] = (read_at, result)
+        return result
+    
     async def create_issue(self,
                          project: str,
                          issue_type: str,
@@ -63,12 +189,24 @@ class JiraMCPServer:
             return {"error": "JIRA client not authenticated"}
         
         try:
+            # Resolve the issue type locally so unknown types fail without a create call
+            issuetype = {"name": issue_type}
+            issue_type_ids = await self._issue_type_ids(project)
+            if issue_type_ids is not None:
+                issue_type_id = issue_type_ids.get(issue_type.lower())
+                if issue_type_id is None:
+                    return {
+                        "error": f"Issue type '{issue_type}' not available in project {project}. "
+                                 f"Available issue types: {sorted(issue_type_ids)}"
+                    }
+                issuetype = {"id": issue_type_id}
+            
             # Prepare issue data
             issue_data = {
                 "project": {"key": project},
                 "summary": summary,
                 "description": description,
-                "issuetype": {"name": issue_type}
+                "issuetype": issuetype
             }
             
             # Add optional fields
@@ -82,11 +220,13 @@ class JiraMCPServer:
                 issue_data["labels"] = labels
             
             # Create issue
-            result = self.jira_client.create_issue(fields=issue_data)
+            result = await self._request("POST", "/issue", json={"fields": issue_data})
             
             # Get the created issue details
             issue_key = result["key"]
-            issue_details = self.jira_client.get_issue(issue_key)
+            issue_details = await self._request(
+                "GET", f"/issue/{issue_key}", params={"fields": CREATED_ISSUE_FIELDS}
+            )
             
             response = {
                 "success": True,
@@ -102,11 +242,11 @@ class JiraMCPServer:
                 }
             }
             
-            logger.info(f"✅ Created JIRA issue {issue_key}: {summary}")
+            logger.info("✅ Created JIRA issue %s: %s", issue_key, summary)
             return response
             
         except Exception as e:
-            logger.error(f"❌ Error creating JIRA issue: {e}")
+            logger.error("❌ Error creating JIRA issue: %s", e)
             return {"error": str(e)}
     
     async def get_issue(self, issue_key: str) -> Dict[str, Any]:
@@ -115,8 +255,12 @@ class JiraMCPServer:
         if not self.authenticated:
             return {"error": "JIRA client not authenticated"}
         
+        cached = self._issue_cache.get(issue_key)
+        if cached is not None and time.monotonic() - cached[0] < READ_CACHE_TTL_SECONDS:
+            return cached[1]
+        
         try:
-            issue = self.jira_client.get_issue(issue_key)
+            issue = await self._request("GET", f"/issue/{issue_key}", params={"fields": ISSUE_FIELDS})
             fields = issue["fields"]
             
             result = {
@@ -138,10 +282,14 @@ class JiraMCPServer:
                 }
             }
             
+            self._issue_cache.pop(issue_key, None)
+            if len(self._issue_cache) >= READ_CACHE_MAX_ENTRIES:
+                del self._issue_cache[next(iter(self._issue_cache))]
+            self._issue_cache[issue_key] = (time.monotonic(), result)
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error getting JIRA issue: {e}")
+            logger.error("❌ Error getting JIRA issue: %s", e)
             return {"error": str(e)}
     
     async def update_issue(self,
@@ -149,7 +297,8 @@ class JiraMCPServer:
                          summary: Optional[str] = None,
                          description: Optional[str] = None,
                          assignee: Optional[str] = None,
-                         priority: Optional[str] = None) -> Dict[str, Any]:
+                         priority: Optional[str] = None,
+                         refresh: bool = False) -> Dict[str, Any]:
         """Update JIRA issue"""
         
         if not self.authenticated:
@@ -170,16 +319,23 @@ class JiraMCPServer:
             if not update_data:
                 return {"error": "No fields to update"}
             
-            self.jira_client.update_issue(issue_key, fields=update_data)
+            await self._request("PUT", f"/issue/{issue_key}", json={"fields": update_data})
             
-            # Get updated issue
-            updated_issue = await self.get_issue(issue_key)
+            # Apply the change to a recent read; the assignee's display name is
+            # only known to JIRA, so that still needs a fresh fetch
+            changes = {k: v for k, v in (("summary", summary), ("description", description), ("priority", priority)) if v}
+            updated_issue = None
+            if not refresh and not assignee:
+                updated_issue = self._patch_cached_issue(issue_key, changes)
+            if updated_issue is None:
+                self._issue_cache.pop(issue_key, None)
+                updated_issue = await self.get_issue(issue_key)
             
-            logger.info(f"✅ Updated JIRA issue {issue_key}")
+            logger.info("✅ Updated JIRA issue %s", issue_key)
             return updated_issue
             
         except Exception as e:
-            logger.error(f"❌ Error updating JIRA issue: {e}")
+            logger.error("❌ Error updating JIRA issue: %s", e)
             return {"error": str(e)}
     
     async def search_issues(self,
@@ -191,21 +347,38 @@ class JiraMCPServer:
             return {"error": "JIRA client not authenticated"}
         
         try:
-            results = self.jira_client.jql(jql, limit=limit)
+            params = {"jql": jql, "fields": SEARCH_ISSUE_FIELDS, "maxResults": min(limit, MAX_SEARCH_PAGE_SIZE)}
+            results = await self._request("GET", "/search", params=params)
+            found = results["issues"]
+            
+            # Once the total is known, fetch the remaining pages concurrently
+            page_size = results.get("maxResults") or len(found)
+            wanted = min(limit, results["total"])
+            if found and page_size and len(found) < wanted:
+                pages = await asyncio.gather(*[
+                    self._request("GET", "/search", params={
+                        **params, "startAt": start, "maxResults": min(page_size, wanted - start)
+                    })
+                    for start in range(len(found), wanted, page_size)
+                ])
+                found = found + [issue for page in pages for issue in page["issues"]]
             
             issues = []
-            for issue in results["issues"]:
-                fields = issue["fields"]
-                issues.append({
-                    "key": issue["key"],
-                    "summary": fields["summary"],
-                    "status": fields["status"]["name"],
-                    "priority": fields["priority"]["name"] if fields["priority"] else None,
-                    "assignee": fields["assignee"]["displayName"] if fields["assignee"] else None,
-                    "created": fields["created"],
-                    "project": fields["project"]["name"],
-                    "issue_type": fields["issuetype"]["name"],
-                    "url": f"{self.base_url}/browse/{issue['key']}"
+            append = issues.append
+            browse_url = f"{self.base_url}/browse/"
+            for issue in found[:limit]:
+                key = issue["key"]
+                summary, status, priority, assignee, created, project, issue_type = _search_fields(issue["fields"])
+                append({
+                    "key": key,
+                    "summary": summary,
+                    "status": status["name"],
+                    "priority": priority["name"] if priority else None,
+                    "assignee": assignee["displayName"] if assignee else None,
+                    "created": created,
+                    "project": project["name"],
+                    "issue_type": issue_type["name"],
+                    "url": browse_url + key
                 })
             
             result = {
@@ -218,7 +391,7 @@ class JiraMCPServer:
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error searching JIRA issues: {e}")
+            logger.error("❌ Error searching JIRA issues: %s", e)
             return {"error": str(e)}
     
     async def add_comment(self,
@@ -230,7 +403,8 @@ class JiraMCPServer:
             return {"error": "JIRA client not authenticated"}
         
         try:
-            result = self.jira_client.add_comment(issue_key, comment)
+            result = await self._request("POST", f"/issue/{issue_key}/comment", json={"body": comment})
+            self._issue_cache.pop(issue_key, None)
             
             response = {
                 "success": True,
@@ -243,49 +417,97 @@ class JiraMCPServer:
                 }
             }
             
-            logger.info(f"✅ Added comment to JIRA issue {issue_key}")
+            logger.info("✅ Added comment to JIRA issue %s", issue_key)
             return response
             
         except Exception as e:
-            logger.error(f"❌ Error adding comment to JIRA issue: {e}")
+            logger.error("❌ Error adding comment to JIRA issue: %s", e)
             return {"error": str(e)}
     
     async def transition_issue(self,
                              issue_key: str,
-                             transition: str) -> Dict[str, Any]:
+                             transition: str,
+                             refresh: bool = False) -> Dict[str, Any]:
         """Transition JIRA issue to new status"""
         
         if not self.authenticated:
             return {"error": "JIRA client not authenticated"}
         
         try:
-            # Get available transitions
-            transitions = self.jira_client.get_issue_transitions(issue_key)
-            
-            # Find transition ID by name
-            transition_id = None
-            for t in transitions["transitions"]:
-                if t["name"].lower() == transition.lower():
-                    transition_id = t["id"]
-                    break
+            project_key = issue_key.split('-')[0]
+            name = transition.lower()
+            
+            # Try the transition id seen earlier for this project and issue
+            # type first; only a recent read tells the issue's type
+            transition_id = to_status = cache_key = None
+            read = self._issue_cache.get(issue_key)
+            if read is not None and time.monotonic() - read[0] < READ_CACHE_TTL_SECONDS:
+                cache_key = (project_key, read[1]["issue"]["issue_type"].lower())
+                cached = self._transition_cache.get(cache_key)
+                if cached is not None and time.monotonic() - cached[0] < TRANSITION_CACHE_TTL_SECONDS:
+                    transition_id, to_status = cached[1].get(name, (None, None))
+            
+            if transition_id:
+                try:
+                    await self._request(
+                        "POST", f"/issue/{issue_key}/transitions", json={"transition": {"id": transition_id}}
+                    )
+                except JiraAPIError as e:
+                    # Workflow changed or the issue is in another status; look it up
+                    # again. Anything else (auth, server errors) is reported as is.
+                    if e.status not in (400, 404):
+                        raise
+                    self._transition_cache.pop(cache_key, None)
+                    transition_id = None
             
             if not transition_id:
-                available_transitions = [t["name"] for t in transitions["transitions"]]
-                return {
-                    "error": f"Transition '{transition}' not found. Available transitions: {available_transitions}"
-                }
-            
-            # Perform transition
-            self.jira_client.transition_issue(issue_key, transition_id)
-            
-            # Get updated issue
-            updated_issue = await self.get_issue(issue_key)
-            
-            logger.info(f"✅ Transitioned JIRA issue {issue_key} to {transition}")
+                # Get the issue type and the transitions available from its current status
+                issue = await self._request(
+                    "GET", f"/issue/{issue_key}", params={"fields": "issuetype", "expand": "transitions"}
+                )
+                transitions = issue["transitions"]
+                
+                # Transitions depend on the current status, so merge with what is known
+                cache_key = (project_key, issue["fields"]["issuetype"]["name"].lower())
+                cached = self._transition_cache.get(cache_key)
+                known = dict(cached[1]) if cached is not None else {}
+                known.update(
+                    (t["name"].lower(), (t["id"], t.get("to", {}).get("name")))
+                    for t in transitions
+                )
+                self._transition_cache[cache_key] = (time.monotonic(), known)
+                
+                # Find transition ID by name
+                for t in transitions:
+                    if t["name"].lower() == name:
+                        transition_id = t["id"]
+                        to_status = t.get("to", {}).get("name")
+                        break
+                
+                if not transition_id:
+                    available_transitions = [t["name"] for t in transitions]
+                    return {
+                        "error": f"Transition '{transition}' not found. Available transitions: {available_transitions}"
+                    }
+                
+                # Perform transition
+                await self._request(
+                    "POST", f"/issue/{issue_key}/transitions", json={"transition": {"id": transition_id}}
+                )
+            
+            # The transition names its target status, so a recent read can be updated in place
+            updated_issue = None
+            if not refresh and to_status:
+                updated_issue = self._patch_cached_issue(issue_key, {"status": to_status})
+            if updated_issue is None:
+                self._issue_cache.pop(issue_key, None)
+                updated_issue = await self.get_issue(issue_key)
+            
+            logger.info("✅ Transitioned JIRA issue %s to %s", issue_key, transition)
             return updated_issue
             
         except Exception as e:
-            logger.error(f"❌ Error transitioning JIRA issue: {e}")
+            logger.error("❌ Error transitioning JIRA issue: %s", e)
             return {"error": str(e)}
     
     async def list_projects(self) -> Dict[str, Any]:
@@ -295,7 +517,7 @@ class JiraMCPServer:
             return {"error": "JIRA client not authenticated"}
         
         try:
-            projects = self.jira_client.get_all_projects()
+            projects = await self._request("GET", "/project")
             
             project_list = []
             for project in projects:
@@ -316,18 +538,26 @@ class JiraMCPServer:
             return result
             
         except Exception as e:
-            logger.error(f"❌ Error listing JIRA projects: {e}")
+            logger.error("❌ Error listing JIRA projects: %s", e)
             return {"error": str(e)}
 
 # Global JIRA server instance
 _jira_server = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_jira_init_lock = LoopLocal(asyncio.Lock)
 
 async def get_jira_server() -> JiraMCPServer:
     """Get or create the global JIRA server instance"""
     global _jira_server
-    if _jira_server is None:
-        _jira_server = JiraMCPServer()
-        await _jira_server.initialize()
+    if _jira_server is not None:
+        return _jira_server
+    
+    # Concurrent first callers wait here instead of each initializing a server
+    async with _jira_init_lock.get():
+        if _jira_server is None:
+            server = JiraMCPServer()
+            await server.initialize()
+            _jira_server = server
     return _jira_server
 
 # MCP Tool Functions - these are called by the MCP system
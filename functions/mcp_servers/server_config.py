@@ -0,0 +1,749 @@
+"""
+MCP Server Configurations
+Defines configurations for all available MCP servers
+"""
+
+import os
+import shutil
+import time
+import hashlib
+import logging
+import functools
+import itertools
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Any, Mapping, Optional, Tuple
+from mcp_auth import get_auth_manager
+
+logger = logging.getLogger(__name__)
+
+@dataclass(slots=True, frozen=True)
+class ServerConfig:
+    """Configuration of one MCP server"""
+    name: str
+    description: str
+    command: str
+    args: Tuple[str, ...]
+    env: Mapping[str, str]
+    tools: Tuple[str, ...]
+    install_command: str
+    requirements: Tuple[str, ...]
+    enabled: bool = True
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain dict form handed to MCP clients and API responses"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "command": self.command,
+            "args": list(self.args),
+            "env": dict(self.env),
+            "tools": self.tools,
+            "enabled": self.enabled,
+            "install_command": self.install_command,
+            "requirements": list(self.requirements)
+        }
+
+# Prefixes of the environment variables the server configs are derived from
+_CONFIG_ENV_PREFIXES = (
+    "GITHUB_", "GOOGLE_", "JIRA_", "SLACK_", "LINEAR_", "NOTION_",
+    "SERP_", "SMTP_", "EMAIL_", "DATABASE_", "DB_"
+)
+
+# (fingerprint, server configs, their dict form) of the last build
+_CONFIGS_CACHE: Optional[Tuple[str, Mapping[str, ServerConfig], Mapping[str, Dict[str, Any]]]] = None
+# Views derived from the server configs, each paired with the configs they came from
+_TOOL_TO_SERVER: Optional[Tuple[Mapping[str, ServerConfig], Mapping[str, str]]] = None
+_ALL_TOOLS: Optional[Tuple[Mapping[str, ServerConfig], Tuple[str, ...], FrozenSet[str]]] = None
+
+def _config_fingerprint() -> str:
+    """Hash the environment variables and auth state the configs depend on"""
+    digest = hashlib.blake2b(digest_size=16)
+    for key in sorted(k for k in os.environ if k.startswith(_CONFIG_ENV_PREFIXES)):
+        digest.update(f"{key}={os.environ[key]}\0".encode())
+    digest.update(str(get_auth_manager().version).encode())
+    return digest.hexdigest()
+
+def invalidate_mcp_config_cache():
+    """Force the next config lookup to rebuild the server configurations"""
+    global _CONFIGS_CACHE, _TOOL_TO_SERVER, _ALL_TOOLS
+    _CONFIGS_CACHE = _TOOL_TO_SERVER = _ALL_TOOLS = None
+
+def _current_configs() -> Tuple[str, Mapping[str, ServerConfig], Mapping[str, Dict[str, Any]]]:
+    """Cache entry for the current fingerprint, rebuilding it when stale"""
+    global _CONFIGS_CACHE
+    fingerprint = _config_fingerprint()
+    if _CONFIGS_CACHE is None or _CONFIGS_CACHE[0] != fingerprint:
+        servers = _build_mcp_server_configs()
+        _CONFIGS_CACHE = (
+            fingerprint,
+            MappingProxyType(servers),
+            MappingProxyType({server_id: config.as_dict() for server_id, config in servers.items()})
+        )
+    return _CONFIGS_CACHE
+
+def get_server_configs() -> Mapping[str, ServerConfig]:
+    """Get all enabled MCP server configurations as ServerConfig objects"""
+    return _current_configs()[1]
+
+def get_mcp_server_configs() -> Mapping[str, Dict[str, Any]]:
+    """Get all enabled MCP server configurations as dicts (shared, do not mutate)"""
+    return _current_configs()[2]
+
+# Plain environment settings used by server configs, with their defaults
+_ENV_DEFAULTS = {
+    "SERP_API_KEY": "",
+    "SMTP_HOST": "smtp.gmail.com",
+    "SMTP_PORT": "587",
+    "SMTP_USERNAME": "",
+    "SMTP_PASSWORD": "",
+    "EMAIL_FROM": "",
+    "DATABASE_URL": "",
+    "DB_TYPE": "postgresql"
+}
+
+def _env_snapshot() -> Dict[str, str]:
+    """Read every plain environment setting in one pass"""
+    environ = os.environ
+    return {key: environ.get(key, default) for key, default in _ENV_DEFAULTS.items()}
+
+# Display names, available before a server config is built
+_SERVER_NAMES = {
+    "github": "GitHub Integration",
+    "google_drive": "Google Drive Integration",
+    "jira": "JIRA Integration",
+    "slack": "Slack Integration",
+    "linear": "Linear Integration",
+    "notion": "Notion Integration",
+    "web_search": "Web Search",
+    "email": "Email Integration",
+    "google_calendar": "Google Calendar",
+    "database": "Database Integration"
+}
+
+# Tools exposed by each server, shared by every config build
+_GITHUB_TOOLS = (
+    "create_repository",
+    "get_repository",
+    "list_repositories",
+    "create_issue",
+    "update_issue",
+    "list_issues",
+    "create_pull_request",
+    "get_file_contents",
+    "create_file",
+    "update_file",
+    "delete_file",
+    "search_repositories",
+    "search_code",
+    "get_repository_structure"
+)
+
+def _github_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """GitHub MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["github"],
+        description="Manage GitHub repositories, issues, and pull requests",
+        command="npx",
+        args=("@modelcontextprotocol/server-github",),
+        env=auth["github"][0],
+        tools=_GITHUB_TOOLS,
+        install_command="npm install -g @modelcontextprotocol/server-github",
+        requirements=("Node.js", "GitHub Token")
+    )
+
+_GOOGLE_DRIVE_TOOLS = (
+    "create_document",
+    "create_spreadsheet",
+    "create_presentation",
+    "read_document",
+    "update_document",
+    "list_files",
+    "search_files",
+    "share_file",
+    "download_file",
+    "upload_file",
+    "create_folder",
+    "move_file",
+    "copy_file",
+    "delete_file"
+)
+
+def _google_drive_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Google Drive MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["google_drive"], 
+        description="Create, read, and manage Google Drive documents",
+        command="python",
+        args=("-m", "google_drive_mcp_server"),
+        env=auth["google_drive"][0],
+        tools=_GOOGLE_DRIVE_TOOLS,
+        install_command="pip install google-drive-mcp-server",
+        requirements=("Google API Credentials", "Python 3.8+")
+    )
+
+_JIRA_TOOLS = (
+    "create_issue",
+    "update_issue",
+    "get_issue",
+    "delete_issue",
+    "search_issues",
+    "add_comment",
+    "assign_issue",
+    "transition_issue",
+    "create_project",
+    "get_project",
+    "list_projects",
+    "get_project_components",
+    "get_project_versions",
+    "create_epic",
+    "add_issue_to_epic"
+)
+
+def _jira_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """JIRA MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["jira"],
+        description="Create and manage JIRA tickets and projects",
+        command="python",
+        args=("-m", "jira_mcp_server"),
+        env=auth["jira"][0],
+        tools=_JIRA_TOOLS,
+        install_command="pip install jira-mcp-server",
+        requirements=("JIRA API Token", "JIRA URL", "Username")
+    )
+
+_SLACK_TOOLS = (
+    "send_message",
+    "send_direct_message",
+    "list_channels",
+    "get_channel_info",
+    "create_channel",
+    "invite_to_channel",
+    "list_users",
+    "get_user_info",
+    "schedule_message",
+    "upload_file",
+    "get_message_history",
+    "pin_message",
+    "react_to_message"
+)
+
+def _slack_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Slack MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["slack"],
+        description="Send messages and interact with Slack channels",
+        command="python",
+        args=("-m", "slack_mcp_server"),
+        env=auth["slack"][0],
+        tools=_SLACK_TOOLS,
+        install_command="pip install slack-mcp-server",
+        requirements=("Slack Bot Token", "Slack App Token")
+    )
+
+_LINEAR_TOOLS = (
+    "create_issue",
+    "update_issue",
+    "get_issue",
+    "list_issues",
+    "assign_issue",
+    "create_project",
+    "get_project",
+    "list_projects",
+    "create_team",
+    "get_team",
+    "list_teams",
+    "add_comment",
+    "update_issue_status"
+)
+
+def _linear_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Linear MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["linear"],
+        description="Manage Linear issues and projects",
+        command="npx",
+        args=("@linear/mcp-server",),
+        env=auth["linear"][0],
+        tools=_LINEAR_TOOLS,
+        install_command="npm install -g @linear/mcp-server",
+        requirements=("Linear API Key",)
+    )
+
+_NOTION_TOOLS = (
+    "create_page",
+    "update_page",
+    "get_page",
+    "delete_page",
+    "search_pages",
+    "create_database",
+    "query_database",
+    "create_database_entry",
+    "update_database_entry",
+    "get_database_entry"
+)
+
+def _notion_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Notion MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["notion"],
+        description="Create and manage Notion pages and databases",
+        command="python",
+        args=("-m", "notion_mcp_server"),
+        env=auth["notion"][0],
+        tools=_NOTION_TOOLS,
+        install_command="pip install notion-mcp-server",
+        requirements=("Notion API Key",)
+    )
+
+_WEB_SEARCH_TOOLS = (
+    "web_search",
+    "news_search",
+    "image_search",
+    "video_search",
+    "get_page_content",
+    "get_page_summary"
+)
+
+def _web_search_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Web Search MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["web_search"],
+        description="Search the web for current information",
+        command="python",
+        args=("-m", "web_search_mcp_server"),
+        env={
+            "SEARCH_API_KEY": env["SERP_API_KEY"],
+            "SEARCH_ENGINE": "google"
+        },
+        tools=_WEB_SEARCH_TOOLS,
+        install_command="pip install web-search-mcp-server",
+        requirements=("Search API Key (SerpAPI, Google Custom Search)",)
+    )
+
+_EMAIL_TOOLS = (
+    "send_email",
+    "send_html_email",
+    "send_email_with_attachment",
+    "read_emails",
+    "search_emails",
+    "mark_email_read",
+    "delete_email",
+    "create_draft",
+    "get_draft_body"
+)
+
+def _email_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Email MCP Server"""
+    return ServerConfig(
+        name=_SERVER_NAMES["email"],
+        description="Send and manage emails",
+        command="python",
+        args=("-m", "email_mcp_server"),
+        env={
+            "SMTP_HOST": env["SMTP_HOST"],
+            "SMTP_PORT": env["SMTP_PORT"],
+            "SMTP_USERNAME": env["SMTP_USERNAME"],
+            "SMTP_PASSWORD": env["SMTP_PASSWORD"],
+            "EMAIL_FROM": env["EMAIL_FROM"]
+        },
+        tools=_EMAIL_TOOLS,
+        install_command="pip install email-mcp-server",
+        requirements=("SMTP Credentials", "Email Account")
+    )
+
+_GOOGLE_CALENDAR_TOOLS = (
+    "create_event",
+    "update_event",
+    "delete_event",
+    "get_event",
+    "list_events",
+    "search_events",
+    "create_meeting",
+    "list_calendars",
+    "get_free_busy",
+    "send_invitation"
+)
+
+def _google_calendar_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Calendar MCP Server (Google Calendar)"""
+    return ServerConfig(
+        name=_SERVER_NAMES["google_calendar"],
+        description="Manage Google Calendar events and schedules",
+        command="python",
+        args=("-m", "google_calendar_mcp_server"),
+        env=auth["google_drive"][0],  # Same creds as Drive
+        tools=_GOOGLE_CALENDAR_TOOLS,
+        install_command="pip install google-calendar-mcp-server",
+        requirements=("Google API Credentials",)
+    )
+
+_DATABASE_TOOLS = (
+    "execute_query",
+    "execute_update",
+    "list_tables",
+    "describe_table",
+    "get_table_data",
+    "create_table",
+    "insert_data",
+    "update_data",
+    "delete_data"
+)
+
+def _database_config(auth: Mapping[str, Tuple[Dict[str, str], bool]], env: Mapping[str, str]) -> ServerConfig:
+    """Database MCP Server (Generic SQL)"""
+    return ServerConfig(
+        name=_SERVER_NAMES["database"],
+        description="Query and manage databases",
+        command="python",
+        args=("-m", "database_mcp_server"),
+        env={
+            "DATABASE_URL": env["DATABASE_URL"],
+            "DB_TYPE": env["DB_TYPE"]
+        },
+        tools=_DATABASE_TOOLS,
+        install_command="pip install database-mcp-server",
+        requirements=("Database Connection String",)
+    )
+
+# Servers that don't need special auth
+_NO_AUTH_SERVERS = frozenset({"web_search", "email"})
+
+# Server ID -> (enabled by default, config factory)
+_SERVER_FACTORIES = {
+    "github": (True, _github_config),
+    "google_drive": (True, _google_drive_config),
+    "jira": (True, _jira_config),
+    "slack": (True, _slack_config),
+    "linear": (False, _linear_config),  # Optional integration
+    "notion": (False, _notion_config),  # Optional integration
+    "web_search": (True, _web_search_config),
+    "email": (True, _email_config),
+    "google_calendar": (True, _google_calendar_config),
+    "database": (False, _database_config)  # Optional, needs database setup
+}
+
+# Servers enabled by default, whose credentials each build resolves
+_ENABLED_SERVER_IDS = tuple(server_id for server_id, (enabled, _) in _SERVER_FACTORIES.items() if enabled)
+
+def _build_mcp_server_configs() -> Dict[str, ServerConfig]:
+    """Build the MCP server configurations that are enabled and authorized"""
+    # Credentials for every enabled server are resolved once, up front
+    auth = get_auth_manager().snapshot(_ENABLED_SERVER_IDS)
+    env = _env_snapshot()
+    
+    # Filter enabled servers and validate credentials before building any config
+    enabled_configs = {}
+    for server_id, (enabled, factory) in _SERVER_FACTORIES.items():
+        if enabled:
+            name = _SERVER_NAMES[server_id]
+            # Check if credentials are available
+            if server_id in _NO_AUTH_SERVERS or auth[server_id][1]:
+                enabled_configs[server_id] = factory(auth, env)
+                logger.info(f"✅ Enabled MCP server: {name}")
+            else:
+                logger.warning(f"⚠️ Skipping {name} - credentials not available")
+    
+    return enabled_configs
+
+def get_tool_to_server_mapping() -> Mapping[str, str]:
+    """Get mapping of tool names to their server IDs (shared, do not mutate)"""
+    global _TOOL_TO_SERVER
+    configs = get_server_configs()
+    # Rebuilt only when the configs themselves were rebuilt
+    if _TOOL_TO_SERVER is None or _TOOL_TO_SERVER[0] is not configs:
+        mapping = {
+            tool: server_id
+            for server_id, config in configs.items()
+            for tool in config.tools
+        }
+        _TOOL_TO_SERVER = (configs, MappingProxyType(mapping))
+    return _TOOL_TO_SERVER[1]
+
+def get_available_tools() -> Tuple[str, ...]:
+    """Get all available tools across all servers"""
+    return _all_tools()[0]
+
+def get_available_tools_set() -> FrozenSet[str]:
+    """Get the set of all available tools (shared, immutable)"""
+    return _all_tools()[1]
+
+def _all_tools() -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """Tuple and set of the available tools for the current configs"""
+    global _ALL_TOOLS
+    configs = get_server_configs()
+    if _ALL_TOOLS is None or _ALL_TOOLS[0] is not configs:
+        tools = tuple(itertools.chain.from_iterable(
+            config.tools for config in configs.values()
+        ))
+        _ALL_TOOLS = (configs, tools, frozenset(tools))
+    return _ALL_TOOLS[1:]
+
+# Tools each agent is allowed to use, in presentation order
+_AGENT_TOOLS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "posiAgent": (
+        "web_search", "news_search", "get_page_content",
+        "search_files", "read_document", "list_files",
+        "list_events", "create_event", "get_free_busy",
+        "send_email"
+    ),
+    "minutaMaker": (
+        "create_document", "update_document", "read_document",
+        "create_spreadsheet", "share_file", "upload_file",
+        "create_event", "send_invitation", "send_email",
+        "send_email_with_attachment"
+    ),
+    "jiraAssistant": (
+        "create_issue", "update_issue", "get_issue", "search_issues",
+        "add_comment", "assign_issue", "transition_issue",
+        "create_project", "get_project", "list_projects",
+        "create_epic", "add_issue_to_epic",
+        "read_document", "create_document"  # For documentation
+    )
+})
+
+# Same tools as sets, for membership checks
+_AGENT_TOOL_SETS: Mapping[str, FrozenSet[str]] = MappingProxyType({
+    agent_id: frozenset(tools) for agent_id, tools in _AGENT_TOOLS.items()
+})
+
+# (agent ID, tool) pairs, for single-lookup permission checks
+_AGENT_ALLOWED_PAIRS: FrozenSet[Tuple[str, str]] = frozenset(
+    (agent_id, tool) for agent_id, tools in _AGENT_TOOLS.items() for tool in tools
+)
+
+def get_tools_for_agent(agent_id: str) -> List[str]:
+    """Get tools available for specific agent based on their configuration"""
+    return list(_AGENT_TOOLS.get(agent_id, ()))
+
+def get_tools_for_agent_set(agent_id: str) -> FrozenSet[str]:
+    """Get the set of tools an agent may use (shared, immutable)"""
+    return _AGENT_TOOL_SETS.get(agent_id, frozenset())
+
+def is_tool_allowed_for_agent(agent_id: str, tool: str) -> bool:
+    """Check whether an agent may call a tool"""
+    return (agent_id, tool) in _AGENT_ALLOWED_PAIRS
+
+@functools.lru_cache(maxsize=16)
+def _which_cached(command: str, path: str) -> bool:
+    """Check whether a command is on PATH; PATH is part of the key so changes miss the cache"""
+    return shutil.which(command, path=path) is not None
+
+# (monotonic time, config fingerprint, status) of the last status check
+_STATUS_CACHE: Optional[Tuple[float, str, Dict[str, Dict[str, Any]]]] = None
+_STATUS_FRESH_SECONDS = 30
+_STATUS_MAX_AGE_SECONDS = 300
+
+def get_server_installation_status() -> Dict[str, Dict[str, Any]]:
+    """Check which MCP servers are properly installed and configured (shared, do not mutate)
+    
+    Results younger than 30s are served as-is; older results, or results for
+    a different environment/auth state, are recomputed. If recomputing fails,
+    a result up to 5 minutes old keeps being served.
+    """
+    global _STATUS_CACHE
+    fingerprint = _config_fingerprint()
+    cached = _STATUS_CACHE
+    age = time.monotonic() - cached[0] if cached is not None and cached[1] == fingerprint else None
+    if age is not None and age < _STATUS_FRESH_SECONDS:
+        return cached[2]
+    
+    # Recomputed inline: a background refresh would race request threads on
+    # the config and credential caches, and may be starved of CPU once the
+    # response has been sent
+    try:
+        status = _check_server_installation_status()
+    except Exception as e:
+        if age is None or age >= _STATUS_MAX_AGE_SECONDS:
+            raise
+        logger.warning(f"⚠️ Could not refresh MCP server status: {e}")
+        return cached[2]
+    
+    _STATUS_CACHE = (time.monotonic(), fingerprint, status)
+    return status
+
+def _check_server_installation_status() -> Dict[str, Dict[str, Any]]:
+    """Check which MCP servers are properly installed and configured"""
+    configs = get_server_configs()
+    auth = get_auth_manager().snapshot(configs)
+    status = {}
+    
+    for server_id, config in configs.items():
+        try:
+            # Check credentials
+            has_credentials = auth[server_id][1]
+            
+            # Check if command exists
+            command_available = _which_cached(config.command, os.environ.get("PATH", ""))
+            
+            status[server_id] = {
+                "name": config.name,
+                "enabled": config.enabled,
+                "has_credentials": has_credentials,
+                "command_available": command_available,
+                "ready": has_credentials and command_available and config.enabled,
+                "install_command": config.install_command,
+                "requirements": list(config.requirements),
+                "tools_count": len(config.tools)
+            }
+            
+        except Exception as e:
+            status[server_id] = {
+                "name": config.name,
+                "enabled": False,
+                "has_credentials": False,
+                "command_available": False,
+                "ready": False,
+                "error": str(e),
+                "install_command": config.install_command,
+                "requirements": list(config.requirements),
+                "tools_count": 0
+            }
+    
+    return status
+
+# Tool schemas for Gemini function calling, keyed "<server_id>.<tool>" since
+# tool names are not unique across servers
+_TOOL_SCHEMAS = {
+    # GitHub tools
+    "github.create_issue": {
+        "name": "create_issue",
+        "description": "Create a new GitHub issue",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "Issue title"},
+                "body": {"type": "string", "description": "Issue description"},
+                "labels": {"type": "array", "items": {"type": "string"}, "description": "Issue labels"},
+                "assignees": {"type": "array", "items": {"type": "string"}, "description": "Issue assignees"}
+            },
+            "required": ["title", "body"]
+        }
+    },
+    
+    # Google Drive tools
+    "google_drive.create_document": {
+        "name": "create_document",
+        "description": "Create a new Google Docs document",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "Document title"},
+                "content": {"type": "string", "description": "Document content"},
+                "folder_id": {"type": "string", "description": "Parent folder ID"}
+            },
+            "required": ["title", "content"]
+        }
+    },
+    
+    # JIRA tools
+    "jira.create_issue": {
+        "name": "create_jira_issue",
+        "description": "Create a new JIRA issue",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "project": {"type": "string", "description": "Project key"},
+                "issue_type": {"type": "string", "description": "Issue type (Story, Bug, Task, Epic)"},
+                "summary": {"type": "string", "description": "Issue summary/title"},
+                "description": {"type": "string", "description": "Issue description"},
+                "priority": {"type": "string", "description": "Issue priority"},
+                "assignee": {"type": "string", "description": "Assignee username"}
+            },
+            "required": ["project", "issue_type", "summary"]
+        }
+    },
+    
+    # Web search tools
+    "web_search.web_search": {
+        "name": "web_search",
+        "description": "Search the web for current information",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query"},
+                "num_results": {"type": "integer", "description": "Number of results to return", "default": 5}
+            },
+            "required": ["query"]
+        }
+    },
+    
+    # Email tools
+    "email.send_email": {
+        "name": "send_email",
+        "description": "Send an email",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "to": {"type": "string", "description": "Recipient email address"},
+                "subject": {"type": "string", "description": "Email subject"},
+                "body": {"type": "string", "description": "Email body"},
+                "cc": {"type": "string", "description": "CC recipients"},
+                "bcc": {"type": "string", "description": "BCC recipients"}
+            },
+            "required": ["to", "subject", "body"]
+        }
+    },
+    
+    "email.get_draft_body": {
+        "name": "get_draft_body",
+        "description": "Get the body of an email draft created with create_draft",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "body_sha256": {"type": "string", "description": "The draft's body_sha256, as returned by create_draft"}
+            },
+            "required": ["body_sha256"]
+        }
+    },
+    
+    # Calendar tools
+    "google_calendar.create_event": {
+        "name": "create_event",
+        "description": "Create a calendar event",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string", "description": "Event title"},
+                "start_time": {"type": "string", "description": "Event start time (ISO format)"},
+                "end_time": {"type": "string", "description": "Event end time (ISO format)"},
+                "description": {"type": "string", "description": "Event description"},
+                "attendees": {"type": "array", "items": {"type": "string"}, "description": "Attendee emails"}
+            },
+            "required": ["title", "start_time", "end_time"]
+        }
+    }
+}
+
+# Fallback schema per bare tool name when its server is not enabled; later
+# entries win, matching the JIRA create_issue schema served previously
+_DEFAULT_TOOL_SCHEMAS = {key.split(".", 1)[1]: schema for key, schema in _TOOL_SCHEMAS.items()}
+
+# (tool map, {requested tools: definitions}) for the current configs
+_DEFINITIONS_CACHE: Optional[Tuple[Mapping[str, str], Dict[Tuple[str, ...], Tuple[Dict[str, Any], ...]]]] = None
+_MAX_CACHED_DEFINITIONS = 32
+
+def get_function_definitions_for_gemini(tools: List[str]) -> List[Dict[str, Any]]:
+    """Generate function definitions for Gemini function calling (shared, do not mutate)"""
+    global _DEFINITIONS_CACHE
+    server_map = get_tool_to_server_mapping()
+    if _DEFINITIONS_CACHE is None or _DEFINITIONS_CACHE[0] is not server_map:
+        _DEFINITIONS_CACHE = (server_map, {})
+    cache = _DEFINITIONS_CACHE[1]
+    
+    key = tuple(tools)
+    definitions = cache.get(key)
+    if definitions is None:
+        # Return schemas for requested tools, preferring the server that provides them
+        definitions = tuple(
+            schema for schema in (
+                _TOOL_SCHEMAS.get(f"{server_map.get(tool)}.{tool}") or _DEFAULT_TOOL_SCHEMAS.get(tool)
+                for tool in key
+            ) if schema
+        )
+        if len(cache) >= _MAX_CACHED_DEFINITIONS:
+            cache.clear()
+        cache[key] = definitions
+    
+    return list(definitions)
@@ -4,17 +4,127 @@ Provides web search capabilities for current information
 """
 
 import os
+import re
 import json
+import time
 import asyncio
+import hashlib
+import functools
 import logging
+import importlib.util
 import aiohttp
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urlencode
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:  # selectolax is optional, fall back to BeautifulSoup
+    LexborHTMLParser = None
+    SELECTOLAX_AVAILABLE = False
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional, results are then cached in-process only
+    aioredis = None
+
+from mcp_loop_local import LoopLocal
 
 logger = logging.getLogger(__name__)
 
+# Shared result cache across instances, e.g. redis://host:6379/0 (configure the
+# server with maxmemory-policy allkeys-lru)
+REDIS_URL = os.getenv("REDIS_URL", "")
+# How long identical searches and page fetches are answered from cache
+WEB_SEARCH_CACHE_TTL_SECONDS = 3600
+NEWS_SEARCH_CACHE_TTL_SECONDS = 300
+PAGE_CACHE_TTL_SECONDS = 86400
+RESULT_CACHE_MAX_ENTRIES = 1024
+
+# BeautifulSoup fallback: lxml's C parser when installed
+_BS4_PARSER = 'lxml' if importlib.util.find_spec('lxml') is not None else 'html.parser'
+# Only result blocks are built into the tree; a regex because strained class
+# attributes are matched as the raw, space-separated string
+_RESULT_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)result(\s|$)'))
+
+def _parse_result_links(html_content: str, num_results: int) -> List[Dict[str, Any]]:
+    """Search results from a DuckDuckGo HTML results page"""
+    results = []
+    
+    if SELECTOLAX_AVAILABLE:
+        tree = LexborHTMLParser(html_content)
+        for i, div in enumerate(tree.css('div.result')[:num_results]):
+            title_elem = div.css_first('a.result__a')
+            snippet_elem = div.css_first('a.result__snippet')
+            
+            if title_elem:
+                link = title_elem.attributes.get('href') or ''
+                results.append({
+                    "title": title_elem.text(strip=True),
+                    "link": link,
+                    "snippet": snippet_elem.text(strip=True) if snippet_elem else "",
+                    "displayed_link": link,
+                    "position": i + 1
+                })
+        return results
+    
+    soup = BeautifulSoup(html_content, _BS4_PARSER, parse_only=_RESULT_STRAINER)
+    for i, div in enumerate(soup.find_all('div', class_='result')[:num_results]):
+        title_elem = div.find('a', class_='result__a')
+        snippet_elem = div.find('a', class_='result__snippet')
+        
+        if title_elem:
+            results.append({
+                "title": title_elem.get_text(strip=True),
+                "link": title_elem.get('href', ''),
+                "snippet": snippet_elem.get_text(strip=True) if snippet_elem else "",
+                "displayed_link": title_elem.get('href', ''),
+                "position": i + 1
+            })
+    return results
+
+def _parse_page(html_content: str) -> Tuple[str, str, str]:
+    """Title, meta description and whitespace-normalized visible text of an HTML page"""
+    if SELECTOLAX_AVAILABLE:
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(["script", "style"])
+        
+        text = ' '.join(tree.root.text().split()) if tree.root else ""
+        
+        title = tree.css_first('title')
+        title_text = title.text(strip=True) if title else "No title"
+        
+        meta_description = tree.css_first('meta[name="description"]')
+        description = meta_description.attributes.get('content') if meta_description else ""
+        return title_text, description, text
+    
+    soup = BeautifulSoup(html_content, _BS4_PARSER)
+    
+    # Remove script and style elements
+    for script in soup(["script", "style"]):
+        script.decompose()
+    
+    # Get text content
+    text = soup.get_text()
+    
+    # Clean up text
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    
+    # Get page metadata
+    title = soup.find('title')
+    title_text = title.get_text().strip() if title else "No title"
+    
+    meta_description = soup.find('meta', attrs={'name': 'description'})
+    description = meta_description.get('content') if meta_description else ""
+    return title_text, description, text
+
+# Browser-like agent for sites that reject library user agents
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
 class WebSearchMCPServer:
     """Web Search MCP Server for internet searches"""
     
@@ -22,6 +132,15 @@ class WebSearchMCPServer:
         self.serp_api_key = os.getenv("SERP_API_KEY", "")
         self.search_engine = os.getenv("SEARCH_ENGINE", "google")
         self.authenticated = bool(self.serp_api_key)
+        # aiohttp sessions belong to the event loop that created them, so each
+        # loop gets its own pooled session
+        self._sessions: LoopLocal[aiohttp.ClientSession] = LoopLocal(self._new_session)
+        # Redis clients pool their connections on the loop too
+        self._redis_clients = LoopLocal(self._new_redis) if REDIS_URL and aioredis is not None else None
+        # cache key -> (expires at, result)
+        self._cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Per loop: cache key -> load in progress, awaitable only on that loop
+        self._inflight: LoopLocal[Dict[str, "asyncio.Future"]] = LoopLocal(dict)
         
     async def initialize(self) -> bool:
         """Initialize web search server"""
@@ -37,8 +156,101 @@ class WebSearchMCPServer:
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize web search: {e}")
+            await self.cleanup()
             return False
     
+    async def cleanup(self):
+        """Close this event loop's pooled HTTP and Redis connections"""
+        session = self._sessions.pop()
+        if session is not None:
+            await session.close()
+
+        redis = self._redis_clients.pop() if self._redis_clients is not None else None
+        if redis is not None:
+            await redis.aclose()
+    
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create a pooled session for the running event loop"""
+        # Connections to SerpAPI, DuckDuckGo and fetched sites are kept alive
+        # and DNS lookups cached across the calls of one loop
+        return aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+    
+    @property
+    def _session(self) -> aiohttp.ClientSession:
+        """The running event loop's pooled session"""
+        return self._sessions.get()
+    
+    def _new_redis(self):
+        """Create a Redis client for the running event loop"""
+        return aioredis.from_url(REDIS_URL)
+    
+    @property
+    def _redis(self):
+        """The running event loop's Redis client, None when Redis is not configured"""
+        return self._redis_clients.get() if self._redis_clients is not None else None
+    
+    async def _cached(self, key_parts: Tuple[Any, ...], ttl: int, fn, *args) -> Dict[str, Any]:
+        """Return fn(*args), reusing a successful result for the same key within ttl seconds"""
+        key = "ws:" + hashlib.blake2b(repr(key_parts).encode(), digest_size=16).hexdigest()
+        
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        # Concurrent identical calls share one load; shielded so a cancelled
+        # caller does not cancel it for the others
+        inflight = self._inflight.get()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, ttl, fn, *args))
+            inflight[key] = task
+            task.add_done_callback(functools.partial(self._load_done, inflight, key))
+        return await asyncio.shield(task)
+    
+    def _load_done(self, inflight: Dict[str, "asyncio.Future"], key: str, task: "asyncio.Future") -> None:
+        """Forget a finished load so later cache misses start a new one"""
+        if inflight.get(key) is task:
+            del inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved if every caller was cancelled
+    
+    async def _load(self, key: str, ttl: int, fn, *args) -> Dict[str, Any]:
+        """Read key from Redis or compute fn(*args), storing successful results"""
+        result = None
+        expires_in = ttl
+        if self._redis is not None:
+            try:
+                # The value and its remaining lifetime in one round trip
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    value, remaining_ms = await pipe.get(key).pttl(key).execute()
+                if value is not None:
+                    result = json.loads(value)
+                    # Kept locally only as long as Redis keeps it, not a full ttl
+                    if remaining_ms is not None and remaining_ms >= 0:
+                        expires_in = min(ttl, remaining_ms / 1000)
+            except Exception as e:
+                logger.warning(f"⚠️ Web search cache read failed: {e}")
+        
+        if result is None:
+            result = await fn(*args)
+            # Errors are not cached so the next call retries
+            if not result.get("success"):
+                return result
+            if self._redis is not None:
+                try:
+                    await self._redis.setex(key, ttl, json.dumps(result))
+                except Exception as e:
+                    logger.warning(f"⚠️ Web search cache write failed: {e}")
+        
+        self._cache.pop(key, None)
+        if len(self._cache) >= RESULT_CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (time.monotonic() + expires_in, result)
+        return result
+    
     async def web_search(self,
                        query: str,
                        num_results: int = 5,
@@ -48,9 +260,17 @@ class WebSearchMCPServer:
         
         try:
             if self.authenticated and self.serp_api_key:
-                return await self._search_with_serpapi(query, num_results, country, language)
+                return await self._cached(
+                    ("web", self.search_engine, query, num_results, country, language),
+                    WEB_SEARCH_CACHE_TTL_SECONDS,
+                    self._search_with_serpapi, query, num_results, country, language
+                )
             else:
-                return await self._search_fallback(query, num_results)
+                return await self._cached(
+                    ("web", "duckduckgo", query, num_results),
+                    WEB_SEARCH_CACHE_TTL_SECONDS,
+                    self._search_fallback, query, num_results
+                )
                 
         except Exception as e:
             logger.error(f"❌ Error performing web search: {e}")
@@ -73,9 +293,8 @@ class WebSearchMCPServer:
                 "hl": language
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://serpapi.com/search", params=params) as response:
-                    data = await response.json()
+            async with self._session.get("https://serpapi.com/search", params=params) as response:
+                data = await response.json()
             
             results = []
             organic_results = data.get("organic_results", [])
@@ -122,39 +341,18 @@ class WebSearchMCPServer:
                 "skip_disambig": "1"
             }
             
-            async with aiohttp.ClientSession() as session:
-                # Get instant answer
-                async with session.get("https://api.duckduckgo.com/", params=ddg_params) as response:
-                    ddg_data = await response.json()
-                
-                # Also try to get web results (limited)
-                search_url = f"https://html.duckduckgo.com/html/?q={query}"
-                headers = {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-                
-                async with session.get(search_url, headers=headers) as web_response:
-                    html_content = await web_response.text()
+            # Get instant answer
+            async with self._session.get("https://api.duckduckgo.com/", params=ddg_params) as response:
+                ddg_data = await response.json()
             
-            # Parse HTML results
-            soup = BeautifulSoup(html_content, 'html.parser')
-            results = []
+            # Also try to get web results (limited)
+            search_url = f"https://html.duckduckgo.com/html/?q={query}"
             
-            # Extract search results
-            result_divs = soup.find_all('div', class_='result')[:num_results]
+            async with self._session.get(search_url, headers=BROWSER_HEADERS) as web_response:
+                html_content = await web_response.text()
             
-            for i, div in enumerate(result_divs):
-                title_elem = div.find('a', class_='result__a')
-                snippet_elem = div.find('a', class_='result__snippet')
-                
-                if title_elem:
-                    results.append({
-                        "title": title_elem.get_text(strip=True),
-                        "link": title_elem.get('href', ''),
-                        "snippet": snippet_elem.get_text(strip=True) if snippet_elem else "",
-                        "displayed_link": title_elem.get('href', ''),
-                        "position": i + 1
-                    })
+            # Parse HTML results
+            results = _parse_result_links(html_content, num_results)
             
             # Get instant answer if available
             instant_answer = ""
@@ -186,39 +384,11 @@ class WebSearchMCPServer:
         
         try:
             if self.authenticated and self.serp_api_key:
-                params = {
-                    "engine": "google_news",
-                    "q": query,
-                    "api_key": self.serp_api_key,
-                    "num": num_results
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get("https://serpapi.com/search", params=params) as response:
-                        data = await response.json()
-                
-                results = []
-                news_results = data.get("news_results", [])
-                
-                for result in news_results[:num_results]:
-                    results.append({
-                        "title": result.get("title", ""),
-                        "link": result.get("link", ""),
-                        "snippet": result.get("snippet", ""),
-                        "source": result.get("source", ""),
-                        "date": result.get("date", ""),
-                        "thumbnail": result.get("thumbnail", "")
-                    })
-                
-                return {
-                    "success": True,
-                    "results": results,
-                    "count": len(results),
-                    "search_metadata": {
-                        "query": query,
-                        "type": "news"
-                    }
-                }
+                return await self._cached(
+                    ("news", query, num_results),
+                    NEWS_SEARCH_CACHE_TTL_SECONDS,
+                    self._news_with_serpapi, query, num_results
+                )
             else:
                 # Fallback to regular search with news query
                 news_query = f"{query} news"
@@ -228,47 +398,64 @@ class WebSearchMCPServer:
             logger.error(f"❌ Error performing news search: {e}")
             return {"error": str(e)}
     
+    async def _news_with_serpapi(self, query: str, num_results: int) -> Dict[str, Any]:
+        """Search news using SerpAPI's Google News engine"""
+        
+        params = {
+            "engine": "google_news",
+            "q": query,
+            "api_key": self.serp_api_key,
+            "num": num_results
+        }
+        
+        async with self._session.get("https://serpapi.com/search", params=params) as response:
+            data = await response.json()
+        
+        results = []
+        news_results = data.get("news_results", [])
+        
+        for result in news_results[:num_results]:
+            results.append({
+                "title": result.get("title", ""),
+                "link": result.get("link", ""),
+                "snippet": result.get("snippet", ""),
+                "source": result.get("source", ""),
+                "date": result.get("date", ""),
+                "thumbnail": result.get("thumbnail", "")
+            })
+        
+        return {
+            "success": True,
+            "results": results,
+            "count": len(results),
+            "search_metadata": {
+                "query": query,
+                "type": "news"
+            }
+        }
+    
     async def get_page_content(self, url: str, max_chars: int = 5000) -> Dict[str, Any]:
         """Get content from a specific webpage"""
         
+        return await self._cached(("page", url, max_chars), PAGE_CACHE_TTL_SECONDS, self._fetch_page_content, url, max_chars)
+    
+    async def _fetch_page_content(self, url: str, max_chars: int) -> Dict[str, Any]:
+        """Fetch a webpage and extract its text and metadata"""
+        
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=10) as response:
-                    if response.status != 200:
-                        return {"error": f"HTTP {response.status}: Could not fetch page"}
-                    
-                    html_content = await response.text()
-            
-            # Parse HTML and extract text
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Get text content
-            text = soup.get_text()
+            async with self._session.get(url, headers=BROWSER_HEADERS, timeout=10) as response:
+                if response.status != 200:
+                    return {"error": f"HTTP {response.status}: Could not fetch page"}
+                
+                html_content = await response.text()
             
-            # Clean up text
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            # Parse HTML and extract text and page metadata
+            title_text, description, text = _parse_page(html_content)
             
             # Truncate if too long
             if len(text) > max_chars:
                 text = text[:max_chars] + "..."
             
-            # Get page metadata
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "No title"
-            
-            meta_description = soup.find('meta', attrs={'name': 'description'})
-            description = meta_description.get('content') if meta_description else ""
-            
             return {
                 "success": True,
                 "page": {
@@ -320,13 +507,21 @@ class WebSearchMCPServer:
 
 # Global web search server instance
 _web_search_server = None
+# Per loop: a lock left bound to a finished request's loop cannot be awaited
+_web_search_init_lock = LoopLocal(asyncio.Lock)
 
 async def get_web_search_server() -> WebSearchMCPServer:
     """Get or create the global web search server instance"""
     global _web_search_server
-    if _web_search_server is None:
-        _web_search_server = WebSearchMCPServer()
-        await _web_search_server.initialize()
+    if _web_search_server is not None:
+        return _web_search_server
+    
+    # Concurrent first callers wait here instead of each initializing a server
+    async with _web_search_init_lock.get():
+        if _web_search_server is None:
+            server = WebSearchMCPServer()
+            await server.initialize()
+            _web_search_server = server
     return _web_search_server
 
 # MCP Tool Functions - these are called by the MCP system
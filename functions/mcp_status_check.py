@@ -157,9 +157,11 @@ class MCPStatusChecker:
         try:
             from mcp_servers.email_server import get_email_server
             server = await get_email_server()
+            # initialize() no longer logs in, so probe the SMTP server here
+            authenticated = server.authenticated and await server.verify()
             servers["email"] = {
-                "status": "ok" if server.authenticated else "not_configured",
-                "authenticated": server.authenticated
+                "status": "ok" if authenticated else "not_configured",
+                "authenticated": authenticated
             }
         except Exception as e:
             servers["email"] = {"status": "error", "error": str(e)}
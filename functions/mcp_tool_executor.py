@@ -11,7 +11,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from mcp_client import MCPClient, ToolCall, ToolResult, get_mcp_client, initialize_mcp_system
 from mcp_function_calling import FunctionCallParser, GeminiFunctionCallHandler, format_multiple_results_for_llm
-from mcp_servers import get_mcp_server_configs, get_tools_for_agent, get_function_definitions_for_gemini
+from mcp_servers import get_mcp_server_configs, get_tools_for_agent, get_function_definitions_for_gemini, is_tool_allowed_for_agent
 from mcp_auth import get_auth_manager
 
 logger = logging.getLogger(__name__)
@@ -149,10 +149,9 @@ class MCPToolExecutor:
         try:
             # Validate tool calls
             validated_calls = []
-            available_tools = get_tools_for_agent(context.agent_id)
             
             for call in tool_calls:
-                if call.name in available_tools:
+                if is_tool_allowed_for_agent(context.agent_id, call.name):
                     validated_calls.append(call)
                     logger.info(f"✅ Validated tool call: {call.name}")
                 else:
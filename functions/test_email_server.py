@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Email Server Tests
+Covers the pooled SMTP connections used for sending
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_servers import email_server
+from mcp_servers.email_server import EmailMCPServer
+
+class FakeSMTP:
+    """Connected SMTP stub that only works on the event loop that opened it"""
+
+    def __init__(self, failures):
+        self.loop = asyncio.get_running_loop()
+        self.failures = failures
+        self.sent = 0
+        self.closed = False
+
+    async def send_message(self, message, recipients):
+        await asyncio.sleep(0)  # let concurrent sends contend for the pool
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+        if self.failures:
+            raise self.failures.pop(0)
+        self.sent += 1
+        return {}, "OK"
+
+    async def noop(self):
+        pass
+
+    async def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+class SMTPPoolTest(unittest.TestCase):
+    """Tests for the per-event-loop SMTP connection pool"""
+
+    def setUp(self):
+        self.server = EmailMCPServer()
+        self.server.authenticated = True
+        self.server.email_from = "agent@example.com"
+        self.connections = []
+        # Exceptions the next sends raise, on whichever connection sends them
+        self.failures = []
+
+        async def connect():
+            smtp = FakeSMTP(self.failures)
+            self.connections.append(smtp)
+            return smtp
+
+        self.server._connect = connect
+
+    def send(self, count=1):
+        async def run():
+            return await self.server.send_many([
+                {"to": "user@example.com", "subject": f"Hi {i}", "body": "Hello"} for i in range(count)
+            ])
+        return asyncio.run(run())
+
+    def test_connection_is_reused_within_a_loop(self):
+        results = self.send(count=3)
+
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(sum(smtp.sent for smtp in self.connections), 3)
+        self.assertLessEqual(len(self.connections), self.server._pool_size)
+
+    def test_each_event_loop_gets_its_own_connections(self):
+        # Every Functions request runs its own asyncio.run loop
+        first = self.send()
+        second = self.send()
+
+        self.assertTrue(first[0]["success"])
+        self.assertTrue(second[0]["success"], second[0].get("error"))
+        self.assertEqual(len(self.connections), 2)
+        self.assertEqual([smtp.sent for smtp in self.connections], [1, 1])
+
+    def test_connection_is_discarded_after_any_error(self):
+        async def run():
+            self.failures.append(RuntimeError("transport closed"))
+            failed = await self.server.send_email(to="user@example.com", subject="A", body="B")
+            sent = await self.server.send_email(to="user@example.com", subject="A", body="B")
+            return failed, sent, self.server._pools.get().open_connections
+
+        failed, sent, open_connections = asyncio.run(run())
+
+        self.assertEqual(failed["error"], "transport closed")
+        self.assertTrue(sent["success"])
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self.connections[0].closed)
+        self.assertEqual(open_connections, 1)
+
+    def test_waiter_gets_a_new_connection_after_a_failure(self):
+        # With one slot, the second send waits for the first one's connection
+        self.server._pool_size = 1
+        self.failures.append(RuntimeError("transport closed"))
+
+        async def run():
+            return await asyncio.wait_for(asyncio.gather(
+                self.server.send_email(to="user@example.com", subject="A", body="B"),
+                self.server.send_email(to="user@example.com", subject="C", body="D")
+            ), timeout=1)
+
+        failed, sent = asyncio.run(run())
+
+        self.assertEqual(failed["error"], "transport closed")
+        self.assertTrue(sent["success"])
+        self.assertEqual(len(self.connections), 2)
+
+    def test_waiter_gets_a_new_connection_after_a_failed_noop(self):
+        self.server._pool_size = 1
+
+        async def run():
+            await self.server.send_email(to="user@example.com", subject="A", body="B")
+            pool = self.server._pools.get()
+            noop_started = asyncio.Event()
+            fail = asyncio.Event()
+
+            async def noop():
+                noop_started.set()
+                await fail.wait()
+                raise RuntimeError("timed out")
+
+            self.connections[0].noop = noop
+            pool.keepalive_task.cancel()
+            with mock.patch.object(email_server, "SMTP_KEEPALIVE_SECONDS", 0):
+                pool.keepalive_task = asyncio.create_task(self.server._keepalive(pool))
+                await noop_started.wait()
+
+            # The keepalive holds the only connection while this send waits
+            waiting = asyncio.ensure_future(self.server.send_email(to="user@example.com", subject="C", body="D"))
+            await asyncio.sleep(0)
+            fail.set()
+            return await asyncio.wait_for(waiting, timeout=1)
+
+        result = asyncio.run(run())
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self.connections[0].closed)
+
+    def test_invalid_message_fails_alone(self):
+        async def run():
+            return await self.server.send_many([
+                {"to": "user@example.com", "subject": "A", "body": "B"},
+                {"to": "user@example.com", "subject": "C", "attachment": "x.pdf"},
+                {"to": "user@example.com", "subject": "D", "body": "E"}
+            ])
+
+        results = asyncio.run(run())
+
+        self.assertTrue(results[0]["success"])
+        self.assertTrue(results[1]["error"].startswith("Invalid message:"))
+        self.assertTrue(results[2]["success"])
+
+    def test_dropped_connection_is_retried_once(self):
+        self.failures.append(email_server.aiosmtplib.SMTPServerDisconnected("gone"))
+        result = self.send()[0]
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self.connections[0].closed)
+
+if __name__ == "__main__":
+    unittest.main()
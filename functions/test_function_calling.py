@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Function Call Parser Tests
+Covers the call formats, their confidence values and deduplication
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_function_calling import FunctionCallParser
+
+TOOLS = ["web_search", "create_issue", "send_email"]
+
+class FunctionCallParserTest(unittest.TestCase):
+    """Tests for FunctionCallParser.parse_llm_response"""
+
+    def setUp(self):
+        self.parser = FunctionCallParser()
+
+    def parse(self, text, tools=TOOLS):
+        return self.parser.parse_llm_response(text, tools)
+
+    def test_xml_style(self):
+        text = 'Sure. <function_call name="web_search">{"query": "mcp", "num_results": 3}</function_call>'
+        calls = self.parse(text)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].name, "web_search")
+        self.assertEqual(calls[0].arguments, {"query": "mcp", "num_results": 3})
+        self.assertEqual(calls[0].confidence, 0.9)
+        self.assertTrue(calls[0].raw_text.startswith("<function_call"))
+
+    def test_json_tool_use(self):
+        text = '```json\n{"tool_use": {"name": "send_email", "parameters": {"to": "a@example.com", "subject": "Hi"}}}\n```'
+        calls = self.parse(text)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].name, "send_email")
+        self.assertEqual(calls[0].arguments, {"to": "a@example.com", "subject": "Hi"})
+        self.assertEqual(calls[0].confidence, 0.95)
+
+    def test_standard_call_argument_types(self):
+        text = 'create_issue(repository="o/r", title=\'Bug, again\', priority=2, weight=0.5, draft=false, milestone=None, labels=["bug"])'
+        calls = self.parse(text)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].arguments, {
+            "repository": "o/r",
+            "title": "Bug, again",
+            "priority": 2,
+            "weight": 0.5,
+            "draft": False,
+            "milestone": None,
+            "labels": ["bug"]
+        })
+        self.assertEqual(calls[0].confidence, 0.8)
+
+    def test_standard_call_json_arguments(self):
+        calls = self.parse('web_search("query": "mcp", "num_results": 2)')
+
+        self.assertEqual(calls[0].arguments, {"query": "mcp", "num_results": 2})
+
+    def test_markdown_code_block_parsed_as_standard_call(self):
+        text = 'Running:\n```python\nweb_search(query="mcp servers", num_results=5)\n```'
+        calls = self.parse(text)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].name, "web_search")
+        self.assertEqual(calls[0].arguments, {"query": "mcp servers", "num_results": 5})
+        self.assertEqual(calls[0].confidence, 0.8)
+
+    def test_several_calls_in_order(self):
+        text = 'I will create_issue(repository="o/r", title="T", body="B") and web_search(query="q")'
+        calls = self.parse(text)
+
+        self.assertEqual([call.name for call in calls], ["create_issue", "web_search"])
+
+    def test_only_available_tools_are_parsed(self):
+        text = 'print(x) then delete_repo(name="r") and web_search(query="q")'
+
+        self.assertEqual([call.name for call in self.parse(text)], ["web_search"])
+        self.assertEqual(self.parse(text, ["create_issue"]), [])
+        self.assertEqual(self.parse(text, []), [])
+
+    def test_tool_name_prefix(self):
+        calls = self.parse('search_web(query="q")', ["search", "search_web"])
+
+        self.assertEqual([call.name for call in calls], ["search_web"])
+
+    def test_plain_prose(self):
+        self.assertEqual(self.parse("Nothing to call here."), [])
+
+    def test_invalid_xml_arguments_are_skipped(self):
+        self.assertEqual(self.parse('<function_call name="web_search">{query: mcp}</function_call>'), [])
+
+    def test_duplicates_keep_highest_confidence(self):
+        text = (
+            'web_search(query="mcp")\n'
+            '<function_call name="web_search">{"query": "mcp"}</function_call>\n'
+            'web_search(query="mcp")'
+        )
+        calls = self.parse(text)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0].confidence, 0.9)
+        self.assertTrue(calls[0].raw_text.startswith("<function_call"))
+
+    def test_different_arguments_are_not_duplicates(self):
+        calls = self.parse('web_search(query="a") web_search(query="b") web_search(num_results=1, query="a")')
+
+        self.assertEqual([call.arguments for call in calls], [
+            {"query": "a"},
+            {"query": "b"},
+            {"num_results": 1, "query": "a"}
+        ])
+
+    def test_argument_order_does_not_affect_deduplication(self):
+        calls = self.parse('web_search(query="a", num_results=1) web_search(num_results=1, query="a")')
+
+        self.assertEqual(len(calls), 1)
+
+    def test_create_tool_calls(self):
+        calls = self.parse('web_search(query="a") create_issue(repository="o/r", title="t", body="b")')
+        tool_calls = self.parser.create_tool_calls(calls)
+
+        self.assertEqual([call.name for call in tool_calls], ["web_search", "create_issue"])
+        self.assertEqual(tool_calls[0].parameters, {"query": "a"})
+        self.assertNotEqual(tool_calls[0].id, tool_calls[1].id)
+
+if __name__ == "__main__":
+    unittest.main()
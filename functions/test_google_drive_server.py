@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Google Drive Server Tests
+Covers the file listing search expression, cache and paging
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_servers import google_drive_server
+from mcp_servers.google_drive_server import GoogleDriveMCPServer, _files_query
+
+def fake_file(index):
+    """File resource as returned by files.list"""
+    return {
+        "id": f"file-{index}",
+        "name": f"File {index}",
+        "mimeType": "application/pdf",
+        "webViewLink": f"https://drive.example/file-{index}",
+        "createdTime": "2024-01-01T00:00:00Z",
+        "modifiedTime": "2024-01-02T00:00:00Z"
+    }
+
+class FakeRequest:
+    """Google API request stub that serves one page of a listing"""
+
+    def __init__(self, drive, kwargs, offset):
+        self.drive = drive
+        self.kwargs = kwargs
+        self.offset = offset
+
+    def execute(self, http=None):
+        return self.drive.serve(self)
+
+class FakeDrive:
+    """Drive v3 service stub serving files.list pages from a fixed file set"""
+
+    def __init__(self, count):
+        self.files_list = [fake_file(i) for i in range(count)]
+        # Keyword arguments of each new files.list call
+        self.list_calls = []
+        # Offsets of the pages served, over all calls
+        self.pages_served = []
+
+    def files(self):
+        return self
+
+    def list(self, **kwargs):
+        self.list_calls.append(kwargs)
+        return FakeRequest(self, kwargs, 0)
+
+    def list_next(self, request, response):
+        token = response.get("nextPageToken")
+        return FakeRequest(self, request.kwargs, int(token)) if token else None
+
+    def serve(self, request):
+        self.pages_served.append(request.offset)
+        end = request.offset + request.kwargs["pageSize"]
+        response = {"files": self.files_list[request.offset:end]}
+        if end < len(self.files_list):
+            response["nextPageToken"] = str(end)
+        return response
+
+class FilesQueryTest(unittest.TestCase):
+    """Tests for the Drive search expression"""
+
+    def test_empty_query_lists_every_file(self):
+        self.assertEqual(_files_query(""), "trashed=false")
+
+    def test_quotes_and_backslashes_are_escaped(self):
+        self.assertEqual(
+            _files_query("it's a\\b"),
+            "trashed=false and name contains 'it\\'s a\\\\b'"
+        )
+
+class DriveServerTestCase(unittest.TestCase):
+    """Test case with an authenticated server listing from a FakeDrive"""
+
+    file_count = 5
+
+    def setUp(self):
+        self.server = GoogleDriveMCPServer()
+        self.server.authenticated = True
+        self.server.drive_service = self.drive = FakeDrive(self.file_count)
+        self.server._thread_http = lambda: None
+
+    def list_files(self, *calls):
+        async def run():
+            return [await self.server.list_files(**kwargs) for kwargs in calls]
+        return asyncio.run(run())
+
+class ListFilesTest(DriveServerTestCase):
+    """Tests for list_files"""
+
+    def test_files_are_listed(self):
+        result, = self.list_files({"query": "File", "limit": 3})
+
+        self.assertTrue(result["success"])
+        self.assertEqual([f["id"] for f in result["files"]], ["file-0", "file-1", "file-2"])
+        self.assertEqual(self.drive.list_calls[0]["q"], "trashed=false and name contains 'File'")
+
+    def test_repeated_listings_share_one_call(self):
+        first, second = self.list_files({"query": "File"}, {"query": "File"})
+
+        self.assertIs(second, first)
+        self.assertEqual(len(self.drive.list_calls), 1)
+
+    def test_listings_are_cached_per_query_and_limit(self):
+        self.list_files({"query": "File"}, {"query": "File", "limit": 2}, {"query": "Other"})
+
+        self.assertEqual(len(self.drive.list_calls), 3)
+
+    def test_expired_listings_are_fetched_again(self):
+        with mock.patch.object(google_drive_server, "LIST_CACHE_TTL_SECONDS", 0):
+            self.list_files({"query": "File"}, {"query": "File"})
+
+        self.assertEqual(len(self.drive.list_calls), 2)
+
+class PagingTest(DriveServerTestCase):
+    """Tests for paging through iter_files"""
+
+    file_count = 2500
+
+    def test_limit_beyond_one_page_follows_page_tokens(self):
+        result, = self.list_files({"limit": 1500})
+
+        self.assertEqual(result["count"], 1500)
+        self.assertEqual(result["files"][-1]["id"], "file-1499")
+        self.assertEqual(self.drive.list_calls[0]["pageSize"], google_drive_server.MAX_LIST_PAGE_SIZE)
+        self.assertEqual(self.drive.pages_served, [0, 1000])
+
+    def test_listing_stops_once_the_limit_is_reached(self):
+        result, = self.list_files({"limit": 10})
+
+        self.assertEqual(result["count"], 10)
+        self.assertEqual(self.drive.pages_served, [0])
+
+    def test_iter_files_yields_every_page(self):
+        self.server.drive_service = self.drive = FakeDrive(count=10)
+
+        async def run():
+            return [len(page) async for page in self.server.iter_files("File", page_size=4)]
+
+        self.assertEqual(asyncio.run(run()), [4, 4, 2])
+        self.assertEqual(self.drive.pages_served, [0, 4, 8])
+
+if __name__ == "__main__":
+    unittest.main()
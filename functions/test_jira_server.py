@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+JIRA Server Tests
+Covers the issue read cache, its patching by writes, and the transition id cache
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_servers import jira_server
+from mcp_servers.jira_server import JiraAPIError, JiraMCPServer
+
+def fake_issue(key, status="To Do", issue_type="Task"):
+    """Issue payload as returned by GET /rest/api/2/issue/{key}"""
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary of {key}",
+            "description": "",
+            "status": {"name": status},
+            "priority": None,
+            "assignee": None,
+            "reporter": {"displayName": "Reporter"},
+            "created": "2024-01-01T00:00:00.000+0000",
+            "updated": "2024-01-02T00:00:00.000+0000",
+            "project": {"name": "Project"},
+            "issuetype": {"name": issue_type},
+            "labels": []
+        }
+    }
+
+class FakeJira:
+    """JIRA REST API stub that records the requests made to it"""
+
+    def __init__(self):
+        self.calls = []
+        self.status = "To Do"
+        # issue key -> issue type name, "Task" when not listed
+        self.issue_types = {}
+        # issue type name -> transitions of its workflow
+        self.workflows = {
+            "Task": [{"id": "31", "name": "Done", "to": {"name": "Done"}}],
+            "Bug": [
+                {"id": "41", "name": "Done", "to": {"name": "Done"}},
+                {"id": "42", "name": "Won't Fix", "to": {"name": "Closed"}}
+            ]
+        }
+
+    async def request(self, method, url, params=None, json=None):
+        # /issue/{key} or /issue/{key}/{action}
+        _, issue_key, *action = url.strip("/").split("/")
+        issue_type = self.issue_types.get(issue_key, "Task")
+        if method == "GET":
+            issue = fake_issue(issue_key, self.status, issue_type)
+            if params.get("expand") == "transitions":
+                self.calls.append(("get_transitions", issue_key))
+                issue["transitions"] = self.workflows[issue_type]
+            else:
+                self.calls.append(("get_issue", issue_key))
+            return issue
+        if method == "PUT":
+            self.calls.append(("update_issue", issue_key))
+            return None
+        if action == ["comment"]:
+            self.calls.append(("add_comment", issue_key))
+            return {"id": "1", "author": {"displayName": "Agent"}, "created": "now", "updated": "now"}
+        if action == ["transitions"]:
+            transition_id = json["transition"]["id"]
+            self.calls.append(("transition_issue", issue_key, transition_id))
+            if transition_id not in {t["id"] for t in self.workflows[issue_type]}:
+                raise JiraAPIError(400, {"errorMessages": [f"Transition id {transition_id} is not valid"]})
+            self.status = next(t["to"]["name"] for t in self.workflows[issue_type] if t["id"] == transition_id)
+            return None
+        raise AssertionError(f"Unexpected request {method} {url}")
+
+class JiraServerTestCase(unittest.TestCase):
+    """Test case with an authenticated server talking to a FakeJira"""
+
+    def setUp(self):
+        self.server = JiraMCPServer()
+        self.server.authenticated = True
+        self.client = FakeJira()
+        self.server._request = self.client.request
+
+    def run_calls(self, *calls):
+        async def run():
+            return [await call for call in calls]
+        return asyncio.run(run())
+
+    def count(self, name):
+        return sum(1 for call in self.client.calls if call[0] == name)
+
+class IssueCacheTest(JiraServerTestCase):
+    """Tests for the get_issue read cache"""
+
+    def test_repeated_reads_are_served_from_memory(self):
+        first, second = self.run_calls(self.server.get_issue("PROJ-1"), self.server.get_issue("PROJ-1"))
+
+        self.assertTrue(first["success"])
+        self.assertEqual(second, first)
+        self.assertEqual(self.count("get_issue"), 1)
+
+    def test_expired_reads_are_fetched_again(self):
+        with mock.patch.object(jira_server, "READ_CACHE_TTL_SECONDS", 0):
+            self.run_calls(self.server.get_issue("PROJ-1"), self.server.get_issue("PROJ-1"))
+
+        self.assertEqual(self.count("get_issue"), 2)
+
+    def test_writes_drop_the_cached_issue(self):
+        self.run_calls(
+            self.server.get_issue("PROJ-1"),
+            self.server.add_comment("PROJ-1", "Looks good"),
+            self.server.get_issue("PROJ-1")
+        )
+
+        self.assertEqual(self.count("get_issue"), 2)
+
+class CachePatchingTest(JiraServerTestCase):
+    """Tests for writes applied to a recent read instead of fetching again"""
+
+    def test_update_patches_a_recent_read(self):
+        read, updated = self.run_calls(
+            self.server.get_issue("PROJ-1"),
+            self.server.update_issue("PROJ-1", summary="New summary", priority="High")
+        )
+
+        self.assertEqual(updated["issue"]["summary"], "New summary")
+        self.assertEqual(updated["issue"]["priority"], "High")
+        self.assertEqual(self.count("get_issue"), 1)
+        self.assertEqual(self.server._issue_cache["PROJ-1"][1], updated)
+
+    def test_patched_read_keeps_its_read_time(self):
+        self.run_calls(self.server.get_issue("PROJ-1"))
+        read_at = self.server._issue_cache["PROJ-1"][0]
+
+        self.run_calls(self.server.update_issue("PROJ-1", summary="New summary"))
+
+        self.assertEqual(self.server._issue_cache["PROJ-1"][0], read_at)
+
+    def test_update_without_a_recent_read_fetches_the_issue(self):
+        self.run_calls(self.server.update_issue("PROJ-1", summary="New summary"))
+
+        self.assertEqual(self.count("get_issue"), 1)
+
+    def test_assignee_change_fetches_the_issue(self):
+        self.run_calls(self.server.get_issue("PROJ-1"), self.server.update_issue("PROJ-1", assignee="someone"))
+
+        self.assertEqual(self.count("get_issue"), 2)
+
+    def test_refresh_fetches_the_issue(self):
+        self.run_calls(
+            self.server.get_issue("PROJ-1"),
+            self.server.update_issue("PROJ-1", summary="New summary", refresh=True)
+        )
+
+        self.assertEqual(self.count("get_issue"), 2)
+
+    def test_transition_patches_the_status_of_a_recent_read(self):
+        self.client.issue_types["PROJ-1"] = "Bug"
+        read, transitioned = self.run_calls(
+            self.server.get_issue("PROJ-1"),
+            self.server.transition_issue("PROJ-1", "won't fix")
+        )
+
+        self.assertEqual(read["issue"]["status"], "To Do")
+        self.assertEqual(transitioned["issue"]["status"], "Closed")
+        self.assertEqual(self.count("get_issue"), 1)
+
+class TransitionCacheTest(JiraServerTestCase):
+    """Tests for the transition id cache"""
+
+    def transitions(self):
+        return [call[2] for call in self.client.calls if call[0] == "transition_issue"]
+
+    def test_transition_returns_the_new_status(self):
+        result, = self.run_calls(self.server.transition_issue("PROJ-1", "done"))
+
+        self.assertEqual(result["issue"]["status"], "Done")
+        self.assertEqual(self.transitions(), ["31"])
+
+    def test_cached_id_skips_the_lookup(self):
+        self.run_calls(
+            self.server.transition_issue("PROJ-1", "Done"),
+            self.server.get_issue("PROJ-2"),
+            self.server.transition_issue("PROJ-2", "Done")
+        )
+
+        self.assertEqual(self.count("get_transitions"), 1)
+        self.assertEqual(self.transitions(), ["31", "31"])
+
+    def test_ids_are_not_shared_across_issue_types(self):
+        self.client.issue_types["PROJ-2"] = "Bug"
+        self.run_calls(
+            self.server.transition_issue("PROJ-1", "Done"),
+            self.server.get_issue("PROJ-2"),
+            self.server.transition_issue("PROJ-2", "Done")
+        )
+
+        self.assertEqual(self.count("get_transitions"), 2)
+        self.assertEqual(self.transitions(), ["31", "41"])
+
+    def test_failed_cached_id_is_looked_up_again(self):
+        self.run_calls(self.server.transition_issue("PROJ-1", "Done"), self.server.get_issue("PROJ-2"))
+        self.client.workflows["Task"] = [{"id": "51", "name": "Done", "to": {"name": "Done"}}]
+
+        result, = self.run_calls(self.server.transition_issue("PROJ-2", "Done"))
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.transitions(), ["31", "31", "51"])
+
+    def test_server_error_on_cached_id_is_reported(self):
+        self.run_calls(self.server.transition_issue("PROJ-1", "Done"), self.server.get_issue("PROJ-2"))
+        request = self.client.request
+
+        async def failing_transition(method, url, params=None, json=None):
+            if url.endswith("/transitions"):
+                self.client.calls.append(("transition_issue", url.split("/")[2], json["transition"]["id"]))
+                raise JiraAPIError(500, {"errorMessages": ["Internal server error"]})
+            return await request(method, url, params=params, json=json)
+
+        self.server._request = failing_transition
+        result, = self.run_calls(self.server.transition_issue("PROJ-2", "Done"))
+
+        self.assertEqual(result["error"], "Internal server error")
+        self.assertEqual(self.transitions(), ["31", "31"])
+        self.assertEqual(self.count("get_transitions"), 1)
+
+    def test_unknown_transition_lists_the_available_ones(self):
+        self.client.issue_types["PROJ-1"] = "Bug"
+        result, = self.run_calls(self.server.transition_issue("PROJ-1", "Reopen"))
+
+        self.assertIn("Won't Fix", result["error"])
+        self.assertEqual(self.transitions(), [])
+
+class ClientPerLoopTest(unittest.TestCase):
+    """Tests for the per-event-loop HTTP client and request bound"""
+
+    def test_each_event_loop_gets_its_own_client(self):
+        server = JiraMCPServer()
+
+        async def loop_objects():
+            return server._http.get(), server._sem.get()
+
+        # Every Functions request runs its own asyncio.run loop
+        first_client, first_sem = asyncio.run(loop_objects())
+        second_client, second_sem = asyncio.run(loop_objects())
+
+        self.assertIsNot(first_client, second_client)
+        self.assertIsNot(first_sem, second_sem)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+MCP Dispatcher Tests
+Covers tool name and alias resolution in dispatch_tool
+"""
+
+import asyncio
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import mcp_dispatcher
+from mcp_client import ToolCall
+from mcp_dispatcher import MCPToolDispatcher, _TOOL_ALIASES
+
+class MCPToolDispatcherTest(unittest.TestCase):
+    """Tests for MCPToolDispatcher.dispatch_tool"""
+
+    def setUp(self):
+        self.dispatcher = MCPToolDispatcher()
+        self.calls = []
+
+    def fake_tool(self, name, result):
+        """Replace a canonical tool with a stub recording its calls"""
+        category = self.dispatcher.tool_mapping[name][0]
+
+        async def tool(**kwargs):
+            self.calls.append((name, kwargs))
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.dispatcher.tool_mapping[name] = (category, tool)
+
+    def dispatch(self, name, **parameters):
+        return asyncio.run(self.dispatcher.dispatch_tool(ToolCall(id="call_1", name=name, parameters=parameters)))
+
+    def test_canonical_name(self):
+        self.fake_tool("web_search", {"success": True, "results": []})
+        result = self.dispatch("web_search", query="mcp")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.content, {"success": True, "results": []})
+        self.assertEqual(result.tool_name, "web_search")
+        self.assertEqual(self.calls, [("web_search", {"query": "mcp"})])
+
+    def test_alias_resolves_to_canonical_tool(self):
+        self.fake_tool("jira_get_issue", {"success": True})
+        result = self.dispatch("get_issue", issue_key="ABC-1")
+
+        self.assertTrue(result.success)
+        self.assertEqual(result.tool_name, "get_issue")
+        self.assertEqual(self.calls, [("jira_get_issue", {"issue_key": "ABC-1"})])
+
+    def test_every_alias_has_a_canonical_tool(self):
+        for alias, name in _TOOL_ALIASES.items():
+            with self.subTest(alias=alias):
+                self.assertNotIn(alias, self.dispatcher.tool_mapping)
+                self.assertIs(self.dispatcher._resolve(alias), self.dispatcher.tool_mapping[name])
+
+    def test_aliases_are_listed_in_their_category(self):
+        categories = self.dispatcher.get_tools_by_category()
+
+        self.assertIn("search_web", categories["web_search"])
+        self.assertIn("get_issue", categories["jira"])
+        self.assertIn("search_files", categories["google_drive"])
+        self.assertIn("search_web", self.dispatcher.get_available_tools())
+
+    def test_unknown_tool(self):
+        result = self.dispatch("delete_everything")
+
+        self.assertFalse(result.success)
+        self.assertIn("'delete_everything' not found", result.error)
+        self.assertIn("search_web", result.error)
+
+    def test_error_result(self):
+        self.fake_tool("send_email", {"error": "Email server not authenticated"})
+        result = self.dispatch("email_send", to="a@example.com")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "Email server not authenticated")
+
+    def test_unsuccessful_result_without_error(self):
+        self.fake_tool("send_email", {"success": False})
+        result = self.dispatch("send_email")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "Unknown error")
+
+    def test_exception_becomes_failed_result(self):
+        self.fake_tool("gdrive_list_files", RuntimeError("boom"))
+        result = self.dispatch("search_files")
+
+        self.assertFalse(result.success)
+        self.assertEqual(result.error, "boom")
+
+    def test_not_implemented_tool(self):
+        result = self.dispatch("create_event")
+
+        self.assertFalse(result.success)
+        self.assertTrue(result.content["available_soon"])
+
+    def test_server_functions_are_imported_on_first_use(self):
+        from mcp_servers import email_server
+
+        target = self.dispatcher.tool_mapping["send_email"][1]
+        self.assertIs(self.dispatcher._load_function(target), email_server.send_email)
+
+    def test_import_does_not_load_servers(self):
+        code = (
+            "import sys, mcp_dispatcher; mcp_dispatcher.MCPToolDispatcher(); "
+            "print(sorted(m for m in sys.modules if m.startswith('mcp_servers.') and m.endswith('_server')))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        ).stdout
+
+        self.assertEqual(output.strip(), "[]")
+
+    def test_draft_body_can_be_read_back(self):
+        async def round_trip():
+            created = await self.dispatcher.dispatch_tool(ToolCall(
+                id="call_1", name="create_email_draft",
+                parameters={"to": "user@example.com", "subject": "Minutes", "body": "Draft body"}
+            ))
+            body_sha256 = created.content["draft"]["body_sha256"]
+            read = await self.dispatcher.dispatch_tool(ToolCall(
+                id="call_2", name="get_draft_body", parameters={"body_sha256": body_sha256}
+            ))
+            return created, read
+
+        created, read = asyncio.run(round_trip())
+
+        self.assertTrue(created.success)
+        self.assertNotIn("body", created.content["draft"])
+        self.assertTrue(read.success)
+        self.assertEqual(read.content["body"], "Draft body")
+        self.assertIn("get_draft_body", self.dispatcher.get_tools_by_category()["email"])
+
+    def test_tool_info_for_alias(self):
+        info = self.dispatcher.get_tool_info("search_web")
+
+        self.assertEqual(info["name"], "search_web")
+        self.assertEqual(info["module"], "mcp_servers.web_search_server")
+        self.assertEqual(info["function"], "web_search")
+        self.assertIsNone(self.dispatcher.get_tool_info("delete_everything"))
+
+class GetMCPDispatcherTest(unittest.TestCase):
+    """Tests for the get_mcp_dispatcher singleton"""
+
+    def setUp(self):
+        mcp_dispatcher._dispatcher = None
+        self.addCleanup(setattr, mcp_dispatcher, "_dispatcher", None)
+
+    def test_concurrent_first_calls_across_event_loops(self):
+        async def initialize(dispatcher):
+            await asyncio.sleep(0)  # let the other caller contend for the lock
+            return True
+
+        async def first_calls():
+            return await asyncio.gather(mcp_dispatcher.get_mcp_dispatcher(), mcp_dispatcher.get_mcp_dispatcher())
+
+        original = MCPToolDispatcher.initialize
+        MCPToolDispatcher.initialize = initialize
+        self.addCleanup(setattr, MCPToolDispatcher, "initialize", original)
+
+        # Each Functions request runs its own asyncio.run loop
+        for _ in range(2):
+            mcp_dispatcher._dispatcher = None
+            first, second = asyncio.run(first_calls())
+            self.assertIs(first, second)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+MCP Server Config Tests
+Covers agent tool permissions and the enabled server configs
+"""
+
+import os
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_auth import MCPAuthManager
+from mcp_servers import server_config
+from mcp_servers.server_config import (
+    get_mcp_server_configs,
+    get_tools_for_agent,
+    get_tools_for_agent_set,
+    invalidate_mcp_config_cache,
+    is_tool_allowed_for_agent
+)
+
+class FakeAuthManager:
+    """Auth manager stub with valid credentials for the given services only"""
+
+    def __init__(self, valid_services):
+        self.valid_services = set(valid_services)
+        self.version = 0
+        self.snapshots = 0
+
+    def snapshot(self, services, ttl=300.0):
+        self.snapshots += 1
+        return {
+            service: ({"TOKEN": service} if service in self.valid_services else {}, service in self.valid_services)
+            for service in services
+        }
+
+class IsToolAllowedForAgentTest(unittest.TestCase):
+    """Tests for is_tool_allowed_for_agent"""
+
+    def test_allowed_tools(self):
+        self.assertTrue(is_tool_allowed_for_agent("posiAgent", "web_search"))
+        self.assertTrue(is_tool_allowed_for_agent("jiraAssistant", "transition_issue"))
+        self.assertTrue(is_tool_allowed_for_agent("minutaMaker", "send_email_with_attachment"))
+
+    def test_tools_of_other_agents_are_denied(self):
+        self.assertFalse(is_tool_allowed_for_agent("posiAgent", "create_issue"))
+        self.assertFalse(is_tool_allowed_for_agent("jiraAssistant", "send_email"))
+
+    def test_unknown_agent_or_tool(self):
+        self.assertFalse(is_tool_allowed_for_agent("unknownAgent", "web_search"))
+        self.assertFalse(is_tool_allowed_for_agent("posiAgent", "delete_everything"))
+        self.assertFalse(is_tool_allowed_for_agent("", ""))
+
+    def test_agrees_with_agent_tool_lists(self):
+        for agent_id in ("posiAgent", "minutaMaker", "jiraAssistant"):
+            tools = get_tools_for_agent(agent_id)
+            with self.subTest(agent_id=agent_id):
+                self.assertTrue(tools)
+                self.assertEqual(set(tools), get_tools_for_agent_set(agent_id))
+                self.assertTrue(all(is_tool_allowed_for_agent(agent_id, tool) for tool in tools))
+
+class FakeAuthTestCase(unittest.TestCase):
+    """Test case whose config builds read credentials from a FakeAuthManager"""
+
+    def use_auth(self, valid_services):
+        auth = FakeAuthManager(valid_services)
+        patcher = mock.patch.object(server_config, "get_auth_manager", return_value=auth)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        invalidate_mcp_config_cache()
+        self.addCleanup(invalidate_mcp_config_cache)
+        return auth
+
+class ServerConfigsTest(FakeAuthTestCase):
+    """Tests for get_mcp_server_configs"""
+
+    def test_servers_without_credentials_are_skipped(self):
+        self.use_auth({"github", "linear"})
+        configs = get_mcp_server_configs()
+
+        self.assertIn("github", configs)
+        self.assertEqual(configs["github"]["env"], {"TOKEN": "github"})
+        self.assertNotIn("jira", configs)
+        self.assertNotIn("google_drive", configs)
+        self.assertNotIn("google_calendar", configs)
+        # Optional integrations stay off even with credentials
+        self.assertNotIn("linear", configs)
+
+    def test_servers_without_auth_are_always_enabled(self):
+        self.use_auth(set())
+        configs = get_mcp_server_configs()
+
+        self.assertEqual(set(configs), {"web_search", "email"})
+        self.assertTrue(all(config["enabled"] for config in configs.values()))
+
+    def test_configs_are_reused_until_the_environment_changes(self):
+        auth = self.use_auth({"jira"})
+
+        first = get_mcp_server_configs()
+        self.assertIs(get_mcp_server_configs(), first)
+        self.assertEqual(auth.snapshots, 1)
+
+        with mock.patch.dict(os.environ, {"SERP_API_KEY": "changed"}):
+            rebuilt = get_mcp_server_configs()
+
+        self.assertIsNot(rebuilt, first)
+        self.assertEqual(rebuilt["web_search"]["env"]["SEARCH_API_KEY"], "changed")
+        self.assertEqual(auth.snapshots, 2)
+
+    def test_auth_version_bump_rebuilds_the_configs(self):
+        auth = self.use_auth({"jira"})
+        first = get_mcp_server_configs()
+
+        auth.version += 1
+
+        self.assertIsNot(get_mcp_server_configs(), first)
+
+class InstallationStatusTest(FakeAuthTestCase):
+    """Tests for get_server_installation_status"""
+
+    def setUp(self):
+        self.use_auth({"github"})
+        server_config._STATUS_CACHE = None
+        self.addCleanup(setattr, server_config, "_STATUS_CACHE", None)
+
+    def age_status(self, seconds):
+        checked_at, fingerprint, status = server_config._STATUS_CACHE
+        server_config._STATUS_CACHE = (checked_at - seconds, fingerprint, status)
+
+    def test_fresh_status_is_reused(self):
+        status = server_config.get_server_installation_status()
+
+        self.assertTrue(status["github"]["has_credentials"])
+        self.assertIs(server_config.get_server_installation_status(), status)
+
+    def test_stale_status_is_recomputed_inline(self):
+        status = server_config.get_server_installation_status()
+        self.age_status(server_config._STATUS_FRESH_SECONDS)
+
+        refreshed = server_config.get_server_installation_status()
+
+        self.assertIsNot(refreshed, status)
+        self.assertEqual(refreshed, status)
+
+    def test_failed_refresh_serves_the_stale_status(self):
+        status = server_config.get_server_installation_status()
+        self.age_status(server_config._STATUS_FRESH_SECONDS)
+
+        with mock.patch.object(server_config, "_check_server_installation_status", side_effect=RuntimeError("boom")):
+            self.assertIs(server_config.get_server_installation_status(), status)
+            self.age_status(server_config._STATUS_MAX_AGE_SECONDS)
+            with self.assertRaises(RuntimeError):
+                server_config.get_server_installation_status()
+
+class CredentialChangeTest(unittest.TestCase):
+    """Tests for configs rebuilt with the real auth manager after env changes"""
+
+    def setUp(self):
+        patcher = mock.patch.object(server_config, "get_auth_manager", return_value=MCPAuthManager())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        env = mock.patch.dict(os.environ)
+        env.start()
+        self.addCleanup(env.stop)
+        os.environ.pop("GITHUB_TOKEN", None)
+        invalidate_mcp_config_cache()
+        self.addCleanup(invalidate_mcp_config_cache)
+
+    def test_token_set_later_enables_the_server(self):
+        self.assertNotIn("github", get_mcp_server_configs())
+
+        os.environ["GITHUB_TOKEN"] = "ghp_new"
+        configs = get_mcp_server_configs()
+
+        self.assertIn("github", configs)
+        self.assertEqual(configs["github"]["env"]["GITHUB_TOKEN"], "ghp_new")
+
+    def test_changed_token_is_picked_up(self):
+        os.environ["GITHUB_TOKEN"] = "ghp_old"
+        get_mcp_server_configs()
+
+        os.environ["GITHUB_TOKEN"] = "ghp_new"
+
+        self.assertEqual(get_mcp_server_configs()["github"]["env"]["GITHUB_TOKEN"], "ghp_new")
+
+if __name__ == "__main__":
+    unittest.main()
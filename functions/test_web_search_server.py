@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Web Search Server Tests
+Covers the result cache and the sharing of identical in-flight loads
+"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+
+# Add functions directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from mcp_loop_local import LoopLocal
+from mcp_servers.web_search_server import WebSearchMCPServer
+
+URL = "https://example.com"
+
+class FakePipeline:
+    """Redis pipeline stub that runs the queued commands on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    def get(self, key):
+        self.commands.append((self.redis.get, key))
+        return self
+
+    def pttl(self, key):
+        self.commands.append((self.redis.pttl, key))
+        return self
+
+    async def execute(self):
+        return [await command(key) for command, key in self.commands]
+
+class FakeRedis:
+    """Redis client stub that only works on the event loop that created it"""
+
+    def __init__(self, store, ttls):
+        self.loop = asyncio.get_running_loop()
+        self.store = store
+        # key -> remaining lifetime in milliseconds
+        self.ttls = ttls
+        self.closed = False
+
+    def check_loop(self):
+        if asyncio.get_running_loop() is not self.loop:
+            raise RuntimeError("Event loop is closed")
+
+    async def get(self, key):
+        self.check_loop()
+        return self.store.get(key)
+
+    async def pttl(self, key):
+        self.check_loop()
+        return self.ttls.get(key, -1) if key in self.store else -2
+
+    async def setex(self, key, ttl, value):
+        self.check_loop()
+        self.store[key] = value
+        self.ttls[key] = ttl * 1000
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        self.closed = True
+
+class WebSearchServerTestCase(unittest.TestCase):
+    """Server whose page fetches are recorded instead of sent"""
+
+    def setUp(self):
+        self.server = WebSearchMCPServer()
+        self.fetches = []
+        # Results the next fetches return, then a successful page
+        self.results = []
+        # Set to make fetches wait until it is released
+        self.release = None
+
+        async def fetch(url, max_chars):
+            self.fetches.append(url)
+            if self.release is not None:
+                await self.release.wait()
+            if self.results:
+                return self.results.pop(0)
+            return {"success": True, "url": url, "content": f"page {len(self.fetches)}"}
+
+        self.server._fetch_page_content = fetch
+
+class ResultCacheTest(WebSearchServerTestCase):
+    """Tests for WebSearchMCPServer._cached through get_page_content"""
+
+    def test_successful_result_is_reused(self):
+        async def run():
+            return await self.server.get_page_content(URL), await self.server.get_page_content(URL)
+
+        first, second = asyncio.run(run())
+
+        self.assertEqual(first["content"], "page 1")
+        self.assertEqual(second, first)
+        self.assertEqual(self.fetches, [URL])
+
+    def test_cache_is_shared_across_event_loops(self):
+        first = asyncio.run(self.server.get_page_content(URL))
+        second = asyncio.run(self.server.get_page_content(URL))
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_errors_are_not_cached(self):
+        self.results.append({"error": "HTTP 503: Could not fetch page"})
+
+        async def run():
+            return await self.server.get_page_content(URL), await self.server.get_page_content(URL)
+
+        failed, retried = asyncio.run(run())
+
+        self.assertEqual(failed["error"], "HTTP 503: Could not fetch page")
+        self.assertTrue(retried["success"])
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_different_arguments_are_cached_separately(self):
+        async def run():
+            return (
+                await self.server.get_page_content(URL),
+                await self.server.get_page_content(URL, max_chars=100),
+                await self.server.get_page_content(URL + "/other")
+            )
+
+        asyncio.run(run())
+
+        self.assertEqual(len(self.fetches), 3)
+
+class SingleflightTest(WebSearchServerTestCase):
+    """Tests for concurrent identical loads"""
+
+    def test_concurrent_identical_calls_share_one_load(self):
+        async def run():
+            self.release = asyncio.Event()
+            calls = [asyncio.ensure_future(self.server.get_page_content(URL)) for _ in range(3)]
+            await asyncio.sleep(0)
+            self.release.set()
+            return await asyncio.gather(*calls), dict(self.server._inflight.get())
+
+        results, inflight = asyncio.run(run())
+
+        self.assertEqual(self.fetches, [URL])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(inflight, {})
+
+    def test_shared_error_is_not_cached(self):
+        self.results.append({"error": "timeout"})
+
+        async def run():
+            self.release = asyncio.Event()
+            calls = [asyncio.ensure_future(self.server.get_page_content(URL)) for _ in range(2)]
+            await asyncio.sleep(0)
+            self.release.set()
+            failed = await asyncio.gather(*calls)
+            return failed, await self.server.get_page_content(URL)
+
+        failed, retried = asyncio.run(run())
+
+        self.assertEqual([result["error"] for result in failed], ["timeout", "timeout"])
+        self.assertTrue(retried["success"])
+        self.assertEqual(len(self.fetches), 2)
+
+    def test_cancelled_caller_does_not_cancel_the_load(self):
+        async def run():
+            self.release = asyncio.Event()
+            cancelled = asyncio.ensure_future(self.server.get_page_content(URL))
+            waiting = asyncio.ensure_future(self.server.get_page_content(URL))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            self.release.set()
+            return cancelled, await waiting
+
+        cancelled, result = asyncio.run(run())
+
+        self.assertTrue(cancelled.cancelled())
+        self.assertTrue(result["success"])
+        self.assertEqual(self.fetches, [URL])
+
+    def test_unfinished_load_does_not_outlive_its_loop(self):
+        async def abandon():
+            # The request ends while the load is still running
+            self.release = asyncio.Event()
+            asyncio.ensure_future(self.server.get_page_content(URL))
+            await asyncio.sleep(0)
+
+        asyncio.run(abandon())
+        self.release = None
+        result = asyncio.run(self.server.get_page_content(URL))
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(self.fetches), 2)
+
+class RedisCacheTest(WebSearchServerTestCase):
+    """Tests for the shared Redis result cache"""
+
+    def use_redis(self, server, store, ttls=None):
+        clients = []
+        ttls = {} if ttls is None else ttls
+
+        def connect():
+            clients.append(FakeRedis(store, ttls))
+            return clients[-1]
+
+        server._redis_clients = LoopLocal(connect)
+        return clients
+
+    def test_each_event_loop_gets_its_own_client(self):
+        store = {}
+        clients = self.use_redis(self.server, store)
+
+        first = asyncio.run(self.server.get_page_content(URL))
+        second = asyncio.run(self.server.get_page_content(URL + "/other"))
+
+        self.assertTrue(first["success"])
+        self.assertTrue(second["success"], second.get("error"))
+        self.assertEqual(len(clients), 2)
+        self.assertEqual(len(store), 2)
+
+    def test_result_is_shared_through_redis(self):
+        store = {}
+        self.use_redis(self.server, store)
+        stored = asyncio.run(self.server.get_page_content(URL))
+
+        # Another instance with an empty in-process cache
+        other = WebSearchMCPServer()
+        other._fetch_page_content = self.server._fetch_page_content
+        self.use_redis(other, store)
+        result = asyncio.run(other.get_page_content(URL))
+
+        self.assertEqual(result, stored)
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_local_copy_expires_with_the_redis_entry(self):
+        store, ttls = {}, {}
+        self.use_redis(self.server, store, ttls)
+        asyncio.run(self.server.get_page_content(URL))
+        key, = store
+        # The entry is about to expire in Redis
+        ttls[key] = 1500
+
+        other = WebSearchMCPServer()
+        other._fetch_page_content = self.server._fetch_page_content
+        self.use_redis(other, store, ttls)
+        asyncio.run(other.get_page_content(URL))
+
+        self.assertLessEqual(other._cache[key][0] - time.monotonic(), 1.5)
+        self.assertEqual(len(self.fetches), 1)
+
+    def test_errors_are_not_stored(self):
+        store = {}
+        self.use_redis(self.server, store)
+        self.results.append({"error": "HTTP 404: Could not fetch page"})
+
+        asyncio.run(self.server.get_page_content(URL))
+
+        self.assertEqual(store, {})
+
+    def test_cleanup_closes_the_loop_client(self):
+        clients = self.use_redis(self.server, {})
+
+        async def run():
+            await self.server.get_page_content(URL)
+            await self.server.cleanup()
+
+        asyncio.run(run())
+
+        self.assertTrue(clients[0].closed)
+
+if __name__ == "__main__":
+    unittest.main()